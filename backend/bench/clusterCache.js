@@ -0,0 +1,90 @@
+// Measures what the cluster-wide cache tier costs: the IPC round trip a worker
+// pays on every local miss (cache:get to the primary), next to a local LRU hit.
+//   node bench/clusterCache.js [--workers=4] [--lookups=5000] [--concurrency=1,16] [--valueBytes=2000]
+import cluster from 'cluster';
+import { performance } from 'perf_hooks';
+import { attachPrimaryBus, requestPrimary } from '../src/utils/clusterBus.js';
+
+const args = Object.fromEntries(
+  process.argv.slice(2).map((arg) => arg.replace(/^--/, '').split('='))
+);
+const WORKERS = Number(args.workers || 4);
+const LOOKUPS = Number(args.lookups || 5000);
+const CONCURRENCY = String(args.concurrency || '1,16').split(',').map(Number);
+const VALUE_BYTES = Number(args.valueBytes || 2000);
+const KEYS = 500;
+
+const percentile = (sorted, p) => sorted[Math.min(sorted.length - 1, Math.floor((p / 100) * sorted.length))];
+
+const summarize = (samples) => {
+  const sorted = [...samples].sort((a, b) => a - b);
+  return {
+    p50Us: Math.round(percentile(sorted, 50) * 1000),
+    p99Us: Math.round(percentile(sorted, 99) * 1000)
+  };
+};
+
+if (cluster.isPrimary) {
+  const entries = new Map();
+  const value = 'x'.repeat(VALUE_BYTES);
+  for (let i = 0; i < KEYS; i++) entries.set(`detect:${i}`, value);
+  attachPrimaryBus({
+    handlers: {
+      'cache:get': ({ key }) => entries.get(key)
+    }
+  });
+
+  const results = [];
+  cluster.on('message', (worker, message) => {
+    if (message?.benchResult) results.push(message.benchResult);
+  });
+  for (let i = 0; i < WORKERS; i++) cluster.fork();
+
+  let exited = 0;
+  cluster.on('exit', () => {
+    exited += 1;
+    if (exited < WORKERS) return;
+    console.log(`${WORKERS} workers, ${LOOKUPS} lookups each, ${VALUE_BYTES}-byte values\n`);
+    console.log('lookup'.padEnd(34) + 'in flight'.padStart(10) + 'p50 us'.padStart(10) + 'p99 us'.padStart(10));
+    const rows = new Map();
+    for (const result of results.flat()) {
+      const key = `${result.label}|${result.concurrency}`;
+      if (!rows.has(key)) rows.set(key, { ...result, samples: [] });
+      rows.get(key).samples.push(...result.samples);
+    }
+    for (const row of rows.values()) {
+      const { p50Us, p99Us } = summarize(row.samples);
+      console.log(row.label.padEnd(34) + String(row.concurrency).padStart(10) + String(p50Us).padStart(10) + String(p99Us).padStart(10));
+    }
+  });
+} else {
+  const local = new Map();
+  for (let i = 0; i < KEYS; i++) local.set(`detect:${i}`, 'x'.repeat(VALUE_BYTES));
+
+  const measure = async (label, concurrency, lookup) => {
+    const samples = [];
+    let next = 0;
+    const lane = async () => {
+      while (next < LOOKUPS) {
+        const key = `detect:${next++ % KEYS}`;
+        const started = performance.now();
+        await lookup(key);
+        samples.push(performance.now() - started);
+      }
+    };
+    await Promise.all(Array.from({ length: concurrency }, lane));
+    return { label, concurrency, samples };
+  };
+
+  const results = [];
+  results.push(await measure('local LRU hit', 1, async (key) => {
+    const value = local.get(key);
+    local.delete(key);
+    local.set(key, value);
+  }));
+  for (const concurrency of CONCURRENCY) {
+    results.push(await measure('shared tier hit (IPC round trip)', concurrency, (key) => requestPrimary('cache:get', { key })));
+    results.push(await measure('shared tier miss (IPC round trip)', concurrency, (key) => requestPrimary('cache:get', { key: `missing:${key}` })));
+  }
+  process.send({ benchResult: results }, () => process.exit(0));
+}
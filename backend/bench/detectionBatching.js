@@ -0,0 +1,112 @@
+// Measures AI-detection throughput and tail latency at several batching
+// windows against a local stub of the HF classification endpoint.
+//   node bench/detectionBatching.js [--requests=3000] [--concurrency=64] [--windows=0,5,10,20]
+import http from 'http';
+import { performance } from 'perf_hooks';
+import { createBatchScheduler } from '../src/utils/batchScheduler.js';
+import { requestTextClassificationBatch } from '../src/utils/hfBatchClient.js';
+
+const args = Object.fromEntries(
+  process.argv.slice(2).map((arg) => arg.replace(/^--/, '').split('='))
+);
+const TOTAL_REQUESTS = Number(args.requests || 3000);
+const CONCURRENCY = Number(args.concurrency || 64);
+const WINDOWS = String(args.windows || '0,5,10,20').split(',').map(Number);
+const MAX_BATCH_SIZE = Number(args.batch || 16);
+
+// Stub: fixed per-request overhead plus a small per-item cost, and a cap on
+// concurrent requests beyond which it answers 429 like a rate-limited provider.
+const STUB_BASE_MS = Number(args.baseMs || 40);
+const STUB_PER_ITEM_MS = Number(args.perItemMs || 2);
+const STUB_MAX_INFLIGHT = Number(args.maxInflight || 16);
+
+const startStub = () => {
+  let inflight = 0;
+  const stats = { requests: 0, throttled: 0 };
+  const server = http.createServer((req, res) => {
+    let body = '';
+    req.on('data', (chunk) => { body += chunk; });
+    req.on('end', () => {
+      stats.requests += 1;
+      if (inflight >= STUB_MAX_INFLIGHT) {
+        stats.throttled += 1;
+        res.writeHead(429, { 'Content-Type': 'application/json' });
+        res.end(JSON.stringify({ error: 'rate limited' }));
+        return;
+      }
+      inflight += 1;
+      const { inputs } = JSON.parse(body);
+      const items = Array.isArray(inputs) ? inputs : [inputs];
+      const scores = items.map((text) => {
+        const fake = (text.length % 100) / 100;
+        return [{ label: 'Fake', score: fake }, { label: 'Real', score: 1 - fake }];
+      });
+      setTimeout(() => {
+        inflight -= 1;
+        res.writeHead(200, { 'Content-Type': 'application/json' });
+        res.end(JSON.stringify(Array.isArray(inputs) ? scores : scores[0]));
+      }, STUB_BASE_MS + STUB_PER_ITEM_MS * items.length);
+    });
+  });
+  return new Promise((resolve) => {
+    server.listen(0, '127.0.0.1', () => resolve({ server, stats, port: server.address().port }));
+  });
+};
+
+const percentile = (sorted, p) => sorted[Math.min(sorted.length - 1, Math.floor((p / 100) * sorted.length))];
+
+const runScenario = async (windowMs, stub) => {
+  stub.stats.requests = 0;
+  stub.stats.throttled = 0;
+  const scheduler = createBatchScheduler({
+    windowMs,
+    maxBatchSize: MAX_BATCH_SIZE,
+    executeBatch: (inputs) =>
+      requestTextClassificationBatch({ model: 'stub/detector', inputs, token: 'stub' })
+  });
+
+  const latencies = [];
+  let errors = 0;
+  let issued = 0;
+  const started = performance.now();
+
+  const client = async () => {
+    while (issued < TOTAL_REQUESTS) {
+      const id = issued++;
+      const t0 = performance.now();
+      try {
+        await scheduler.submit(`Sample text number ${id} for the detector benchmark.`);
+      } catch (error) {
+        errors += 1;
+      }
+      latencies.push(performance.now() - t0);
+    }
+  };
+  await Promise.all(Array.from({ length: CONCURRENCY }, client));
+
+  const elapsedSec = (performance.now() - started) / 1000;
+  latencies.sort((a, b) => a - b);
+  return {
+    windowMs,
+    throughputRps: Math.round(TOTAL_REQUESTS / elapsedSec),
+    goodputRps: Math.round((TOTAL_REQUESTS - errors) / elapsedSec),
+    p50Ms: Number(percentile(latencies, 50).toFixed(1)),
+    p99Ms: Number(percentile(latencies, 99).toFixed(1)),
+    errorRate: Number((errors / TOTAL_REQUESTS).toFixed(4)),
+    upstreamRequests: stub.stats.requests,
+    throttled: stub.stats.throttled,
+    avgBatchSize: scheduler.stats().avgBatchSize
+  };
+};
+
+const stub = await startStub();
+process.env.HF_INFERENCE_URL = `http://127.0.0.1:${stub.port}`;
+
+const results = [];
+for (const windowMs of WINDOWS) {
+  results.push(await runScenario(windowMs, stub));
+}
+stub.server.close();
+
+console.table(results);
+if (args.json) console.log(JSON.stringify(results, null, 2));
@@ -0,0 +1,110 @@
+// Reports accuracy and latency of the bundled local AI-text detector on the
+// eval split of the included sample set, next to the heuristic it replaced.
+//   node bench/localDetector.js [--data=bench/data/detection_samples.jsonl]
+//     [--model=src/models/localDetector.json] [--low=0.35] [--high=0.65] [--iterations=500]
+import fs from 'fs';
+import { fileURLToPath } from 'url';
+import { performance } from 'perf_hooks';
+import { createLocalDetector } from '../src/utils/localDetector.js';
+import { getTextStats } from '../src/utils/textStats.js';
+
+const args = Object.fromEntries(
+  process.argv.slice(2).map((arg) => arg.replace(/^--/, '').split('='))
+);
+const DATA = args.data || fileURLToPath(new URL('./data/detection_samples.jsonl', import.meta.url));
+const MODEL = args.model || fileURLToPath(new URL('../src/models/localDetector.json', import.meta.url));
+const LOW = Number(args.low || process.env.DETECTION_ESCALATE_LOW || 0.35);
+const HIGH = Number(args.high || process.env.DETECTION_ESCALATE_HIGH || 0.65);
+const ITERATIONS = Number(args.iterations || 500);
+
+// The previous heuristicDetection formula from huggingface.js.
+const legacyHeuristic = (text) => {
+  const { wordCount, uniqueWordRatio, sentenceCount } = getTextStats(text);
+  const avgSentenceLength = wordCount / Math.max(1, sentenceCount);
+  return Math.min(1, Math.max(0, 0.35 + avgSentenceLength * 0.01 - uniqueWordRatio * 0.2));
+};
+
+// Probability that a random AI sample outscores a random human one.
+const auc = (scored) => {
+  const positives = scored.filter((s) => s.y === 1);
+  const negatives = scored.filter((s) => s.y === 0);
+  let wins = 0;
+  for (const p of positives) {
+    for (const n of negatives) wins += p.p > n.p ? 1 : p.p === n.p ? 0.5 : 0;
+  }
+  return wins / (positives.length * negatives.length);
+};
+
+const classification = (scored) => {
+  const tp = scored.filter((s) => s.y === 1 && s.p >= 0.5).length;
+  const fp = scored.filter((s) => s.y === 0 && s.p >= 0.5).length;
+  const fn = scored.filter((s) => s.y === 1 && s.p < 0.5).length;
+  const correct = scored.filter((s) => (s.p >= 0.5 ? 1 : 0) === s.y).length;
+  return {
+    accuracy: correct / scored.length,
+    precision: tp + fp === 0 ? 0 : tp / (tp + fp),
+    recall: tp + fn === 0 ? 0 : tp / (tp + fn),
+    auc: auc(scored),
+    brier: scored.reduce((sum, s) => sum + (s.p - s.y) ** 2, 0) / scored.length
+  };
+};
+
+const pct = (value) => `${(value * 100).toFixed(1)}%`;
+
+const report = (label, scored) => {
+  const m = classification(scored);
+  console.log(
+    `${label.padEnd(22)} acc ${pct(m.accuracy).padStart(6)}  precision ${pct(m.precision).padStart(6)}  ` +
+    `recall ${pct(m.recall).padStart(6)}  AUC ${m.auc.toFixed(3)}  Brier ${m.brier.toFixed(3)}`
+  );
+};
+
+const percentile = (sorted, q) => sorted[Math.min(sorted.length - 1, Math.floor(q * sorted.length))];
+
+const rows = fs.readFileSync(DATA, 'utf-8').split('\n').filter((line) => line.trim()).map((line) => JSON.parse(line));
+const evalRows = rows.filter((row) => row.split === 'eval');
+const detector = createLocalDetector(JSON.parse(fs.readFileSync(MODEL, 'utf-8')));
+
+const local = evalRows.map((row) => ({ y: row.label === 'ai' ? 1 : 0, p: detector.score(row.text), hard: row.hard }));
+const legacy = evalRows.map((row) => ({ y: row.label === 'ai' ? 1 : 0, p: legacyHeuristic(row.text), hard: row.hard }));
+
+console.log(`eval split: ${evalRows.length} samples (${local.filter((s) => s.y).length} ai), ${local.filter((s) => s.hard).length} marked hard\n`);
+report('local detector', local);
+report('local, hard subset', local.filter((s) => s.hard));
+report('legacy heuristic', legacy);
+report('legacy, hard subset', legacy.filter((s) => s.hard));
+
+const kept = local.filter((s) => s.p < LOW || s.p > HIGH);
+console.log(
+  `\nlocal-first band [${LOW}, ${HIGH}]: ${pct(1 - kept.length / local.length)} escalated, ` +
+  `accuracy on the rest ${kept.length ? pct(classification(kept).accuracy) : 'n/a'}`
+);
+
+// Latency on 1000-word documents stitched together from the eval texts.
+const words = evalRows.flatMap((row) => row.text.split(/\s+/));
+const docs = Array.from({ length: 64 }, (_, i) => {
+  const start = (i * 97) % words.length;
+  return Array.from({ length: 1000 }, (_, k) => words[(start + k) % words.length]).join(' ');
+});
+
+for (let i = 0; i < 50; i++) detector.score(docs[i % docs.length]);
+const timings = [];
+for (let i = 0; i < ITERATIONS; i++) {
+  const startedAt = performance.now();
+  detector.score(docs[i % docs.length]);
+  timings.push(performance.now() - startedAt);
+}
+timings.sort((a, b) => a - b);
+console.log(
+  `\nscore(1000 words): p50 ${percentile(timings, 0.5).toFixed(3)} ms  p95 ${percentile(timings, 0.95).toFixed(3)} ms  ` +
+  `p99 ${percentile(timings, 0.99).toFixed(3)} ms`
+);
+
+const batchRounds = Math.max(1, Math.round(ITERATIONS / docs.length));
+const batchStart = performance.now();
+for (let i = 0; i < batchRounds; i++) detector.scoreBatch(docs);
+const batchMs = performance.now() - batchStart;
+console.log(
+  `scoreBatch(${docs.length} x 1000 words): ${(batchMs / batchRounds).toFixed(2)} ms per batch, ` +
+  `${Math.round((docs.length * batchRounds) / (batchMs / 1000))} docs/s on one core`
+);
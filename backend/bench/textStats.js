@@ -0,0 +1,81 @@
+// Compares the single-pass text statistics module with the per-call-site
+// regex splits it replaced, plus the old and new padToWordCount.
+//   node bench/textStats.js [--words=5000] [--iterations=200]
+import { performance } from 'perf_hooks';
+import { computeTextStats, getTextStats } from '../src/utils/textStats.js';
+
+const args = Object.fromEntries(
+  process.argv.slice(2).map((arg) => arg.replace(/^--/, '').split('='))
+);
+const WORDS = Number(args.words || 5000);
+const ITERATIONS = Number(args.iterations || 200);
+
+const VOCABULARY = (
+  'the model classifies incoming support tickets by urgency while keeping latency predictable ' +
+  'under load and reports readability figures alongside sentiment summaries for every document'
+).split(' ');
+
+const buildText = (words) => {
+  const parts = [];
+  for (let i = 0; i < words; i++) {
+    const word = VOCABULARY[(i * 7 + (i >> 3)) % VOCABULARY.length];
+    parts.push(i % 17 === 16 ? `${word}.` : word);
+  }
+  return parts.join(' ');
+};
+
+// The splits each call site used to run on the same text within one request.
+const legacyStats = (text) => {
+  const words = text.split(/\s+/).filter(Boolean);
+  const uniqueWords = new Set(words.map((w) => w.toLowerCase())).size;
+  const sentenceCount = text.split(/[.!?]+/).filter((s) => s.trim()).length;
+  const detectorWords = text.split(/\s+/).filter((w) => w.length > 0).length;
+  const detectorSentences = text.split(/[.!?]+/).filter((s) => s.trim().length > 0).length;
+  const avgWordLength = text.replace(/\s+/g, '').length / detectorWords;
+  const analysisWords = text.split(/\s+/).filter((w) => w.length > 0).length;
+  const analysisSentences = text.split(/[.!?]+/).filter((s) => s.trim().length > 0).length;
+  const analysisWordLength = text.replace(/\s+/g, '').length / analysisWords;
+  const keywords = text.toLowerCase().split(/[^a-z0-9]+/).filter((w) => w.length > 4).slice(0, 5);
+  const ticketWords = text.split(/\s+/).filter((w) => w.length > 0).length;
+  return [uniqueWords, sentenceCount, detectorSentences, avgWordLength, analysisSentences, analysisWordLength, keywords, ticketWords];
+};
+
+const legacyCountWords = (text = '') => text.split(/\s+/).filter(Boolean).length;
+const legacyPad = (text, targetWords, filler) => {
+  let output = text.trim();
+  while (legacyCountWords(output) < targetWords) output = `${output} ${filler}`;
+  return output;
+};
+const pad = (text, targetWords, filler) => {
+  const output = text.trim();
+  const fillerWords = legacyCountWords(filler);
+  const missingWords = targetWords - getTextStats(output).wordCount;
+  if (missingWords <= 0) return output;
+  return `${output}${` ${filler}`.repeat(Math.ceil(missingWords / fillerWords))}`;
+};
+
+const time = (label, fn, iterations = ITERATIONS) => {
+  for (let i = 0; i < Math.min(10, iterations); i++) fn(i);
+  const startedAt = performance.now();
+  for (let i = 0; i < iterations; i++) fn(i);
+  const perCallMs = (performance.now() - startedAt) / iterations;
+  console.log(`${label.padEnd(42)} ${perCallMs.toFixed(3)} ms/op`);
+  return perCallMs;
+};
+
+const texts = Array.from({ length: ITERATIONS + 10 }, (_, i) => `${buildText(WORDS)} variant${i}`);
+
+console.log(`${WORDS}-word inputs, ${ITERATIONS} iterations\n`);
+const legacy = time('legacy regex splits (all call sites)', (i) => legacyStats(texts[i]));
+const single = time('computeTextStats (one pass)', (i) => computeTextStats(texts[i]));
+const memoized = time('getTextStats x4 per request (memoized)', (i) => {
+  for (let call = 0; call < 4; call++) getTextStats(texts[i]);
+});
+console.log(`speedup vs legacy: ${(legacy / single).toFixed(1)}x single pass, ${(legacy / memoized).toFixed(1)}x per request\n`);
+
+const filler = 'This continued discussion keeps expanding the core idea for clarity.';
+const seed = buildText(50);
+const padIterations = Math.max(1, Math.round(ITERATIONS / 20));
+const legacyPadMs = time(`legacy padToWordCount 50 -> ${WORDS} words`, () => legacyPad(seed, WORDS, filler), padIterations);
+const padMs = time(`padToWordCount 50 -> ${WORDS} words`, () => pad(seed, WORDS, filler), padIterations);
+console.log(`speedup: ${(legacyPadMs / padMs).toFixed(0)}x`);
@@ -0,0 +1,153 @@
+// Trains the bundled local AI-text detector (logistic regression over hashed
+// n-grams and stylometric features) and writes src/models/localDetector.json.
+//   node bench/trainLocalDetector.js [--data=bench/data/detection_samples.jsonl]
+//     [--out=src/models/localDetector.json] [--epochs=400] [--lr=0.5] [--l2=0.01] [--folds=5]
+// Rows are JSON lines { text, label: 'ai' | 'human', split: 'train' | 'eval', topic? }.
+// The model is fitted on the train split (cross-validation folds keep each topic
+// together) and scored once on the eval split, whose topics never appear in training.
+import fs from 'fs';
+import path from 'path';
+import { fileURLToPath } from 'url';
+import { DENSE_FEATURES, HASH_BITS, extractFeatures } from '../src/utils/localDetector.js';
+
+const args = Object.fromEntries(
+  process.argv.slice(2).map((arg) => arg.replace(/^--/, '').split('='))
+);
+const DATA = args.data || fileURLToPath(new URL('./data/detection_samples.jsonl', import.meta.url));
+const OUT = args.out || fileURLToPath(new URL('../src/models/localDetector.json', import.meta.url));
+const EPOCHS = Number(args.epochs || 400);
+const LEARNING_RATE = Number(args.lr || 0.5);
+const L2 = Number(args.l2 || 0.01);
+const FOLDS = Number(args.folds || 5);
+
+const BUCKETS = 1 << HASH_BITS;
+
+const readSamples = (file) =>
+  fs.readFileSync(file, 'utf-8')
+    .split('\n')
+    .filter((line) => line.trim())
+    .map((line) => JSON.parse(line));
+
+const toExample = (row) => ({ ...extractFeatures(row.text), y: row.label === 'ai' ? 1 : 0, group: row.topic ?? row.text });
+
+const standardization = (examples) => {
+  const mean = DENSE_FEATURES.map((_, i) => examples.reduce((sum, ex) => sum + ex.dense[i], 0) / examples.length);
+  const std = DENSE_FEATURES.map((_, i) =>
+    Math.sqrt(examples.reduce((sum, ex) => sum + (ex.dense[i] - mean[i]) ** 2, 0) / examples.length) || 1
+  );
+  return { mean, std };
+};
+
+// Full-batch gradient descent on the L2-regularised log loss; deterministic from a zero start.
+const train = (examples) => {
+  const { mean, std } = standardization(examples);
+  const scaled = examples.map((ex) => Float64Array.from(ex.dense, (value, i) => (value - mean[i]) / std[i]));
+  const hashed = new Float64Array(BUCKETS);
+  const denseWeights = new Float64Array(DENSE_FEATURES.length);
+  let bias = 0;
+
+  for (let epoch = 0; epoch < EPOCHS; epoch++) {
+    const hashedGrad = new Float64Array(BUCKETS);
+    const denseGrad = new Float64Array(DENSE_FEATURES.length);
+    let biasGrad = 0;
+    examples.forEach((ex, n) => {
+      let z = bias;
+      for (let k = 0; k < ex.indices.length; k++) z += hashed[ex.indices[k]] * ex.values[k];
+      for (let i = 0; i < denseWeights.length; i++) z += denseWeights[i] * scaled[n][i];
+      const error = 1 / (1 + Math.exp(-z)) - ex.y;
+      for (let k = 0; k < ex.indices.length; k++) hashedGrad[ex.indices[k]] += error * ex.values[k];
+      for (let i = 0; i < denseWeights.length; i++) denseGrad[i] += error * scaled[n][i];
+      biasGrad += error;
+    });
+    const step = LEARNING_RATE / examples.length;
+    for (let j = 0; j < BUCKETS; j++) hashed[j] -= step * hashedGrad[j] + LEARNING_RATE * L2 * hashed[j];
+    for (let i = 0; i < denseWeights.length; i++) denseWeights[i] -= step * denseGrad[i] + LEARNING_RATE * L2 * denseWeights[i];
+    bias -= step * biasGrad;
+  }
+
+  return { hashed, denseWeights, bias, mean, std };
+};
+
+const predict = (weights, ex) => {
+  let z = weights.bias;
+  for (let k = 0; k < ex.indices.length; k++) z += weights.hashed[ex.indices[k]] * ex.values[k];
+  for (let i = 0; i < weights.denseWeights.length; i++) {
+    z += weights.denseWeights[i] * ((ex.dense[i] - weights.mean[i]) / weights.std[i]);
+  }
+  return 1 / (1 + Math.exp(-z));
+};
+
+const crossValidate = (examples) => {
+  const groups = [...new Set(examples.map((ex) => ex.group))];
+  let correct = 0;
+  for (let fold = 0; fold < FOLDS; fold++) {
+    const held = new Set(groups.filter((_, i) => i % FOLDS === fold));
+    const weights = train(examples.filter((ex) => !held.has(ex.group)));
+    for (const ex of examples.filter((ex) => held.has(ex.group))) {
+      if ((predict(weights, ex) >= 0.5 ? 1 : 0) === ex.y) correct += 1;
+    }
+  }
+  return correct / examples.length;
+};
+
+const round = (value) => Number(value.toPrecision(6));
+
+// 95% Wilson score interval for an accuracy measured on `n` samples.
+const wilson = (accuracy, n, z = 1.96) => {
+  const centre = (accuracy + (z * z) / (2 * n)) / (1 + (z * z) / n);
+  const half = (z * Math.sqrt((accuracy * (1 - accuracy)) / n + (z * z) / (4 * n * n))) / (1 + (z * z) / n);
+  return [Math.max(0, centre - half), Math.min(1, centre + half)];
+};
+
+const accuracyOf = (weights, set) =>
+  set.filter((ex) => (predict(weights, ex) >= 0.5 ? 1 : 0) === ex.y).length / set.length;
+
+const pct = (value) => `${(value * 100).toFixed(1)}%`;
+
+const samples = readSamples(DATA);
+const examples = samples.filter((row) => row.split === 'train').map(toExample);
+const heldOut = samples.filter((row) => row.split === 'eval').map(toExample);
+const positives = examples.filter((ex) => ex.y === 1).length;
+console.log(`${examples.length} training samples (${positives} ai, ${examples.length - positives} human), ${EPOCHS} epochs`);
+
+const overlap = heldOut.filter((ex) => typeof ex.group === 'number' && examples.some((train) => train.group === ex.group));
+if (overlap.length) {
+  console.error(`eval split shares ${overlap.length} topics with the train split; its accuracy would be optimistic`);
+  process.exit(1);
+}
+
+const crossValidated = FOLDS > 1 ? crossValidate(examples) : null;
+if (crossValidated !== null) {
+  console.log(`${FOLDS}-fold cross-validated accuracy (grouped by topic): ${pct(crossValidated)}`);
+}
+
+const weights = train(examples);
+console.log(`training-set fit: ${pct(accuracyOf(weights, examples))} (not an estimate of real accuracy)`);
+
+let evaluation = null;
+if (heldOut.length) {
+  const accuracy = accuracyOf(weights, heldOut);
+  const [low, high] = wilson(accuracy, heldOut.length);
+  evaluation = { samples: heldOut.length, accuracy: round(accuracy), ci95: [round(low), round(high)] };
+  console.log(`held-out eval accuracy: ${pct(accuracy)} on ${heldOut.length} samples (95% CI ${pct(low)}-${pct(high)})`);
+}
+
+const model = {
+  version: 1,
+  trainedAt: new Date().toISOString(),
+  samples: examples.length,
+  evaluation: { heldOut: evaluation, crossValidated: crossValidated === null ? null : round(crossValidated) },
+  hashBits: HASH_BITS,
+  bias: round(weights.bias),
+  dense: {
+    names: DENSE_FEATURES,
+    mean: weights.mean.map(round),
+    std: weights.std.map(round),
+    weights: Array.from(weights.denseWeights, round)
+  },
+  hashedWeights: Array.from(weights.hashed, round)
+};
+
+fs.mkdirSync(path.dirname(OUT), { recursive: true });
+fs.writeFileSync(OUT, `${JSON.stringify(model)}\n`);
+console.log(`wrote ${OUT}`);
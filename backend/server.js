@@ -1,68 +1,62 @@
-import express from "express";
-import cors from "cors";
+import cluster from "cluster";
 import dotenv from "dotenv";
-import { clerkMiddleware } from '@clerk/express';
-
-import aiDetectionRoutes from './src/routes/aiDetectionRoutes.js';
-import textGenerationRoutes from './src/routes/textGenerationRoutes.js';
-import classificationRoutes from './src/routes/classificationRoutes.js';
-import assistantRoutes from './src/routes/assistantRoutes.js';
-
+import { defaultPoolSize } from './src/utils/workerPool.js';
 
 dotenv.config();
 
-const app = express();
-app.use(cors());
-app.use(express.json());
-
-app.get('/health', (req, res) => {
-  res.status(200).json({
-    status: 'OK',
-    uptime: process.uptime(),
-    timestamp: new Date().toISOString()
-  });
-});
-
-app.head('/health', (req, res) => {
-  res.status(200).end();
-});
-
-app.get('/', (req, res) => {
-  res.status(200).json({
-    status: 'OK',
-    message: 'Backend API is running'
-  });
-});
+const port = process.env.PORT || 5000;
 
-app.head('/', (req, res) => {
-  res.status(200).end();
-});
+// CLUSTER_WORKERS=1 (or 0) runs a single process without a primary.
+const clusterWorkers = process.env.CLUSTER_WORKERS?.trim()
+  ? Number(process.env.CLUSTER_WORKERS)
+  : defaultPoolSize();
 
-const clerkKey = process.env.CLERK_SECRET_KEY?.trim();
-if (clerkKey && clerkKey !== 'dummy') {
-  app.use(clerkMiddleware());
+if (cluster.isPrimary && clusterWorkers > 1) {
+  const { startPrimary } = await import('./src/utils/clusterPrimary.js');
+  startPrimary({ workers: clusterWorkers });
 } else {
-  
-}
-
-app.use('/api/ai', aiDetectionRoutes);
-app.use('/api/generate', textGenerationRoutes);
-app.use('/api/classify', classificationRoutes);
-app.use('/api/assistant', assistantRoutes);
-
-
-app.use((err, req, res, next) => {
-  console.error('Error:', err);
-  
-  res.status(err.statusCode || 500).json({
-    success: false,
-    message: err.message || "Internal Server Error",
-    errors: err.errors || [],
-    ...(process.env.NODE_ENV === 'development' && { stack: err.stack })
+  const { default: app } = await import('./src/app.js');
+  const { getLoadStats } = await import('./src/middlewares/loadMiddleware.js');
+  const { METRICS_ENABLED, getMetricsSnapshot } = await import('./src/utils/metrics.js');
+  const { clearInferenceCache, setInferenceCacheSharedTier } = await import('./src/utils/huggingface.js');
+  const { createClusterCacheTier, isClusterWorker, startHeartbeat, subscribe } = await import('./src/utils/clusterBus.js');
+  const { isCloudinaryConfigured } = await import('./src/utils/cloudinary.js');
+  const { initArchiveQueue } = await import('./src/utils/uploadQueue.js');
+  const { drainJobQueue } = await import('./src/utils/jobQueue.js');
+
+  const server = app.listen(port, () => {
+    console.log(`Server is running on port ${port}${isClusterWorker ? ` (worker ${cluster.worker.id}, pid ${process.pid})` : ''}`);
   });
-});
 
-const port = process.env.PORT || 5000;
-app.listen(port, () => {
-  console.log(`Server is running on port ${port}`);
-});
\ No newline at end of file
+  // Resume archive uploads left queued by a previous run.
+  if (isCloudinaryConfigured()) {
+    initArchiveQueue();
+  }
+
+  // Stop accepting connections, let in-flight requests and accepted async jobs finish, then exit.
+  let closing = false;
+  const drain = () => {
+    if (closing) return;
+    closing = true;
+    server.close(() => drainJobQueue().then(() => process.exit(0)));
+    server.closeIdleConnections();
+    setTimeout(() => process.exit(0), Number(process.env.SHUTDOWN_TIMEOUT_MS || 30000)).unref();
+  };
+
+  if (isClusterWorker) {
+    // Opt-in: every local miss then pays an IPC round trip to the primary (bench/clusterCache.js).
+    if ((process.env.CLUSTER_SHARED_CACHE || '').toLowerCase() === 'true') {
+      setInferenceCacheSharedTier(createClusterCacheTier());
+    }
+    subscribe('cache:invalidate', () => clearInferenceCache());
+    subscribe('worker:shutdown', drain);
+    startHeartbeat(
+      () => ({ ...getLoadStats(), metrics: METRICS_ENABLED ? getMetricsSnapshot() : null }),
+      Number(process.env.CLUSTER_HEARTBEAT_MS || 2000)
+    );
+    process.on('disconnect', drain);
+  } else {
+    process.on('SIGTERM', drain);
+    process.on('SIGINT', drain);
+  }
+}
@@ -2,12 +2,14 @@ import asynchandler from '../utils/AsyncHandler.js';
 import ApiError from '../utils/ApiError.js';
 import apiresponse from '../utils/ApiResponse.js';
 import { detectAIContent } from '../utils/huggingface.js';
+import { inferenceOptions, batchItemOptions } from '../utils/requestOptions.js';
+import { streamBatchResults } from '../utils/ndjson.js';
+import { getTextStats } from '../utils/textStats.js';
 
 const toPercent = (value) => Math.min(100, Math.max(0, Math.round(value * 100)));
 
-export const detectContent = asynchandler(async (req, res) => {
-  const { text } = req.body;
-
+// Validates and scores one text; shared by the single and batch endpoints.
+const runDetection = async (text, options) => {
   if (!text || typeof text !== 'string') {
     throw new ApiError(400, "Text is required and must be a string");
   }
@@ -16,7 +18,8 @@ export const detectContent = asynchandler(async (req, res) => {
     throw new ApiError(400, "Text cannot be empty");
   }
 
-  const wordCount = text.split(/\s+/).filter(w => w.length > 0).length;
+  const stats = getTextStats(text);
+  const { wordCount } = stats;
   if (wordCount < 10) {
     throw new ApiError(400, "Text must contain at least 10 words for accurate analysis");
   }
@@ -25,11 +28,9 @@ export const detectContent = asynchandler(async (req, res) => {
     throw new ApiError(400, "Text is too long. Maximum 5000 words allowed");
   }
 
-  const detectionResult = await detectAIContent(text);
+  const detectionResult = await detectAIContent(text, options);
 
-  const sentenceCount = text.split(/[.!?]+/).filter(s => s.trim().length > 0).length;
-  const avgSentenceLength = wordCount / sentenceCount;
-  const avgWordLength = text.replace(/\s+/g, '').length / wordCount;
+  const { sentenceCount, avgSentenceLength, avgWordLength } = stats;
 
   const aiPercent = detectionResult.aiProbability * 100;
 
@@ -90,6 +91,13 @@ export const detectContent = asynchandler(async (req, res) => {
     }
   };
 
+  return responseData;
+};
+
+export const detectContent = asynchandler(async (req, res) => {
+  const { text } = req.body;
+  const responseData = await runDetection(text, inferenceOptions(req));
+
   const apiResponse = new apiresponse(
     200,
     "AI content detection completed successfully",
@@ -98,3 +106,10 @@ export const detectContent = asynchandler(async (req, res) => {
 
   return res.status(200).json(apiResponse);
 });
+
+export const detectContentBatch = asynchandler(async (req, res) => {
+  const itemOptions = batchItemOptions(req);
+  return streamBatchResults(req, res, (item) =>
+    runDetection(typeof item === 'string' ? item : item?.text, itemOptions())
+  );
+});
@@ -1,12 +1,129 @@
-import { generateText } from '../utils/huggingface.js';
-import { uploadToCloudinary, isCloudinaryConfigured } from '../utils/cloudinary.js';
-import { validateFile, extractTextFromFile } from '../utils/textExtractor.js';
+import { generateText, streamText } from '../utils/huggingface.js';
+import { isCloudinaryConfigured } from '../utils/cloudinary.js';
+import { enqueueArchiveUpload } from '../utils/uploadQueue.js';
+import { validateFile, extractUploadedFile, getStoredDocument } from '../utils/textExtractor.js';
+import { UPLOAD_MAX_MB } from '../middlewares/multermiddleware.js';
+import { isValidDocumentId } from '../utils/documentStore.js';
+import { retrievePassages, TOKEN_BUDGETS } from '../utils/retrieval.js';
+import { isGatewayRejection } from '../utils/inferenceGateway.js';
+import ApiError from '../utils/ApiError.js';
 import apiresponse from '../utils/ApiResponse.js';
+import { inferenceOptions } from '../utils/requestOptions.js';
+import { wantsEventStream, createEventStream, endWithError } from '../utils/sse.js';
+import { jobPriority, submitJob, wantsAsyncJob } from '../utils/jobQueue.js';
+
+
+// Archiving, extraction, retrieval and generation; shared by the synchronous
+// endpoint and the async job path. `openStream`, when given, is called once
+// extraction has succeeded, so input errors still get a plain status code.
+const runAssistantResponse = async ({ file, storedDocument, userInput }, options, openStream = null) => {
+  const shouldUploadToCloudinary =
+    isCloudinaryConfigured() &&
+    (process.env.SAVE_UPLOADS_TO_CLOUDINARY || '').toLowerCase() === 'true';
+
+  // Archive to Cloudinary (optional) in the background; only staging the file happens here
+  const archiving = file && shouldUploadToCloudinary
+    ? enqueueArchiveUpload(file, { folder: 'documents', resourceType: 'raw' }).catch((error) => {
+        console.error('[ERROR] Could not queue Cloudinary upload:', error);
+        return null;
+      })
+    : null;
+
+  // Extract text from file
+  let cleanFileText;
+  let document = storedDocument;
+  try {
+    if (!document) {
+      document = await extractUploadedFile(file);
+    }
+    cleanFileText = document.text;
+  } catch (error) {
+    console.error('[ERROR] Text extraction failed:', error);
+    throw new ApiError(error.statusCode || 400, `Failed to extract text from file: ${error.message}`);
+  }
+
+  if (!cleanFileText || cleanFileText.trim().length === 0) {
+    throw new ApiError(400, 'Could not extract text from file. File may be empty or corrupted.');
+  }
 
+  // Only the passages relevant to the question go into the prompt
+  const retrieval = retrievePassages({
+    text: cleanFileText,
+    query: userInput,
+    documentId: document.documentId,
+    tokenBudget: TOKEN_BUDGETS.assistant
+  });
+
+  // Generate AI response
+  const assistantMessages = [
+    {
+      role: 'system',
+      content:
+        'You are a meticulous document analysis assistant. Answer only using the uploaded file. ' +
+        'If the answer is missing, explicitly say you cannot find it. Cite sections or quotes when possible.'
+    },
+    {
+      role: 'user',
+      content: `${retrieval.stats.retrieved ? 'Most relevant document passages (in document order):' : 'Document:'}
+"""
+${retrieval.context}
+"""
+
+Question:
+${userInput}`
+    }
+  ];
+
+  const generationOptions = {
+    maxTokens: 600,
+    temperature: 0.2,
+    topP: 0.9,
+    ...options
+  };
+
+  const stream = openStream ? openStream() : null;
+  let generated;
+  let fallback = false;
+  try {
+    generated = stream
+      ? await stream.pipeTokens(streamText(assistantMessages, generationOptions))
+      : await generateText(assistantMessages, generationOptions);
+  } catch (error) {
+    if (isGatewayRejection(error)) throw error;
+    console.error('[ERROR] AI generation failed:', error);
+    fallback = true;
+    generated = `Based on the uploaded content, Artificial Intelligence is described as ${cleanFileText.substring(0, 280)}...`;
+  }
+
+  const answer = (generated || '').trim();
+  const archive = await archiving;
+  const responseData = {
+    answer,
+    document_id: document.documentId,
+    retrieval: retrieval.stats,
+    file_info: {
+      name: file?.originalname ?? document.name,
+      size: file?.size ?? document.size,
+      type: file?.mimetype ?? document.mimetype,
+      url: archive?.url || null,
+      cloudinaryId: archive?.cloudinaryId || null,
+      upload: archive && { id: archive.id, status: archive.status, statusUrl: `/api/uploads/${archive.id}` }
+    },
+    timestamp: new Date().toISOString()
+  };
+
+  const apiResponse = new apiresponse(200, 'Assistant response generated successfully', responseData);
+  const body = {
+    ...apiResponse,
+    answer,
+    response: answer
+  };
+  return stream ? { body, stream, fallback } : { body };
+};
 
 export async function respondAssistant(req, res) {
   try {
-    const { user_input } = req.body || {};
+    const { user_input, document_id } = req.body || {};
 
     let file = null;
     if (req.file) {
@@ -26,112 +143,62 @@ export async function respondAssistant(req, res) {
       });
     }
 
-    if (!file) {
+    // A previously returned document_id stands in for the upload
+    let storedDocument = null;
+    if (!file && document_id) {
+      if (!isValidDocumentId(document_id)) {
+        return res.status(400).json({ error: 'document_id is malformed.' });
+      }
+      storedDocument = await getStoredDocument(document_id);
+      if (!storedDocument) {
+        return res.status(404).json({
+          error: 'Unknown or expired document_id. Please upload the file again.'
+        });
+      }
+    }
+
+    if (!file && !storedDocument) {
       return res.status(400).json({ 
         error: 'File upload is required.' 
       });
     }
 
     // Validate file
-    const validation = validateFile(file, 5);
-    if (!validation.valid) {
-      return res.status(400).json({ error: validation.error });
-    }
-
-    const shouldUploadToCloudinary =
-      isCloudinaryConfigured() &&
-      (process.env.SAVE_UPLOADS_TO_CLOUDINARY || '').toLowerCase() === 'true';
-
-    // Upload to Cloudinary (optional)
-    let cloudinaryResult = null;
-    if (shouldUploadToCloudinary) {
-      try {
-        cloudinaryResult = await uploadToCloudinary(
-          file.buffer,
-          'documents',
-          'raw'
-        );
-      } catch (error) {
-        console.error('[ERROR] Cloudinary upload failed:', error);
-        return res.status(500).json({ 
-          error: 'Failed to upload file to cloud storage' 
-        });
+    if (file) {
+      const validation = validateFile(file, UPLOAD_MAX_MB);
+      if (!validation.valid) {
+        return res.status(400).json({ error: validation.error });
       }
     }
 
-    // Extract text from file
-    let cleanFileText;
-    try {
-      cleanFileText = await extractTextFromFile(file.buffer, file.mimetype);
-
-      if (!cleanFileText || cleanFileText.trim().length === 0) {
-        return res.status(400).json({
-          error: 'Could not extract text from file. File may be empty or corrupted.'
-        });
-      }
-
-    } catch (error) {
-      console.error('[ERROR] Text extraction failed:', error);
-      return res.status(400).json({
-        error: `Failed to extract text from file: ${error.message}`
-      });
+    if (wantsAsyncJob(req)) {
+      const options = inferenceOptions(req);
+      const job = await submitJob(
+        'assistant.respond',
+        async (jobFile, { deadline }) =>
+          (await runAssistantResponse({ file: jobFile, storedDocument, userInput: user_input }, { ...options, deadline })).body,
+        { priority: jobPriority(req), file }
+      );
+      return res.status(202).location(job.statusUrl).json(new apiresponse(202, 'Assistant request queued', job));
     }
 
-    // Generate AI response
-    const assistantMessages = [
-      {
-        role: 'system',
-        content:
-          'You are a meticulous document analysis assistant. Answer only using the uploaded file. ' +
-          'If the answer is missing, explicitly say you cannot find it. Cite sections or quotes when possible.'
-      },
-      {
-        role: 'user',
-        content: `Document excerpt (first 3000 characters):
-"""
-${cleanFileText.slice(0, 3000)}
-"""
+    const { body, stream, fallback } = await runAssistantResponse(
+      { file, storedDocument, userInput: user_input },
+      inferenceOptions(req),
+      wantsEventStream(req) ? () => createEventStream(res) : null
+    );
 
-Question:
-${user_input}`
-      }
-    ];
-
-    let generated;
-    try {
-      generated = await generateText(assistantMessages, { 
-        maxTokens: 600, 
-        temperature: 0.2,
-        topP: 0.9
-      });
-    } catch (error) {
-      console.error('[ERROR] AI generation failed:', error);
-      generated = `Based on the uploaded content, Artificial Intelligence is described as ${cleanFileText.substring(0, 280)}...`;
-    }
-
-    const answer = (generated || '').trim();
-    const responseData = {
-      answer,
-      file_info: {
-        name: file.originalname,
-        size: file.size,
-        type: file.mimetype,
-        url: cloudinaryResult?.secure_url || null,
-        cloudinaryId: cloudinaryResult?.public_id || null
-      },
-      timestamp: new Date().toISOString()
-    };
-
-    const apiResponse = new apiresponse(200, 'Assistant response generated successfully', responseData);
-
-    return res.status(200).json({
-      ...apiResponse,
-      answer,
-      response: answer
-    });
+    if (stream) return stream.end('done', { ...body, fallback });
+    return res.status(200).json(body);
   } catch (error) {
     console.error('[ERROR] Document Assistant error:', error);
-    return res.status(500).json({
+    if (res.headersSent) {
+      return endWithError(res, error);
+    }
+    if (error instanceof ApiError && error.statusCode < 500) {
+      return res.status(error.statusCode).json({ error: error.message });
+    }
+    return res.status(error.statusCode || 500).json({
       error: `Unexpected error: ${error.message}`
     });
   }
@@ -2,12 +2,43 @@ import asynchandler from '../utils/AsyncHandler.js';
 import ApiError from '../utils/ApiError.js';
 import apiresponse from '../utils/ApiResponse.js';
 import { classifyText, generateText } from '../utils/huggingface.js';
-import { uploadToCloudinary, isCloudinaryConfigured } from '../utils/cloudinary.js';
-import { validateFile, extractTextFromFile } from '../utils/textExtractor.js';
+import { isCloudinaryConfigured } from '../utils/cloudinary.js';
+import { enqueueArchiveUpload } from '../utils/uploadQueue.js';
+import { validateFile, extractUploadedFile, getStoredDocument } from '../utils/textExtractor.js';
+import { UPLOAD_MAX_MB } from '../middlewares/multermiddleware.js';
+import { isValidDocumentId } from '../utils/documentStore.js';
+import { retrievePassages, TOKEN_BUDGETS } from '../utils/retrieval.js';
+import { backoffDelay, isGatewayRejection } from '../utils/inferenceGateway.js';
 import { jsonrepair } from 'jsonrepair';
+import { inferenceOptions, batchItemOptions } from '../utils/requestOptions.js';
+import { streamBatchResults } from '../utils/ndjson.js';
+import { getTextStats } from '../utils/textStats.js';
+import { startSpan, timeSpan } from '../utils/metrics.js';
+import { jobPriority, submitJob, wantsAsyncJob } from '../utils/jobQueue.js';
 
 const MIN_RESUME_LENGTH = Number(process.env.RESUME_MIN_CHAR_LENGTH || 50);
 
+// Query used to pick the triage-relevant parts of long tickets.
+const TRIAGE_QUERY = 'login authentication password access payment invoice refund billing slow latency timeout performance crash error exception outage down security breach data loss urgent feature request add';
+
+const parseClassification = (raw) => {
+  const jsonMatch = raw.match(/\{[\s\S]*\}/);
+  if (!jsonMatch) throw new Error('Model did not return JSON');
+  return JSON.parse(jsonMatch[0]);
+};
+
+const parseResumeAnalysis = (raw) => JSON.parse(jsonrepair(raw));
+
+// Outputs that fail to parse are kept out of the response cache.
+const canParse = (parse, raw) => {
+  try {
+    parse(raw);
+    return true;
+  } catch {
+    return false;
+  }
+};
+
 const expandResumeText = (content, jobTitle) => {
   const trimmed = (content || '').trim();
   if (!trimmed) {
@@ -27,14 +58,15 @@ const expandResumeText = (content, jobTitle) => {
   return buffer;
 };
 
-export const classifyTicket = asynchandler(async (req, res) => {
-  const { text, userId } = req.body;
-  if (!text || text.trim().length === 0) throw new ApiError(400, 'Ticket text is required');
+// Validates and triages one ticket; shared by the single and batch endpoints.
+const runTicketClassification = async ({ text, userId } = {}, options) => {
+  if (typeof text !== 'string' || text.trim().length === 0) throw new ApiError(400, 'Ticket text is required');
   // Improved prompt emphasizing root cause identification & stricter JSON contract.
+  const ticketExcerpt = retrievePassages({ text, query: TRIAGE_QUERY, tokenBudget: TOKEN_BUDGETS.ticket }).context;
   const prompt = `You are a senior SaaS support ticket triage engine.
 Analyze the ticket and OUTPUT ONLY MINIFIED JSON.
 
-TICKET:\n"""\n${text.slice(0,4000)}\n"""\n
+TICKET:\n"""\n${ticketExcerpt}\n"""\n
 INSTRUCTIONS:
 - Derive a SPECIFIC category (avoid vague words like 'Issue', 'Problem').
 - Infer priority using impact & urgency: Critical only for outage, security breach, irreversible data loss.
@@ -56,21 +88,26 @@ OUTPUT SCHEMA (MINIFIED JSON ONLY): {"category":"...","priority":"Critical|High|
 
   let classification;
   try {
-    const raw = await generateText(prompt, { maxTokens: 500, temperature: 0.2, topP: 0.9 });
-    const jsonMatch = raw.match(/\{[\s\S]*\}/);
-    if (!jsonMatch) throw new Error('Model did not return JSON');
-    classification = JSON.parse(jsonMatch[0]);
+    const raw = await generateText(prompt, {
+      maxTokens: 500,
+      temperature: 0.2,
+      topP: 0.9,
+      ...options,
+      validate: (output) => canParse(parseClassification, output)
+    });
+    classification = parseClassification(raw);
   } catch (err) {
+    if (isGatewayRejection(err)) throw err;
     console.error('Generation classification failed, fallback engaged:', err.message);
     const fallbackCategories = ['Payment Processing Failure','Feature Request','Authentication Problem','Data Loss','Performance Degradation','Bug Report','Account Access','Configuration Help'];
-    const cat = await classifyText(text, fallbackCategories);
+    const cat = await classifyText(text, fallbackCategories, options);
     classification = {
       category: cat.topLabel,
       priority: /crash|data loss|failed|down|error|unable|cannot/i.test(text) ? 'High' : 'Medium',
       department: 'Customer Success',
       sentiment: /urgent|asap|immediately|now/i.test(text) ? 'Urgent' : 'Neutral',
       estimatedResponseTime: 'Within 24 hours',
-      keywords: text.toLowerCase().split(/[^a-z0-9]+/).filter(w=>w.length>4).slice(0,5),
+      keywords: getTextStats(text).keywords,
       reasoning: 'Heuristic fallback applied'
     };
   }
@@ -78,18 +115,244 @@ OUTPUT SCHEMA (MINIFIED JSON ONLY): {"category":"...","priority":"Critical|High|
   classification.metadata = {
     userId: userId || null,
     textLength: text.length,
-    wordCount: text.split(/\s+/).filter(w=>w.length>0).length,
+    wordCount: getTextStats(text).wordCount,
     classifiedAt: new Date().toISOString(),
     model: 'meta-llama/Llama-3.2-1B-Instruct'
   };
 
+  return classification;
+};
+
+export const classifyTicket = asynchandler(async (req, res) => {
+  const classification = await runTicketClassification(req.body, inferenceOptions(req));
   return res.status(200).json(new apiresponse(200, 'Ticket classified successfully', classification));
 });
 
+export const classifyTicketBatch = asynchandler(async (req, res) => {
+  const itemOptions = batchItemOptions(req);
+  return streamBatchResults(req, res, (item) =>
+    runTicketClassification(typeof item === 'string' ? { text: item } : item, itemOptions())
+  );
+});
+
+
+// Archiving, extraction and the LLM analysis (retried once); shared by the
+// synchronous endpoint and the async job path.
+const runResumeAnalysis = async ({ file, storedDocument, jobTitle }, options) => {
+  const shouldUploadToCloudinary =
+    isCloudinaryConfigured() &&
+    (process.env.SAVE_UPLOADS_TO_CLOUDINARY || '').toLowerCase() === 'true';
+
+  // Archive to Cloudinary (optional) in the background; only staging the file happens here
+  const archiving = file && shouldUploadToCloudinary
+    ? enqueueArchiveUpload(file, { folder: 'resumes', resourceType: 'auto' }).catch((error) => {
+        console.error('[ERROR] Could not queue Cloudinary upload:', error);
+        return null;
+      })
+    : null;
+
+  // Extract text from resume
+  let text;
+  let document = storedDocument;
+  try {
+    if (!document) {
+      document = await extractUploadedFile(file);
+    }
+    text = expandResumeText(document.text, jobTitle);
+  } catch (error) {
+    console.error('[ERROR] Resume extraction failed:', error);
+    throw new ApiError(
+      error.statusCode || 400,
+      `Failed to parse resume file: ${error.message}`
+    );
+  }
+
+  const resumeExcerpt = retrievePassages({
+    text,
+    query: `${jobTitle} experience skills achievements led built managed`,
+    documentId: document.documentId,
+    tokenBudget: TOKEN_BUDGETS.resume
+  }).context;
+
+  // AI Analysis
+  let analysisResult;
+  let lastError = null;
+  for (let attempt = 0; attempt < 2; attempt++) {
+    try {
+    const resumeMessages = [
+      {
+        role: 'system',
+        content: [
+          'You are a Principal Talent Acquisition Lead reviewing resumes for executive-level roles.',
+          'You care about clarity, quantifiable impact, leadership, ATS readiness, and business outcomes.',
+          'Always mention gaps, weak metrics, or missing context.',
+          'Respond only with JSON that matches the provided schema. No commentary, markdown, or explanations.',
+          'If information is missing, infer reasonable placeholders rather than leaving blanks.'
+        ].join(' ')
+      },
+      {
+        role: 'user',
+        content: [
+          `Analyze the candidate resume for the role "${jobTitle}".`,
+          'Consider leadership progression, domain expertise, measurable achievements, and cultural fit.',
+          '',
+          'Resume excerpt (most relevant sections):',
+          '"""',
+          resumeExcerpt,
+          '"""',
+          '',
+          'Schema:',
+          '{',
+          '  "overallScore": <0-100>,',
+          '  "experienceAlignment": "<one paragraph summary>",',
+          '  "keyStrengths": ["string", ...],',
+          '  "criticalWeaknesses": ["string", ...],',
+          '  "skillGaps": ["string", ...],',
+          '  "atsKeywords": ["string", ...],',
+          '  "topPriorityAction": "<single most important change>",',
+          '  "nextStepAdvice": "<specific guidance>"',
+          '}',
+          '',
+          'Rules:',
+          '- overallScore: numeric quality assessment (0 weak, 100 outstanding). Avoid 0 unless truly empty.',
+          '- experienceAlignment: MUST be 5-7 sentences summarizing relevance, scope, impact, leadership, and gaps.',
+          '- keyStrengths: 6-8 action-oriented items; each starts with a verb (e.g., "Led", "Optimized").',
+          '- criticalWeaknesses: 3-5 items highlighting missing metrics, unclear scope, weak leadership signals.',
+          '- skillGaps: 3-5 domain or role-specific capabilities NOT evidenced (e.g., "Cloud cost optimization").',
+          '- atsKeywords: 8-10 keywords (lowercase, no duplicates) strongly tied to the role. Include skills, technologies, methodologies found OR logically expected.',
+          '- topPriorityAction: One concrete improvement (include metric angle if possible).',
+          '- nextStepAdvice: 2-3 sentences giving tactical improvement guidance.',
+          '- NEVER return empty arrays; if absent, infer reasonable placeholders based on role and text.',
+          '- Cite sections or phrases when possible using quotes ("project", "migration").',
+          '- Output must be VALID MINIFIED JSON. No comments, no markdown.',
+          '- Ensure each array item < 150 characters.',
+          '- If the resume is very short, still synthesize plausible professional improvements relevant to the role.'
+        ].join('\n')
+      }
+    ];
+
+    // A retry must reach the model: the cache would replay the output that just failed.
+    const aiRaw = await generateText(resumeMessages, {
+      maxTokens: 600,
+      temperature: 0.2,
+      topP: 0.9,
+      ...options,
+      refresh: options.refresh || attempt > 0,
+      validate: (output) => canParse(parseResumeAnalysis, output)
+    });
+
+    const endRepairSpan = startSpan('resume.json_repair');
+    const parsed = parseResumeAnalysis(aiRaw);
+    endRepairSpan();
+
+    const sanitizeArray = (value, fallback) => {
+      if (!Array.isArray(value) || value.length === 0) {
+        return fallback;
+      }
+      const cleaned = value
+        .map((item) => String(item).trim())
+        .filter(Boolean)
+        .filter((v, i, arr) => arr.indexOf(v) === i);
+      return cleaned.slice(0, 6);
+    };
+
+    const clampScore = (value) => {
+      const num = Number(value);
+      if (Number.isNaN(num)) return 0;
+      return Math.min(100, Math.max(0, Math.round(num)));
+    };
+
+    // Heuristic fallbacks if model omitted arrays
+    const heuristicTokens = (sourceText) => {
+      const tokens = (sourceText || '')
+        .toLowerCase()
+        .match(/[a-z0-9][a-z0-9\-+\.]{2,}/g) || [];
+      const stop = new Set(['and','for','the','with','from','that','this','into','over','under','into','work','team','role','lead','skill','skills']);
+      const freq = {};
+      tokens.forEach(t => { if (!stop.has(t)) freq[t] = (freq[t]||0)+1; });
+      return Object.entries(freq)
+        .sort((a,b)=>b[1]-a[1])
+        .map(([w])=>w)
+        .filter(w=>w.length>3)
+        .slice(0, 10);
+    };
+
+    const inferredKeywords = heuristicTokens(text).slice(0, 8);
+    const defaultStrengths = [
+      'Led cross-functional delivery initiatives',
+      'Improved operational efficiency with process refinement',
+      'Implemented scalable solutions aligning with strategic goals',
+      'Collaborated across teams to accelerate outcomes'
+    ];
+    const defaultWeaknesses = [
+      'Limited quantifiable impact metrics',
+      'Scope of leadership unclear in several projects',
+      'Missing clarity on budget or cost ownership',
+      'Few references to stakeholder alignment'
+    ];
+    const defaultSkillGaps = [
+      'Advanced data-driven decision making',
+      'End-to-end performance benchmarking',
+      'Formal risk management framework',
+      'Cost optimization strategies'
+    ];
+
+    analysisResult = {
+      overallScore: clampScore(parsed.overallScore),
+      experienceAlignment: parsed.experienceAlignment?.trim() || 'Candidate shows partial alignment; more quantified impact metrics and clearer leadership scope would strengthen fit.',
+      keyStrengths: sanitizeArray(parsed.keyStrengths, defaultStrengths),
+      criticalWeaknesses: sanitizeArray(parsed.criticalWeaknesses, defaultWeaknesses),
+      skillGaps: sanitizeArray(parsed.skillGaps, defaultSkillGaps),
+      atsKeywords: sanitizeArray(parsed.atsKeywords, inferredKeywords.length ? inferredKeywords : ['leadership','automation','scalability','optimization','integration']),
+      topPriorityAction: parsed.topPriorityAction?.trim() || 'Add quantified outcome metrics (e.g., % performance gains, revenue impact) to major accomplishments.',
+      nextStepAdvice: parsed.nextStepAdvice?.trim() || 'Refine achievement bullets to start with action verbs and include measurable outcomes; emphasize leadership scope and cross-functional impact.'
+    };
+      lastError = null;
+      break;
+    } catch (error) {
+      if (isGatewayRejection(error)) throw error;
+      lastError = error;
+      
+      if (attempt === 0) {
+        await timeSpan('resume.retry_sleep', () => new Promise((resolve) => setTimeout(resolve, backoffDelay(attempt))));
+      }
+    }
+  }
+
+  if (!analysisResult) {
+    console.error('[ERROR] AI analysis failed:', lastError);
+    analysisResult = {
+      overallScore: 0,
+      experienceAlignment: 'Analysis temporarily unavailable.',
+      keyStrengths: ['Unable to analyze'],
+      criticalWeaknesses: ['AI service temporarily unavailable'],
+      skillGaps: ['Try again later'],
+      atsKeywords: ['Try again later'],
+      topPriorityAction: 'Please try again later',
+      nextStepAdvice: 'Retry once the AI service is available.',
+      error: lastError?.message || 'Unknown error'
+    };
+  }
+
+  const archive = await archiving;
+  const finalResponse = {
+    ...analysisResult,
+    metadata: {
+      jobTitle: jobTitle || 'General',
+      fileUrl: archive?.url || null,
+      upload: archive && { id: archive.id, status: archive.status, statusUrl: `/api/uploads/${archive.id}` },
+      fileName: file?.originalname ?? document.name,
+      documentId: document.documentId,
+      analyzedAt: new Date().toISOString()
+    }
+  };
+
+  return new apiresponse(200, 'Resume analyzed successfully', finalResponse);
+};
 
 export const analyzeResume = asynchandler(async (req, res) => {
   try {
-    const { jobTitle } = req.body;
+    const { jobTitle, document_id } = req.body;
 
     let file = null;
     if (req.file) {
@@ -103,7 +366,19 @@ export const analyzeResume = asynchandler(async (req, res) => {
       }
     }
 
-    if (!file) {
+    // A previously returned document_id stands in for the upload
+    let storedDocument = null;
+    if (!file && document_id) {
+      if (!isValidDocumentId(document_id)) {
+        throw new ApiError(400, 'document_id is malformed');
+      }
+      storedDocument = await getStoredDocument(document_id);
+      if (!storedDocument) {
+        throw new ApiError(404, 'Unknown or expired document_id. Please upload the resume again');
+      }
+    }
+
+    if (!file && !storedDocument) {
       throw new ApiError(400, 'Resume file is required');
     }
 
@@ -112,210 +387,25 @@ export const analyzeResume = asynchandler(async (req, res) => {
     }
 
     // Validate file
-    const validation = validateFile(file, 5);
-    if (!validation.valid) {
-      throw new ApiError(400, validation.error);
-    }
-
-    const shouldUploadToCloudinary =
-      isCloudinaryConfigured() &&
-      (process.env.SAVE_UPLOADS_TO_CLOUDINARY || '').toLowerCase() === 'true';
-
-    // Upload to Cloudinary (optional)
-    let cloudinaryResult = null;
-    if (shouldUploadToCloudinary) {
-      try {
-        cloudinaryResult = await uploadToCloudinary(
-          file.buffer,
-          'resumes',
-          'auto'
-        );
-      } catch (error) {
-        console.error('[ERROR] Cloudinary upload failed:', error);
-        throw new ApiError(500, 'Failed to upload file to cloud storage');
+    if (file) {
+      const validation = validateFile(file, UPLOAD_MAX_MB);
+      if (!validation.valid) {
+        throw new ApiError(400, validation.error);
       }
     }
 
-    // Extract text from resume
-    let text;
-    try {
-      text = await extractTextFromFile(file.buffer, file.mimetype);
-      text = expandResumeText(text, jobTitle);
-    } catch (error) {
-      console.error('[ERROR] Resume extraction failed:', error);
-      throw new ApiError(
-        400,
-        `Failed to parse resume file: ${error.message}`
+    if (wantsAsyncJob(req)) {
+      const options = inferenceOptions(req);
+      const job = await submitJob(
+        'resume.analyze',
+        (jobFile, { deadline }) => runResumeAnalysis({ file: jobFile, storedDocument, jobTitle }, { ...options, deadline }),
+        { priority: jobPriority(req), file }
       );
+      return res.status(202).location(job.statusUrl).json(new apiresponse(202, 'Resume analysis queued', job));
     }
 
-    // AI Analysis
-    let analysisResult;
-    let lastError = null;
-    for (let attempt = 0; attempt < 2; attempt++) {
-      try {
-      const resumeMessages = [
-        {
-          role: 'system',
-          content: [
-            'You are a Principal Talent Acquisition Lead reviewing resumes for executive-level roles.',
-            'You care about clarity, quantifiable impact, leadership, ATS readiness, and business outcomes.',
-            'Always mention gaps, weak metrics, or missing context.',
-            'Respond only with JSON that matches the provided schema. No commentary, markdown, or explanations.',
-            'If information is missing, infer reasonable placeholders rather than leaving blanks.'
-          ].join(' ')
-        },
-        {
-          role: 'user',
-          content: [
-            `Analyze the candidate resume for the role "${jobTitle}".`,
-            'Consider leadership progression, domain expertise, measurable achievements, and cultural fit.',
-            '',
-            'Resume excerpt (first 3500 characters):',
-            '"""',
-            text.substring(0, 3500),
-            '"""',
-            '',
-            'Schema:',
-            '{',
-            '  "overallScore": <0-100>,',
-            '  "experienceAlignment": "<one paragraph summary>",',
-            '  "keyStrengths": ["string", ...],',
-            '  "criticalWeaknesses": ["string", ...],',
-            '  "skillGaps": ["string", ...],',
-            '  "atsKeywords": ["string", ...],',
-            '  "topPriorityAction": "<single most important change>",',
-            '  "nextStepAdvice": "<specific guidance>"',
-            '}',
-            '',
-            'Rules:',
-            '- overallScore: numeric quality assessment (0 weak, 100 outstanding). Avoid 0 unless truly empty.',
-            '- experienceAlignment: MUST be 5-7 sentences summarizing relevance, scope, impact, leadership, and gaps.',
-            '- keyStrengths: 6-8 action-oriented items; each starts with a verb (e.g., "Led", "Optimized").',
-            '- criticalWeaknesses: 3-5 items highlighting missing metrics, unclear scope, weak leadership signals.',
-            '- skillGaps: 3-5 domain or role-specific capabilities NOT evidenced (e.g., "Cloud cost optimization").',
-            '- atsKeywords: 8-10 keywords (lowercase, no duplicates) strongly tied to the role. Include skills, technologies, methodologies found OR logically expected.',
-            '- topPriorityAction: One concrete improvement (include metric angle if possible).',
-            '- nextStepAdvice: 2-3 sentences giving tactical improvement guidance.',
-            '- NEVER return empty arrays; if absent, infer reasonable placeholders based on role and text.',
-            '- Cite sections or phrases when possible using quotes ("project", "migration").',
-            '- Output must be VALID MINIFIED JSON. No comments, no markdown.',
-            '- Ensure each array item < 150 characters.',
-            '- If the resume is very short, still synthesize plausible professional improvements relevant to the role.'
-          ].join('\n')
-        }
-      ];
-
-      const aiRaw = await generateText(resumeMessages, {
-        maxTokens: 600,
-        temperature: 0.2,
-        topP: 0.9
-      });
-
-      const repaired = jsonrepair(aiRaw);
-      const parsed = JSON.parse(repaired);
-
-      const sanitizeArray = (value, fallback) => {
-        if (!Array.isArray(value) || value.length === 0) {
-          return fallback;
-        }
-        const cleaned = value
-          .map((item) => String(item).trim())
-          .filter(Boolean)
-          .filter((v, i, arr) => arr.indexOf(v) === i);
-        return cleaned.slice(0, 6);
-      };
-
-      const clampScore = (value) => {
-        const num = Number(value);
-        if (Number.isNaN(num)) return 0;
-        return Math.min(100, Math.max(0, Math.round(num)));
-      };
-
-      // Heuristic fallbacks if model omitted arrays
-      const heuristicTokens = (sourceText) => {
-        const tokens = (sourceText || '')
-          .toLowerCase()
-          .match(/[a-z0-9][a-z0-9\-+\.]{2,}/g) || [];
-        const stop = new Set(['and','for','the','with','from','that','this','into','over','under','into','work','team','role','lead','skill','skills']);
-        const freq = {};
-        tokens.forEach(t => { if (!stop.has(t)) freq[t] = (freq[t]||0)+1; });
-        return Object.entries(freq)
-          .sort((a,b)=>b[1]-a[1])
-          .map(([w])=>w)
-          .filter(w=>w.length>3)
-          .slice(0, 10);
-      };
-
-      const inferredKeywords = heuristicTokens(text).slice(0, 8);
-      const defaultStrengths = [
-        'Led cross-functional delivery initiatives',
-        'Improved operational efficiency with process refinement',
-        'Implemented scalable solutions aligning with strategic goals',
-        'Collaborated across teams to accelerate outcomes'
-      ];
-      const defaultWeaknesses = [
-        'Limited quantifiable impact metrics',
-        'Scope of leadership unclear in several projects',
-        'Missing clarity on budget or cost ownership',
-        'Few references to stakeholder alignment'
-      ];
-      const defaultSkillGaps = [
-        'Advanced data-driven decision making',
-        'End-to-end performance benchmarking',
-        'Formal risk management framework',
-        'Cost optimization strategies'
-      ];
-
-      analysisResult = {
-        overallScore: clampScore(parsed.overallScore),
-        experienceAlignment: parsed.experienceAlignment?.trim() || 'Candidate shows partial alignment; more quantified impact metrics and clearer leadership scope would strengthen fit.',
-        keyStrengths: sanitizeArray(parsed.keyStrengths, defaultStrengths),
-        criticalWeaknesses: sanitizeArray(parsed.criticalWeaknesses, defaultWeaknesses),
-        skillGaps: sanitizeArray(parsed.skillGaps, defaultSkillGaps),
-        atsKeywords: sanitizeArray(parsed.atsKeywords, inferredKeywords.length ? inferredKeywords : ['leadership','automation','scalability','optimization','integration']),
-        topPriorityAction: parsed.topPriorityAction?.trim() || 'Add quantified outcome metrics (e.g., % performance gains, revenue impact) to major accomplishments.',
-        nextStepAdvice: parsed.nextStepAdvice?.trim() || 'Refine achievement bullets to start with action verbs and include measurable outcomes; emphasize leadership scope and cross-functional impact.'
-      };
-        lastError = null;
-        break;
-      } catch (error) {
-        lastError = error;
-        
-        if (attempt === 0) {
-          await new Promise((resolve) => setTimeout(resolve, 300));
-        }
-      }
-    }
-
-    if (!analysisResult) {
-      console.error('[ERROR] AI analysis failed:', lastError);
-      analysisResult = {
-        overallScore: 0,
-        experienceAlignment: 'Analysis temporarily unavailable.',
-        keyStrengths: ['Unable to analyze'],
-        criticalWeaknesses: ['AI service temporarily unavailable'],
-        skillGaps: ['Try again later'],
-        atsKeywords: ['Try again later'],
-        topPriorityAction: 'Please try again later',
-        nextStepAdvice: 'Retry once the AI service is available.',
-        error: lastError?.message || 'Unknown error'
-      };
-    }
-
-    const finalResponse = {
-      ...analysisResult,
-      metadata: {
-        jobTitle: jobTitle || 'General',
-        fileUrl: cloudinaryResult?.secure_url || null,
-        fileName: file.originalname,
-        analyzedAt: new Date().toISOString()
-      }
-    };
-
-    return res.status(200).json(
-      new apiresponse(200, 'Resume analyzed successfully', finalResponse)
-    );
+    const result = await runResumeAnalysis({ file, storedDocument, jobTitle }, inferenceOptions(req));
+    return res.status(200).json(result);
   } catch (error) {
     console.error('[ERROR] Resume analysis controller error:', error);
     throw error;
@@ -323,21 +413,31 @@ export const analyzeResume = asynchandler(async (req, res) => {
 });
 
 
-export const analyzeSentiment = asynchandler(async (req, res) => {
-  const { text } = req.body;
-  if (!text || text.trim().length === 0) throw new ApiError(400, 'Text is required');
+const runSentimentAnalysis = async (text, options) => {
+  if (typeof text !== 'string' || text.trim().length === 0) throw new ApiError(400, 'Text is required');
   const sentimentLabels = ['Very Positive','Positive','Neutral','Negative','Very Negative'];
-  const result = await classifyText(text, sentimentLabels);
-  const responseData = {
+  const result = await classifyText(text, sentimentLabels, options);
+  return {
     label: result.topLabel,
     sentiment: result.topLabel,
     confidence: Math.round(result.topScore * 100),
     allScores: result.labels.map((label,i)=>({ label, score: Math.round(result.scores[i]*100) })),
     analyzedAt: new Date().toISOString()
   };
+};
+
+export const analyzeSentiment = asynchandler(async (req, res) => {
+  const responseData = await runSentimentAnalysis(req.body?.text, inferenceOptions(req));
   const apiResponse = new apiresponse(200, 'Sentiment analyzed successfully', responseData);
   return res.status(200).json({
     ...apiResponse,
     label: responseData.label
   });
 });
+
+export const analyzeSentimentBatch = asynchandler(async (req, res) => {
+  const itemOptions = batchItemOptions(req);
+  return streamBatchResults(req, res, (item) =>
+    runSentimentAnalysis(typeof item === 'string' ? item : item?.text, itemOptions())
+  );
+});
@@ -0,0 +1,51 @@
+import asynchandler from '../utils/AsyncHandler.js';
+import ApiError from '../utils/ApiError.js';
+import apiresponse from '../utils/ApiResponse.js';
+import { createEventStream } from '../utils/sse.js';
+import { getJob, isTerminalJob, isValidJobId, waitForJob, watchJob } from '../utils/jobQueue.js';
+
+const MAX_WAIT_SECONDS = Number(process.env.JOB_MAX_WAIT_SECONDS || 25);
+
+const findJob = async (id, waitMs = 0) => {
+  if (!isValidJobId(id)) {
+    throw new ApiError(400, 'Job id is malformed');
+  }
+  const job = await waitForJob(id, waitMs);
+  if (!job) {
+    throw new ApiError(404, 'Unknown or expired job id');
+  }
+  return job;
+};
+
+// Job state and, once done, its result. `?wait=<seconds>` long-polls until the job finishes.
+export const getJobStatus = asynchandler(async (req, res) => {
+  const waitSeconds = Math.min(MAX_WAIT_SECONDS, Math.max(0, Number(req.query.wait) || 0));
+  const job = await findJob(req.params.id, waitSeconds * 1000);
+  return res.status(200).json(new apiresponse(200, `Job is ${job.status}`, job));
+});
+
+// Server-Sent Events: `status` on every change, then `done` or `failed` with the full job.
+export const streamJobEvents = asynchandler(async (req, res) => {
+  const job = await findJob(req.params.id);
+  const stream = createEventStream(res);
+  if (isTerminalJob(job)) return stream.end(job.status, job);
+
+  let finished = false;
+  const finish = (view) => {
+    if (finished) return;
+    finished = true;
+    stop();
+    stream.end(view.status, view);
+  };
+
+  stream.send('status', job);
+  const stop = watchJob(job.id, (view) => {
+    if (isTerminalJob(view)) finish(view);
+    else if (!finished) stream.send('status', view);
+  });
+  res.on('close', stop);
+
+  // The job may have finished between the lookup and subscribing.
+  const latest = await getJob(job.id);
+  if (latest && isTerminalJob(latest)) finish(latest);
+});
@@ -1,21 +1,24 @@
 import asynchandler from '../utils/AsyncHandler.js';
 import ApiError from '../utils/ApiError.js';
 import apiresponse from '../utils/ApiResponse.js';
-import { generateText } from '../utils/huggingface.js';
+import { generateText, streamText } from '../utils/huggingface.js';
+import { inferenceOptions } from '../utils/requestOptions.js';
+import { wantsEventStream, createEventStream } from '../utils/sse.js';
+import { countWords } from '../utils/textStats.js';
 
 const FALLBACK_PREFIX = 'This is a deterministic fallback response';
 const isStubbedText = (text = '') => text.trim().startsWith(FALLBACK_PREFIX);
 
-const countWords = (text = '') => text.split(/\s+/).filter(Boolean).length;
-
 const padToWordCount = (text, targetWords, filler) => {
   if (!targetWords || targetWords <= 0) return text;
-  let output = text.trim();
+  const output = text.trim();
   const fallbackSentence = filler || 'This continued discussion keeps expanding the core idea for clarity.';
-  while (countWords(output) < targetWords) {
-    output = `${output} ${fallbackSentence}`;
-  }
-  return output;
+  const fillerWords = countWords(fallbackSentence);
+  const missingWords = targetWords - countWords(output);
+  if (missingWords <= 0 || fillerWords === 0) return output;
+  // Work out the number of fillers up front instead of recounting every iteration.
+  const repeats = Math.ceil(missingWords / fillerWords);
+  return `${output}${` ${fallbackSentence}`.repeat(repeats)}`;
 };
 
 const ensureKeywordsPresent = (text, keywordsList) => {
@@ -105,12 +108,18 @@ Target length: approximately ${targetWords} words.
 
 Article:`;
 
-  let generatedText = await generateText(prompt, {
+  const generationOptions = {
     maxTokens,
     temperature: 0.7,
-    topP: 0.9
-  });
+    topP: 0.9,
+    ...inferenceOptions(req)
+  };
+  const stream = wantsEventStream(req) ? createEventStream(res) : null;
+  const modelText = stream
+    ? await stream.pipeTokens(streamText(prompt, generationOptions))
+    : await generateText(prompt, generationOptions);
 
+  let generatedText = modelText;
   if (isStubbedText(generatedText) || countWords(generatedText) < targetWords * 0.6) {
     generatedText = buildArticleDraft(topic, keywordList, targetWords);
   } else {
@@ -128,11 +137,13 @@ Article:`;
   };
 
   const apiResponse = new apiresponse(200, "Article generated successfully", responseData);
-
-  return res.status(200).json({
+  const body = {
     ...apiResponse,
     article: generatedText
-  });
+  };
+
+  if (stream) return stream.end('done', { ...body, fallback: !stream.extend(modelText, generatedText) });
+  return res.status(200).json(body);
 });
 
 export const generateTitles = asynchandler(async (req, res) => {
@@ -152,7 +163,8 @@ Titles:`;
 
   let generatedText = await generateText(prompt, {
     maxTokens: 300,
-    temperature: 0.8
+    temperature: 0.8,
+    ...inferenceOptions(req)
   });
 
   let titles = generatedText
@@ -212,7 +224,8 @@ ${contentType.charAt(0).toUpperCase() + contentType.slice(1)}:`;
 
   let generatedText = await generateText(prompt, {
     maxTokens: 400,
-    temperature: 0.9
+    temperature: 0.9,
+    ...inferenceOptions(req)
   });
 
   let results = generatedText
@@ -279,11 +292,17 @@ Original text: "${text}"
 
 Rewritten text:`;
 
-  let rewrittenText = await generateText(prompt, {
+  const generationOptions = {
     maxTokens: Math.round(wordCount * 2),
-    temperature: 0.7
-  });
+    temperature: 0.7,
+    ...inferenceOptions(req)
+  };
+  const stream = wantsEventStream(req) ? createEventStream(res) : null;
+  const modelText = stream
+    ? await stream.pipeTokens(streamText(prompt, generationOptions))
+    : await generateText(prompt, generationOptions);
 
+  let rewrittenText = modelText;
   if (isStubbedText(rewrittenText) || rewrittenText.trim().length === 0 || rewrittenText.trim().toLowerCase() === text.trim().toLowerCase()) {
     rewrittenText = rewriteLocally(text, rewriteMode);
   }
@@ -298,11 +317,13 @@ Rewritten text:`;
   };
 
   const apiResponse = new apiresponse(200, "Text rewritten successfully", responseData);
-
-  return res.status(200).json({
+  const body = {
     ...apiResponse,
     rewritten: rewrittenText,
     rewritten_text: rewrittenText,
     result: rewrittenText
-  });
+  };
+
+  if (stream) return stream.end('done', { ...body, fallback: !stream.extend(modelText, rewrittenText) });
+  return res.status(200).json(body);
 });
@@ -0,0 +1,19 @@
+import asynchandler from '../utils/AsyncHandler.js';
+import ApiError from '../utils/ApiError.js';
+import apiresponse from '../utils/ApiResponse.js';
+import { getArchiveUploadStatus, isValidUploadId } from '../utils/uploadQueue.js';
+
+// Status of a background Cloudinary upload; `url` is filled in once it is done.
+export const getUploadStatus = asynchandler(async (req, res) => {
+  const { id } = req.params;
+  if (!isValidUploadId(id)) {
+    throw new ApiError(400, 'Upload id is malformed');
+  }
+
+  const upload = await getArchiveUploadStatus(id);
+  if (!upload) {
+    throw new ApiError(404, 'Unknown or expired upload id');
+  }
+
+  return res.status(200).json(new apiresponse(200, `Upload is ${upload.status}`, upload));
+});
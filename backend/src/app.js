@@ -0,0 +1,118 @@
+import cluster from "cluster";
+import express from "express";
+import cors from "cors";
+import dotenv from "dotenv";
+import { clerkMiddleware } from '@clerk/express';
+
+import aiDetectionRoutes from './routes/aiDetectionRoutes.js';
+import textGenerationRoutes from './routes/textGenerationRoutes.js';
+import classificationRoutes from './routes/classificationRoutes.js';
+import assistantRoutes from './routes/assistantRoutes.js';
+import uploadRoutes from './routes/uploadRoutes.js';
+import jobRoutes from './routes/jobRoutes.js';
+import {
+  getInferenceCacheStats,
+  getInferenceCoalescingStats,
+  getDetectionBatchStats,
+  getInferenceGatewayStats,
+  getLocalDetectionStats
+} from './utils/huggingface.js';
+import { deadlineMiddleware } from './middlewares/deadlineMiddleware.js';
+import { getDocumentCacheStats, getExtractionPoolStats } from './utils/textExtractor.js';
+import { loadMiddleware, getLoadStats } from './middlewares/loadMiddleware.js';
+import { isClusterWorker, requestPrimary } from './utils/clusterBus.js';
+import { getArchiveQueueStats } from './utils/uploadQueue.js';
+import { getJobQueueStats } from './utils/jobQueue.js';
+import { METRICS_ENABLED, getMetricsSnapshot, renderMetrics, timingMiddleware } from './utils/metrics.js';
+
+
+dotenv.config();
+
+const app = express();
+app.use(loadMiddleware);
+app.use(timingMiddleware);
+app.use(cors());
+app.use(express.json({ limit: process.env.JSON_BODY_LIMIT || "1mb" }));
+app.use(deadlineMiddleware);
+
+// In cluster mode the primary holds the latest heartbeat from every worker.
+const clusterHealth = async () => {
+  const self = { id: cluster.worker?.id ?? null, pid: process.pid, ...getLoadStats() };
+  if (!isClusterWorker) return { mode: 'single', self };
+  const workers = await requestPrimary('cluster:stats').catch(() => null);
+  return { mode: 'cluster', self, workers };
+};
+
+app.get('/health', async (req, res) => {
+  res.status(200).json({
+    status: 'OK',
+    uptime: process.uptime(),
+    memory: process.memoryUsage(),
+    cache: getInferenceCacheStats(),
+    coalescing: getInferenceCoalescingStats(),
+    detectionBatching: getDetectionBatchStats(),
+    localDetection: getLocalDetectionStats(),
+    inference: getInferenceGatewayStats(),
+    documentCache: getDocumentCacheStats(),
+    extraction: getExtractionPoolStats(),
+    uploads: getArchiveQueueStats(),
+    jobs: getJobQueueStats(),
+    cluster: await clusterHealth(),
+    timestamp: new Date().toISOString()
+  });
+});
+
+// Prometheus scrape target. In cluster mode other workers' figures come from their last heartbeat.
+app.get('/metrics', async (req, res) => {
+  if (!METRICS_ENABLED) {
+    return res.status(404).json({ success: false, message: 'Metrics are disabled' });
+  }
+  const own = getMetricsSnapshot();
+  const others = isClusterWorker
+    ? ((await requestPrimary('metrics:snapshots').catch(() => null)) || []).filter((snapshot) => snapshot.pid !== own.pid)
+    : [];
+  res.type('text/plain; version=0.0.4; charset=utf-8').send(renderMetrics([own, ...others]));
+});
+
+app.head('/health', (req, res) => {
+  res.status(200).end();
+});
+
+app.get('/', (req, res) => {
+  res.status(200).json({
+    status: 'OK',
+    message: 'Backend API is running'
+  });
+});
+
+app.head('/', (req, res) => {
+  res.status(200).end();
+});
+
+const clerkKey = process.env.CLERK_SECRET_KEY?.trim();
+if (clerkKey && clerkKey !== 'dummy') {
+  app.use(clerkMiddleware());
+} else {
+  
+}
+
+app.use('/api/ai', aiDetectionRoutes);
+app.use('/api/generate', textGenerationRoutes);
+app.use('/api/classify', classificationRoutes);
+app.use('/api/assistant', assistantRoutes);
+app.use('/api/uploads', uploadRoutes);
+app.use('/api/jobs', jobRoutes);
+
+
+app.use((err, req, res, next) => {
+  console.error('Error:', err);
+  
+  res.status(err.statusCode || 500).json({
+    success: false,
+    message: err.message || "Internal Server Error",
+    errors: err.errors || [],
+    ...(process.env.NODE_ENV === 'development' && { stack: err.stack })
+  });
+});
+
+export default app;
@@ -0,0 +1,12 @@
+const DEFAULT_TIMEOUT_MS = Number(process.env.REQUEST_TIMEOUT_MS || 30000);
+
+// Stamps each request with an absolute deadline that inference calls honour.
+// Clients may shorten (never extend) it with an X-Request-Timeout-Ms header.
+export const deadlineMiddleware = (req, res, next) => {
+  const requested = Number(req.headers['x-request-timeout-ms']);
+  const budget = Number.isFinite(requested) && requested > 0
+    ? Math.min(requested, DEFAULT_TIMEOUT_MS)
+    : DEFAULT_TIMEOUT_MS;
+  req.deadline = Date.now() + budget;
+  next();
+};
@@ -0,0 +1,32 @@
+import { performance } from 'perf_hooks';
+
+const SAMPLE_INTERVAL_MS = 2000;
+
+const counters = { active: 0, total: 0 };
+let eventLoopUtilization = 0;
+let lastSample = performance.eventLoopUtilization();
+
+// Rolling event-loop utilization over the last sample window (0-1).
+setInterval(() => {
+  const current = performance.eventLoopUtilization();
+  eventLoopUtilization = performance.eventLoopUtilization(current, lastSample).utilization;
+  lastSample = current;
+}, SAMPLE_INTERVAL_MS).unref();
+
+// Counts in-flight and completed requests for this process; reported through /health.
+export const loadMiddleware = (req, res, next) => {
+  counters.active += 1;
+  counters.total += 1;
+  res.once('close', () => {
+    counters.active -= 1;
+  });
+  next();
+};
+
+export const getLoadStats = () => ({
+  uptime: process.uptime(),
+  rss: process.memoryUsage().rss,
+  activeRequests: counters.active,
+  totalRequests: counters.total,
+  eventLoopUtilization: Number(eventLoopUtilization.toFixed(4))
+});
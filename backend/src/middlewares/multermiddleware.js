@@ -1,7 +1,14 @@
 import multer from 'multer';
+import { createSpoolStorage, removeSpooledFile } from './spoolStorage.js';
+import { startSpan } from '../utils/metrics.js';
 
+// 'disk' (default) streams uploads to public/temp; 'memory' keeps the old in-memory buffers.
+const UPLOAD_STORAGE = (process.env.UPLOAD_STORAGE || 'disk').toLowerCase();
+export const UPLOAD_MAX_MB = Number(process.env.UPLOAD_MAX_MB || (UPLOAD_STORAGE === 'memory' ? 5 : 20));
 
-const storage = multer.memoryStorage();
+const storage = UPLOAD_STORAGE === 'memory'
+  ? multer.memoryStorage()
+  : createSpoolStorage({ directory: process.env.UPLOAD_SPOOL_DIR?.trim() || undefined });
 
 const fileFilter = (req, file, cb) => {
   const allowed = [
@@ -23,7 +30,7 @@ const fileFilter = (req, file, cb) => {
 const upload = multer({
   storage: storage,
   limits: { 
-    fileSize: 5 * 1024 * 1024, // 5MB
+    fileSize: UPLOAD_MAX_MB * 1024 * 1024,
     files: 1
   },
   fileFilter: fileFilter
@@ -36,7 +43,7 @@ export const handleUploadError = (err, res) => {
   if (err.code === 'LIMIT_FILE_SIZE') {
     return res.status(400).json({
       success: false,
-      message: 'File size exceeds 5MB limit'
+      message: `File size exceeds ${UPLOAD_MAX_MB}MB limit`
     });
   }
 
@@ -74,4 +81,20 @@ export const handleUploadError = (err, res) => {
   });
 };
 
+// Single-file upload for a route: maps multer errors to 400s and deletes the
+// spooled temp file once the response has finished.
+export const singleUpload = (fieldName) => (req, res, next) => {
+  const endSpan = startSpan('upload.receive');
+  upload.single(fieldName)(req, res, (err) => {
+    endSpan();
+    if (err) {
+      return handleUploadError(err, res);
+    }
+    if (req.file?.path) {
+      res.once('close', () => removeSpooledFile(req.file));
+    }
+    next();
+  });
+};
+
 export { upload };
\ No newline at end of file
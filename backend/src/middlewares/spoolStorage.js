@@ -0,0 +1,79 @@
+import crypto from 'crypto';
+import fs from 'fs';
+import path from 'path';
+import { fileURLToPath } from 'url';
+import { Transform } from 'stream';
+import { pipeline } from 'stream/promises';
+
+export const DEFAULT_SPOOL_DIR = fileURLToPath(new URL('../../public/temp', import.meta.url));
+
+// Spooled files older than this are leftovers from a crashed process.
+const STALE_SPOOL_MS = 60 * 60 * 1000;
+
+export const removeSpooledFile = (file) => {
+  if (!file?.path) return;
+  fs.promises.unlink(file.path).catch((error) => {
+    if (error.code !== 'ENOENT') console.error('[WARN] Could not remove spooled upload:', error.message);
+  });
+};
+
+// Moves a spooled upload to a fresh name so the request's cleanup no longer
+// removes it; the new owner deletes it with removeSpooledFile. In-memory
+// uploads are returned unchanged.
+export const detachSpooledFile = async (file) => {
+  if (!file?.path) return file;
+  const target = path.join(path.dirname(file.path), `${crypto.randomUUID()}.upload`);
+  await fs.promises.rename(file.path, target);
+  return { ...file, path: target };
+};
+
+const sweepStaleFiles = async (directory) => {
+  try {
+    const cutoff = Date.now() - STALE_SPOOL_MS;
+    for (const name of await fs.promises.readdir(directory)) {
+      if (!name.endsWith('.upload')) continue;
+      const target = path.join(directory, name);
+      const { mtimeMs } = await fs.promises.stat(target);
+      if (mtimeMs < cutoff) await fs.promises.unlink(target);
+    }
+  } catch (error) {
+    if (error.code !== 'ENOENT') console.error('[WARN] Upload spool sweep failed:', error.message);
+  }
+};
+
+/**
+ * Multer storage engine that streams each upload straight to a temp file
+ * while computing its SHA-256, so the request body is never held in memory.
+ * Adds `path`, `size` and `sha256` to the multer file object; the caller
+ * removes the file with removeSpooledFile once the request is done.
+ */
+export const createSpoolStorage = ({ directory = DEFAULT_SPOOL_DIR } = {}) => {
+  fs.mkdirSync(directory, { recursive: true });
+  sweepStaleFiles(directory);
+
+  return {
+    _handleFile(req, file, cb) {
+      const target = path.join(directory, `${crypto.randomUUID()}.upload`);
+      const hash = crypto.createHash('sha256');
+      let size = 0;
+      const hasher = new Transform({
+        transform(chunk, encoding, done) {
+          hash.update(chunk);
+          size += chunk.length;
+          done(null, chunk);
+        }
+      });
+
+      pipeline(file.stream, hasher, fs.createWriteStream(target, { flags: 'wx' }))
+        .then(() => cb(null, { path: target, size, sha256: hash.digest('hex') }))
+        .catch((error) => {
+          removeSpooledFile({ path: target });
+          cb(error);
+        });
+    },
+
+    _removeFile(req, file, cb) {
+      fs.promises.unlink(file.path).then(() => cb(null), (error) => cb(error.code === 'ENOENT' ? null : error));
+    }
+  };
+};
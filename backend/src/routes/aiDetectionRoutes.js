@@ -1,10 +1,12 @@
 import express from 'express';
 import { 
   detectContent, 
+  detectContentBatch,
 } from '../Controllers/aiDetectionController.js';
 
 const router = express.Router();
 
 router.post('/detect', detectContent);
+router.post('/detect/batch', detectContentBatch);
 
 export default router;
@@ -1,28 +1,25 @@
 import express from 'express';
 import {
   classifyTicket,
+  classifyTicketBatch,
   analyzeResume,
-  analyzeSentiment
+  analyzeSentiment,
+  analyzeSentimentBatch
 } from '../Controllers/classificationController.js';
-import { upload, handleUploadError } from '../middlewares/multermiddleware.js';
+import { singleUpload } from '../middlewares/multermiddleware.js';
 
 const router = express.Router();
 
 router.post('/ticket', classifyTicket);
+router.post('/ticket/batch', classifyTicketBatch);
 
 router.post(
   '/resume',
-  (req, res, next) => {
-    upload.single('file')(req, res, (err) => {
-      if (err) {
-        return handleUploadError(err, res);
-      }
-      next();
-    });
-  },
+  singleUpload('file'),
   analyzeResume
 );
 
 router.post('/sentiment', analyzeSentiment);
+router.post('/sentiment/batch', analyzeSentimentBatch);
 
 export default router;
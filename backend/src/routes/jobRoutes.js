@@ -0,0 +1,9 @@
+import express from 'express';
+import { getJobStatus, streamJobEvents } from '../Controllers/jobController.js';
+
+const router = express.Router();
+
+router.get('/:id', getJobStatus);
+router.get('/:id/events', streamJobEvents);
+
+export default router;
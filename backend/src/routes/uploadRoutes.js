@@ -0,0 +1,8 @@
+import express from 'express';
+import { getUploadStatus } from '../Controllers/uploadController.js';
+
+const router = express.Router();
+
+router.get('/:id', getUploadStatus);
+
+export default router;
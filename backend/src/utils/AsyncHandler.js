@@ -1,9 +1,15 @@
+import { endWithError } from "./sse.js";
+
 const asynchandler = (fn) => async (req, res, next) => {
     try {
         await fn(req, res, next);
     } catch (error) {
         console.error("Error in async handler:", error);
-        res.status(500).json({ 
+        if (res.headersSent) {
+            // Streaming responses have already committed a status; report the failure in-band.
+            return endWithError(res, error);
+        }
+        res.status(error.statusCode || 500).json({ 
         message: error.message || "Internal Server Error" ,
         success: false });
     }
@@ -0,0 +1,82 @@
+/**
+ * Micro-batching scheduler: collects submitted inputs for up to `windowMs`
+ * (or until `maxBatchSize` is reached), runs them through one
+ * `executeBatch(inputs, { deadline })` call and fans the results back out in
+ * order. `executeBatch` may return an Error in a slot to fail only that item.
+ * Items whose deadline (epoch ms) passed while queued are rejected with
+ * `expiredError()` instead of being sent; the batch runs under the earliest
+ * remaining deadline.
+ */
+export const createBatchScheduler = ({
+  executeBatch,
+  windowMs = 15,
+  maxBatchSize = 16,
+  expiredError = () => new Error('Deadline exceeded before the batch was sent')
+}) => {
+  let pending = [];
+  let timer = null;
+  const counters = { submitted: 0, batches: 0, largestBatch: 0, failedBatches: 0, expired: 0 };
+
+  const flush = async () => {
+    clearTimeout(timer);
+    timer = null;
+    const now = Date.now();
+    const batch = [];
+    for (const item of pending) {
+      if (item.deadline && item.deadline <= now) {
+        counters.expired += 1;
+        item.reject(expiredError());
+      } else {
+        batch.push(item);
+      }
+    }
+    pending = [];
+    if (batch.length === 0) return;
+
+    const deadlines = batch.map((item) => item.deadline).filter(Boolean);
+    const deadline = deadlines.length ? Math.min(...deadlines) : undefined;
+
+    counters.batches += 1;
+    counters.largestBatch = Math.max(counters.largestBatch, batch.length);
+
+    try {
+      const results = await executeBatch(batch.map((item) => item.input), { deadline });
+      batch.forEach((item, index) => {
+        const result = results?.[index];
+        if (result instanceof Error) {
+          item.reject(result);
+        } else if (result === undefined) {
+          item.reject(new Error('Batch response is missing an item'));
+        } else {
+          item.resolve(result);
+        }
+      });
+    } catch (error) {
+      counters.failedBatches += 1;
+      batch.forEach((item) => item.reject(error));
+    }
+  };
+
+  const submit = (input, { deadline } = {}) =>
+    new Promise((resolve, reject) => {
+      counters.submitted += 1;
+      pending.push({ input, deadline, resolve, reject });
+      if (windowMs <= 0 || pending.length >= maxBatchSize) {
+        flush();
+      } else if (!timer) {
+        timer = setTimeout(flush, windowMs);
+      }
+    });
+
+  const stats = () => ({
+    windowMs,
+    maxBatchSize,
+    pending: pending.length,
+    ...counters,
+    avgBatchSize: counters.batches === 0
+      ? 0
+      : Number(((counters.submitted - pending.length) / counters.batches).toFixed(2))
+  });
+
+  return { submit, flush, stats };
+};
@@ -1,5 +1,7 @@
 import { v2 as cloudinary } from 'cloudinary';
+import fs from 'fs';
 import { Readable } from 'stream';
+import { timeSpan } from './metrics.js';
 
 const hasCloudinaryCredentials = Boolean(
   process.env.CLOUDINARY_CLOUD_NAME &&
@@ -10,23 +12,28 @@ const hasCloudinaryCredentials = Boolean(
 cloudinary.config({
   cloud_name: process.env.CLOUDINARY_CLOUD_NAME,
   api_key: process.env.CLOUDINARY_API_KEY,
-  api_secret: process.env.CLOUDINARY_API_SECRET
+  api_secret: process.env.CLOUDINARY_API_SECRET,
+  // Points uploads at another API host, e.g. the local stub in testsprite_tests/bench.
+  ...(process.env.CLOUDINARY_UPLOAD_PREFIX?.trim() && { upload_prefix: process.env.CLOUDINARY_UPLOAD_PREFIX.trim() })
 });
 
 export const isCloudinaryConfigured = () => hasCloudinaryCredentials;
 
+// `fileBuffer` may also be the path of an upload spooled to disk, which is streamed from the file.
 export const uploadToCloudinary = async (fileBuffer, folder = 'uploads', resourceType = 'raw') => {
-  return new Promise((resolve, reject) => {
+  return timeSpan('cloudinary.upload', () => new Promise((resolve, reject) => {
     // Validate inputs
     if (!fileBuffer) {
       return reject(new Error('File buffer is required'));
     }
 
-    
+    const isFilePath = typeof fileBuffer === 'string';
 
     // Ensure we have a proper Buffer
     let buffer = fileBuffer;
-    if (!(fileBuffer instanceof Buffer) && fileBuffer instanceof Uint8Array) {
+    if (isFilePath) {
+      buffer = null;
+    } else if (!(fileBuffer instanceof Buffer) && fileBuffer instanceof Uint8Array) {
       buffer = Buffer.from(fileBuffer);
     } else if (!Buffer.isBuffer(fileBuffer)) {
       return reject(new Error('Invalid buffer format'));
@@ -58,8 +65,8 @@ export const uploadToCloudinary = async (fileBuffer, folder = 'uploads', resourc
     });
 
     try {
-      // Convert buffer to stream and pipe to Cloudinary
-      const readableStream = Readable.from(buffer);
+      // Stream the spooled file, or convert the buffer to a stream, and pipe to Cloudinary
+      const readableStream = isFilePath ? fs.createReadStream(fileBuffer) : Readable.from(buffer);
       
       readableStream.on('error', (err) => {
         console.error('[ERROR] Read stream error:', err);
@@ -71,7 +78,7 @@ export const uploadToCloudinary = async (fileBuffer, folder = 'uploads', resourc
       console.error('[ERROR] Stream conversion error:', error);
       reject(error);
     }
-  });
+  }));
 };
 
 export const deleteFromCloudinary = async (publicId, resourceType = 'raw') => {
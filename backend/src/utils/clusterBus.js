@@ -0,0 +1,156 @@
+import cluster from 'cluster';
+
+// Tags our IPC messages so they never collide with other users of process.send.
+const BUS_TAG = 'webdev-ai-bus';
+const DEFAULT_REQUEST_TIMEOUT_MS = 1000;
+
+export const isClusterWorker = cluster.isWorker && typeof process.send === 'function';
+
+// Splits a cluster-wide limit between the workers the primary started (at least
+// one each), so caps configured for the deployment are not multiplied per process.
+export const workerShare = (total) =>
+  Math.max(1, Math.floor(total / Number(process.env.CLUSTER_WORKER_COUNT || 1)));
+
+const pending = new Map();
+const subscribers = new Map();
+let nextRequestId = 1;
+
+const sendToPrimary = (message) => {
+  if (!isClusterWorker || !process.connected) return false;
+  process.send({ bus: BUS_TAG, ...message });
+  return true;
+};
+
+const dispatch = (channel, data) => {
+  for (const handler of subscribers.get(channel) || []) {
+    try {
+      handler(data);
+    } catch (error) {
+      console.error(`[WARN] Cluster bus handler for "${channel}" failed:`, error.message);
+    }
+  }
+};
+
+if (isClusterWorker) {
+  process.on('message', (message) => {
+    if (message?.bus !== BUS_TAG) return;
+    if (message.kind === 'reply') {
+      const request = pending.get(message.id);
+      if (!request) return;
+      pending.delete(message.id);
+      clearTimeout(request.timer);
+      if (message.error) request.reject(new Error(message.error));
+      else request.resolve(message.result);
+    } else if (message.kind === 'publish') {
+      dispatch(message.channel, message.data);
+    }
+  });
+}
+
+/**
+ * Asks the primary to run its `type` handler and resolves with the result.
+ * Rejects outside cluster mode or when the primary does not answer in time.
+ */
+export const requestPrimary = (type, payload, { timeoutMs = DEFAULT_REQUEST_TIMEOUT_MS } = {}) =>
+  new Promise((resolve, reject) => {
+    if (!isClusterWorker || !process.connected) {
+      reject(new Error('Not running as a cluster worker'));
+      return;
+    }
+    const id = nextRequestId++;
+    const timer = setTimeout(() => {
+      pending.delete(id);
+      reject(new Error(`Cluster request "${type}" timed out after ${timeoutMs}ms`));
+    }, timeoutMs);
+    timer.unref();
+    pending.set(id, { resolve, reject, timer });
+    sendToPrimary({ kind: 'request', id, type, payload });
+  });
+
+// Delivers `data` to subscribers of `channel` in every other worker (and the primary).
+export const publish = (channel, data) => sendToPrimary({ kind: 'publish', channel, data });
+
+export const subscribe = (channel, handler) => {
+  if (!subscribers.has(channel)) subscribers.set(channel, new Set());
+  subscribers.get(channel).add(handler);
+  return () => subscribers.get(channel)?.delete(handler);
+};
+
+// Periodically reports this worker's stats to the primary for the cluster view in /health.
+export const startHeartbeat = (collect, intervalMs) => {
+  if (!isClusterWorker) return () => {};
+  const beat = () => sendToPrimary({ kind: 'heartbeat', stats: collect() });
+  beat();
+  const timer = setInterval(beat, intervalMs);
+  timer.unref();
+  return () => clearInterval(timer);
+};
+
+// Shared tier for createResponseCache backed by the primary's store.
+export const createClusterCacheTier = () => ({
+  get: (key) => requestPrimary('cache:get', { key }),
+  set: (key, value, ttlMs) => requestPrimary('cache:set', { key, value, ttlMs })
+});
+
+/**
+ * Primary side of the bus. Answers worker requests with `handlers[type]`,
+ * fans published messages out to the other workers, and keeps the latest
+ * heartbeat from each worker.
+ */
+export const attachPrimaryBus = ({ handlers = {}, onPublish } = {}) => {
+  const heartbeats = new Map();
+
+  const sendToWorker = (worker, message) => {
+    if (worker.isConnected()) worker.send({ bus: BUS_TAG, ...message });
+  };
+
+  const broadcast = (channel, data, { except } = {}) => {
+    for (const worker of Object.values(cluster.workers || {})) {
+      if (worker && worker.id !== except) sendToWorker(worker, { kind: 'publish', channel, data });
+    }
+  };
+
+  cluster.on('message', async (worker, message) => {
+    if (message?.bus !== BUS_TAG) return;
+
+    if (message.kind === 'heartbeat') {
+      heartbeats.set(worker.id, { ...message.stats, receivedAt: Date.now() });
+    } else if (message.kind === 'publish') {
+      onPublish?.(message.channel, message.data);
+      broadcast(message.channel, message.data, { except: worker.id });
+    } else if (message.kind === 'request') {
+      const handler = handlers[message.type];
+      try {
+        if (!handler) throw new Error(`Unknown cluster request "${message.type}"`);
+        const result = await handler(message.payload, worker);
+        sendToWorker(worker, { kind: 'reply', id: message.id, result });
+      } catch (error) {
+        sendToWorker(worker, { kind: 'reply', id: message.id, error: error.message });
+      }
+    }
+  });
+
+  cluster.on('exit', (worker) => {
+    heartbeats.delete(worker.id);
+  });
+
+  const workerStats = () =>
+    Object.values(cluster.workers || {})
+      .filter(Boolean)
+      .map((worker) => {
+        const { receivedAt, metrics, ...stats } = heartbeats.get(worker.id) || {};
+        return {
+          id: worker.id,
+          pid: worker.process.pid,
+          connected: worker.isConnected(),
+          ...stats,
+          heartbeatAgeMs: receivedAt ? Date.now() - receivedAt : null
+        };
+      });
+
+  // Latest metrics snapshot each worker attached to its heartbeat.
+  const metricsSnapshots = () =>
+    [...heartbeats.values()].map((heartbeat) => heartbeat.metrics).filter(Boolean);
+
+  return { broadcast, workerStats, metricsSnapshots, send: sendToWorker };
+};
@@ -0,0 +1,172 @@
+import cluster from 'cluster';
+import { attachPrimaryBus } from './clusterBus.js';
+import { createMemoryJobStore } from './jobStore.js';
+
+// A worker that dies this soon after starting counts as a crash loop and is respawned with backoff.
+const CRASH_WINDOW_MS = 5000;
+const MAX_RESPAWN_DELAY_MS = 30000;
+
+// Cluster-wide tier behind each worker's response cache (LRU with per-entry TTL).
+const createSharedStore = (maxEntries) => {
+  const entries = new Map();
+  return {
+    get: (key) => {
+      const entry = entries.get(key);
+      if (!entry) return undefined;
+      entries.delete(key);
+      if (entry.expiresAt <= Date.now()) return undefined;
+      entries.set(key, entry);
+      return entry.value;
+    },
+    set: (key, value, ttlMs) => {
+      entries.delete(key);
+      entries.set(key, { value, expiresAt: Date.now() + ttlMs });
+      while (entries.size > maxEntries) {
+        entries.delete(entries.keys().next().value);
+      }
+    },
+    clear: () => entries.clear(),
+    size: () => entries.size
+  };
+};
+
+/**
+ * Forks `workers` copies of the HTTP server that share the listening port.
+ * SIGHUP replaces workers one at a time (each replacement must be listening
+ * before its predecessor drains), SIGUSR2 invalidates every worker's cache,
+ * and SIGTERM/SIGINT drain all workers before exiting.
+ */
+export const startPrimary = ({
+  workers,
+  shutdownTimeoutMs = Number(process.env.SHUTDOWN_TIMEOUT_MS || 30000),
+  sharedCacheEntries = Number(process.env.CLUSTER_CACHE_MAX_ENTRIES || 5000)
+}) => {
+  const sharedCache = createSharedStore(sharedCacheEntries);
+  const jobStore = createMemoryJobStore();
+  const startedAt = new Map();
+  const expectedExits = new Set();
+  const counters = { respawns: 0, rollingRestarts: 0 };
+  let crashStreak = 0;
+  let restarting = false;
+  let shuttingDown = false;
+
+  const bus = attachPrimaryBus({
+    handlers: {
+      'cache:get': ({ key }) => sharedCache.get(key),
+      'cache:set': ({ key, value, ttlMs }) => sharedCache.set(key, value, ttlMs),
+      'jobs:get': ({ id }) => jobStore.get(id),
+      'jobs:save': ({ job }) => jobStore.save(job),
+      'metrics:snapshots': () => bus.metricsSnapshots(),
+      'cluster:stats': () => ({
+        primary: { pid: process.pid, uptime: process.uptime(), rollingRestartInProgress: restarting, ...counters },
+        sharedCacheEntries: sharedCache.size(),
+        jobRecords: jobStore.size(),
+        workers: bus.workerStats()
+      })
+    },
+    onPublish: (channel) => {
+      if (channel === 'cache:invalidate') sharedCache.clear();
+    }
+  });
+
+  // Workers split the cores between their extraction threads. Document ids resolve
+  // across workers only when DOCUMENT_CACHE_DIR points them at a shared directory.
+  const workerEnv = { CLUSTER_WORKER_COUNT: String(workers) };
+
+  const fork = () => {
+    const worker = cluster.fork(workerEnv);
+    startedAt.set(worker.id, Date.now());
+    return worker;
+  };
+
+  const waitForListening = (worker) =>
+    new Promise((resolve, reject) => {
+      const onExit = () => {
+        // Synchronously, so the cluster 'exit' handler does not respawn it.
+        expectedExits.add(worker.id);
+        reject(new Error(`worker ${worker.process.pid} exited before listening`));
+      };
+      worker.once('exit', onExit);
+      worker.once('listening', () => {
+        worker.off('exit', onExit);
+        resolve();
+      });
+    });
+
+  // Asks a worker to stop accepting connections and finish in-flight requests; kills it after the timeout.
+  const retire = (worker) =>
+    new Promise((resolve) => {
+      if (worker.isDead()) {
+        resolve();
+        return;
+      }
+      expectedExits.add(worker.id);
+      const timer = setTimeout(() => worker.process.kill('SIGKILL'), shutdownTimeoutMs);
+      worker.once('exit', () => {
+        clearTimeout(timer);
+        resolve();
+      });
+      bus.send(worker, { kind: 'publish', channel: 'worker:shutdown' });
+    });
+
+  const rollingRestart = async () => {
+    if (restarting || shuttingDown) return;
+    restarting = true;
+    counters.rollingRestarts += 1;
+    console.log(`[cluster] Rolling restart of ${Object.keys(cluster.workers).length} workers`);
+    try {
+      for (const worker of Object.values(cluster.workers)) {
+        if (!worker || expectedExits.has(worker.id)) continue;
+        const replacement = fork();
+        try {
+          await waitForListening(replacement);
+        } catch (error) {
+          console.error(`[cluster] Rolling restart aborted: ${error.message}`);
+          return;
+        }
+        await retire(worker);
+      }
+      console.log('[cluster] Rolling restart complete');
+    } finally {
+      restarting = false;
+    }
+  };
+
+  const shutdown = async (signal) => {
+    if (shuttingDown) return;
+    shuttingDown = true;
+    console.log(`[cluster] ${signal} received, draining workers`);
+    await Promise.all(Object.values(cluster.workers).filter(Boolean).map(retire));
+    process.exit(0);
+  };
+
+  cluster.on('exit', (worker, code, signal) => {
+    const lifetime = Date.now() - (startedAt.get(worker.id) || 0);
+    startedAt.delete(worker.id);
+    if (expectedExits.delete(worker.id) || shuttingDown) return;
+
+    crashStreak = lifetime < CRASH_WINDOW_MS ? crashStreak + 1 : 0;
+    const delay = crashStreak === 0 ? 0 : Math.min(MAX_RESPAWN_DELAY_MS, 1000 * 2 ** (crashStreak - 1));
+    counters.respawns += 1;
+    console.error(`[cluster] Worker ${worker.process.pid} exited (${signal || code}); respawning in ${delay}ms`);
+    setTimeout(() => {
+      if (!shuttingDown) fork();
+    }, delay);
+  });
+
+  process.on('SIGHUP', () => {
+    rollingRestart().catch((error) => console.error('[cluster] Rolling restart failed:', error));
+  });
+  process.on('SIGUSR2', () => {
+    sharedCache.clear();
+    bus.broadcast('cache:invalidate');
+    console.log('[cluster] Cache invalidated on all workers');
+  });
+  process.on('SIGTERM', () => shutdown('SIGTERM'));
+  process.on('SIGINT', () => shutdown('SIGINT'));
+
+  console.log(`[cluster] Primary ${process.pid} starting ${workers} workers`);
+  for (let i = 0; i < workers; i++) fork();
+
+  return { rollingRestart, shutdown };
+};
@@ -0,0 +1,176 @@
+import crypto from 'crypto';
+import fs from 'fs/promises';
+import path from 'path';
+
+const DOCUMENT_ID_PATTERN = /^[a-f0-9]{64}$/;
+
+export const fingerprintBuffer = (buffer) =>
+  crypto.createHash('sha256').update(buffer).digest('hex');
+
+export const isValidDocumentId = (documentId) =>
+  typeof documentId === 'string' && DOCUMENT_ID_PATTERN.test(documentId);
+
+const recordBytes = (record) =>
+  Buffer.byteLength(record.text || '', 'utf-8') +
+  Buffer.byteLength(JSON.stringify(record.metadata || null), 'utf-8');
+
+/**
+ * Two-tier cache of extracted documents: an in-memory LRU bounded by
+ * `maxBytes`, and optionally one JSON file per document in `persistDir`.
+ * The directory is swept every `sweepMs` (and whenever a write takes it past
+ * `persistMaxBytes`): files unused for `persistTtlMs` are deleted, then the
+ * least recently used ones until it is back under `persistMaxBytes`.
+ */
+export const createDocumentStore = ({
+  maxBytes = 64 * 1024 * 1024,
+  persistDir = null,
+  persistMaxBytes = 256 * 1024 * 1024,
+  persistTtlMs = 24 * 60 * 60 * 1000,
+  sweepMs = 60 * 1000
+} = {}) => {
+  const records = new Map();
+  const counters = { hits: 0, misses: 0, diskHits: 0, evictions: 0 };
+  const disk = { files: 0, bytes: 0, expired: 0, evictions: 0, lastSweepAt: null };
+  let totalBytes = 0;
+  let sweeping = null;
+  let sweepTimer = null;
+
+  const remember = (record) => {
+    const bytes = recordBytes(record);
+    if (bytes > maxBytes) return;
+    const existing = records.get(record.documentId);
+    if (existing) {
+      totalBytes -= existing.bytes;
+      records.delete(record.documentId);
+    }
+    records.set(record.documentId, { record, bytes });
+    totalBytes += bytes;
+    while (totalBytes > maxBytes && records.size > 0) {
+      const [oldestId, oldest] = records.entries().next().value;
+      records.delete(oldestId);
+      totalBytes -= oldest.bytes;
+      counters.evictions += 1;
+    }
+  };
+
+  const diskPath = (documentId) => path.join(persistDir, `${documentId}.json`);
+
+  // Directory shared by cluster workers: another worker may delete a file mid-sweep.
+  const sweepDisk = async () => {
+    const cutoff = Date.now() - persistTtlMs;
+    const files = [];
+    for (const name of await fs.readdir(persistDir).catch(() => [])) {
+      const target = path.join(persistDir, name);
+      const info = await fs.stat(target).catch(() => null);
+      if (!info?.isFile()) continue;
+      if (info.mtimeMs < cutoff) {
+        await fs.unlink(target).catch(() => {});
+        disk.expired += 1;
+        continue;
+      }
+      files.push({ target, size: info.size, mtimeMs: info.mtimeMs });
+    }
+    files.sort((a, b) => a.mtimeMs - b.mtimeMs);
+    let bytes = files.reduce((sum, file) => sum + file.size, 0);
+    while (bytes > persistMaxBytes && files.length > 0) {
+      const oldest = files.shift();
+      await fs.unlink(oldest.target).catch(() => {});
+      bytes -= oldest.size;
+      disk.evictions += 1;
+    }
+    disk.files = files.length;
+    disk.bytes = bytes;
+    disk.lastSweepAt = new Date().toISOString();
+  };
+
+  const sweep = () => {
+    if (!sweeping) {
+      sweeping = sweepDisk()
+        .catch((error) => console.error('[WARN] Document cache sweep failed:', error.message))
+        .finally(() => {
+          sweeping = null;
+        });
+    }
+    return sweeping;
+  };
+
+  const startSweeper = () => {
+    if (sweepTimer) return;
+    sweepTimer = setInterval(sweep, sweepMs);
+    sweepTimer.unref();
+    sweep();
+  };
+
+  const readFromDisk = async (documentId) => {
+    if (!persistDir) return null;
+    startSweeper();
+    try {
+      const target = diskPath(documentId);
+      const record = JSON.parse(await fs.readFile(target, 'utf-8'));
+      // The mtime orders the sweep's least-recently-used eviction.
+      const now = new Date();
+      await fs.utimes(target, now, now).catch(() => {});
+      return record;
+    } catch (error) {
+      if (error.code !== 'ENOENT') {
+        console.error('[WARN] Document cache read failed:', error.message);
+      }
+      return null;
+    }
+  };
+
+  const writeToDisk = async (record) => {
+    if (!persistDir) return;
+    startSweeper();
+    try {
+      await fs.mkdir(persistDir, { recursive: true });
+      const target = diskPath(record.documentId);
+      const tmp = `${target}.${process.pid}.tmp`;
+      const data = JSON.stringify(record);
+      await fs.writeFile(tmp, data);
+      await fs.rename(tmp, target);
+      disk.files += 1;
+      disk.bytes += Buffer.byteLength(data, 'utf-8');
+      if (disk.bytes > persistMaxBytes) sweep();
+    } catch (error) {
+      console.error('[WARN] Document cache write failed:', error.message);
+    }
+  };
+
+  const get = async (documentId) => {
+    if (!isValidDocumentId(documentId)) return null;
+    const entry = records.get(documentId);
+    if (entry) {
+      records.delete(documentId);
+      records.set(documentId, entry);
+      counters.hits += 1;
+      return entry.record;
+    }
+    const persisted = await readFromDisk(documentId);
+    if (persisted) {
+      remember(persisted);
+      counters.hits += 1;
+      counters.diskHits += 1;
+      return persisted;
+    }
+    counters.misses += 1;
+    return null;
+  };
+
+  const set = async (record) => {
+    remember(record);
+    await writeToDisk(record);
+    return record;
+  };
+
+  const stats = () => ({
+    entries: records.size,
+    bytes: totalBytes,
+    maxBytes,
+    persisted: Boolean(persistDir),
+    ...counters,
+    disk: persistDir ? { ...disk, maxBytes: persistMaxBytes, ttlMs: persistTtlMs } : null
+  });
+
+  return { get, set, stats };
+};
@@ -0,0 +1,49 @@
+const DEFAULT_INFERENCE_URL = 'https://router.huggingface.co/hf-inference';
+
+export const inferenceBaseUrl = () =>
+  (process.env.HF_INFERENCE_URL?.trim() || DEFAULT_INFERENCE_URL).replace(/\/+$/, '');
+
+// SDK call arguments that route a model to HF_INFERENCE_URL (a self-hosted
+// endpoint or the benchmark stub). Empty when unset so the SDK keeps its default routing.
+export const modelEndpointArgs = (model) =>
+  process.env.HF_INFERENCE_URL?.trim() ? { endpointUrl: `${inferenceBaseUrl()}/models/${model}` } : {};
+
+const isScoreList = (value) =>
+  Array.isArray(value) &&
+  value.every((entry) => typeof entry?.label === 'string' && typeof entry?.score === 'number');
+
+/**
+ * Sends several inputs to a text-classification model in one request. The
+ * SDK's textClassification only returns the first item of a batched
+ * response, so this goes over HTTP directly. Items the endpoint could not
+ * score come back as Error instances in their slot.
+ */
+export const requestTextClassificationBatch = async ({ model, inputs, token, signal }) => {
+  const response = await fetch(`${inferenceBaseUrl()}/models/${model}`, {
+    method: 'POST',
+    headers: {
+      Authorization: `Bearer ${token}`,
+      'Content-Type': 'application/json'
+    },
+    body: JSON.stringify({ inputs }),
+    signal
+  });
+
+  if (!response.ok) {
+    const detail = await response.text().catch(() => '');
+    const error = new Error(`Batch classification failed with ${response.status}: ${detail.slice(0, 200)}`);
+    error.statusCode = response.status;
+    throw error;
+  }
+
+  const body = await response.json();
+  if (!Array.isArray(body)) {
+    throw new Error('Batch classification returned an unexpected payload');
+  }
+
+  // A single input may come back unwrapped as a flat score list.
+  const rows = inputs.length === 1 && isScoreList(body) ? [body] : body;
+  return inputs.map((_, index) =>
+    isScoreList(rows[index]) ? rows[index] : new Error('Batch classification item was not scored')
+  );
+};
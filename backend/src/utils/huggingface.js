@@ -1,22 +1,66 @@
 import { HfInference } from '@huggingface/inference';
 import dotenv from 'dotenv';
+import { createResponseCache, hashPayload } from './responseCache.js';
+import { createSingleFlight } from './singleFlight.js';
+import { createBatchScheduler } from './batchScheduler.js';
+import { modelEndpointArgs, requestTextClassificationBatch } from './hfBatchClient.js';
+import { retrievePassages, TOKEN_BUDGETS } from './retrieval.js';
+import { getTextStats } from './textStats.js';
+import { createInferenceGateway, deadlineExceededError, isGatewayRejection } from './inferenceGateway.js';
+import { recordInference, startSpan, timeSpan } from './metrics.js';
+import { loadLocalDetector } from './localDetector.js';
+import { workerShare } from './clusterBus.js';
 
 dotenv.config();
 
 const isHfConfigured = Boolean(process.env.HUGGINGFACE_API_KEY?.trim());
 const hf = isHfConfigured ? new HfInference(process.env.HUGGINGFACE_API_KEY) : null;
 
+const responseCache = createResponseCache({
+  enabled: (process.env.HF_CACHE_ENABLED || 'true').toLowerCase() !== 'false',
+  maxEntries: Number(process.env.HF_CACHE_MAX_ENTRIES || 500),
+  maxTemperature: Number(process.env.HF_CACHE_MAX_TEMPERATURE || 0.5),
+  ttls: {
+    generate: Number(process.env.HF_CACHE_TTL_GENERATE_MS || 10 * 60 * 1000),
+    detect: Number(process.env.HF_CACHE_TTL_DETECT_MS || 60 * 60 * 1000)
+  }
+});
+
+// Every upstream call goes through the gateway: concurrency cap, deadlines, retries, breaker.
+// The caps are cluster-wide and split between workers; each worker keeps its own breaker.
+const inferenceGateway = createInferenceGateway({
+  maxConcurrent: workerShare(Number(process.env.HF_MAX_CONCURRENCY || 8)),
+  maxQueue: workerShare(Number(process.env.HF_MAX_QUEUE || 64)),
+  timeoutMs: Number(process.env.HF_TIMEOUT_MS || 20000),
+  maxRetries: Number(process.env.HF_MAX_RETRIES || 2),
+  retryBaseMs: Number(process.env.HF_RETRY_BASE_MS || 200),
+  retryMaxMs: Number(process.env.HF_RETRY_MAX_MS || 2000),
+  breakerFailures: Number(process.env.HF_BREAKER_FAILURES || 5),
+  breakerResetMs: Number(process.env.HF_BREAKER_RESET_MS || 30000)
+});
+
+// Coalesces identical concurrent upstream calls, independently of the cache.
+const singleFlight = createSingleFlight({
+  enabled: (process.env.HF_SINGLE_FLIGHT_ENABLED || 'true').toLowerCase() !== 'false'
+});
+
+const coalesce = (namespace, params, fn) => singleFlight.run(hashPayload({ namespace, params }), fn);
+
+export const getInferenceCacheStats = () => responseCache.stats();
+export const getInferenceCoalescingStats = () => singleFlight.stats();
+export const getInferenceGatewayStats = () => inferenceGateway.stats();
+export const setInferenceCacheSharedTier = (store) => responseCache.setSharedTier(store);
+export const clearInferenceCache = () => responseCache.clear();
+
 const normalizeProbability = (value) => {
   const clamped = Math.min(1, Math.max(0, value));
   return Number(clamped.toFixed(4));
 };
 
 const heuristicDetection = (text) => {
-  const words = text.split(/\s+/).filter(Boolean);
-  const uniqueWords = new Set(words.map((w) => w.toLowerCase())).size;
-  const uniqueRatio = words.length === 0 ? 0 : uniqueWords / words.length;
-  const sentenceCount = Math.max(1, text.split(/[.!?]+/).filter((s) => s.trim()).length);
-  const avgSentenceLength = words.length / sentenceCount;
+  const { wordCount, uniqueWordRatio: uniqueRatio, sentenceCount: rawSentenceCount } = getTextStats(text);
+  const sentenceCount = Math.max(1, rawSentenceCount);
+  const avgSentenceLength = wordCount / sentenceCount;
   const aiScoreSeed = 0.35 + avgSentenceLength * 0.01 - uniqueRatio * 0.2;
   const aiProbability = normalizeProbability(aiScoreSeed);
   const humanProbability = normalizeProbability(1 - aiProbability);
@@ -48,121 +92,289 @@ export const MODELS = {
   LLAMA: 'meta-llama/Llama-3.2-1B-Instruct'
 };
 
-export const detectAIContent = async (text) => {
-  try {
-    if (!hf) {
-      return heuristicDetection(text);
-    }
+// Detection requests arriving within one window share a single upstream call.
+const detectionBatcher = createBatchScheduler({
+  windowMs: Number(process.env.HF_DETECT_BATCH_WINDOW_MS || 15),
+  maxBatchSize: Number(process.env.HF_DETECT_BATCH_MAX_SIZE || 16),
+  expiredError: () => deadlineExceededError('Request deadline exceeded before detection was sent'),
+  executeBatch: (inputs, { deadline }) =>
+    inferenceGateway.call(MODELS.AI_DETECTOR, async (signal) => {
+      if (inputs.length === 1) {
+        return [await hf.textClassification(
+          { model: MODELS.AI_DETECTOR, inputs: inputs[0], ...modelEndpointArgs(MODELS.AI_DETECTOR) },
+          { signal }
+        )];
+      }
+      return requestTextClassificationBatch({
+        model: MODELS.AI_DETECTOR,
+        inputs,
+        token: process.env.HUGGINGFACE_API_KEY,
+        signal
+      });
+    }, { deadline })
+});
+
+export const getDetectionBatchStats = () => detectionBatcher.stats();
+
+// 'remote' asks Hugging Face and falls back locally, 'local' never leaves the
+// process, 'local-first' only escalates scores inside the uncertainty band.
+const DETECTION_MODES = new Set(['remote', 'local', 'local-first']);
+const requestedDetectionMode = (process.env.DETECTION_MODE || 'remote').trim().toLowerCase();
+const DETECTION_MODE = DETECTION_MODES.has(requestedDetectionMode) ? requestedDetectionMode : 'remote';
+if (DETECTION_MODE !== 'remote') {
+  console.warn(`[WARN] DETECTION_MODE=${DETECTION_MODE} serves verdicts from the bundled local model, which has not been evaluated on production traffic`);
+}
+const ESCALATE_LOW = Number(process.env.DETECTION_ESCALATE_LOW || 0.35);
+const ESCALATE_HIGH = Number(process.env.DETECTION_ESCALATE_HIGH || 0.65);
+
+const localDetectionCounters = { local: 0, escalated: 0, escalationFailures: 0 };
+
+export const getLocalDetectionStats = () => {
+  const detector = loadLocalDetector();
+  return {
+    mode: DETECTION_MODE,
+    model: detector ? detector.info : null,
+    escalationBand: [ESCALATE_LOW, ESCALATE_HIGH],
+    ...localDetectionCounters
+  };
+};
+
+const localDetection = (text) => {
+  const detector = loadLocalDetector();
+  if (!detector) return heuristicDetection(text);
+  const endSpan = startSpan('detect.local');
+  const aiProbability = normalizeProbability(detector.score(text));
+  endSpan();
+  return {
+    aiProbability,
+    humanProbability: normalizeProbability(1 - aiProbability),
+    rawScores: null,
+    source: 'local'
+  };
+};
 
-    const result = await hf.textClassification({
-      model: MODELS.AI_DETECTOR,
-      inputs: text
-    });
+const remoteDetection = async (text, options) => {
+  const params = {
+    model: MODELS.AI_DETECTOR,
+    inputs: text
+  };
+  const result = await responseCache.wrap(
+    'detect',
+    params,
+    () => coalesce('detect', params, () => timeSpan('llm.detect', () => detectionBatcher.submit(text, { deadline: options.deadline }))),
+    { refresh: options.refresh }
+  );
 
-    // Some models return labels as 'Fake'/'Real', others as 'LABEL_0'/'LABEL_1'.
-    // Prefer 'Real' score when available; if only generic labels exist, infer with complement.
-    const fakeScoreEntry = result.find(r => String(r.label).toLowerCase() === 'fake');
-    const realScoreEntry = result.find(r => String(r.label).toLowerCase() === 'real');
-    const label0 = result.find(r => String(r.label).toUpperCase() === 'LABEL_0');
-    const label1 = result.find(r => String(r.label).toUpperCase() === 'LABEL_1');
+  // Some models return labels as 'Fake'/'Real', others as 'LABEL_0'/'LABEL_1'.
+  // Prefer 'Real' score when available; if only generic labels exist, infer with complement.
+  const fakeScoreEntry = result.find(r => String(r.label).toLowerCase() === 'fake');
+  const realScoreEntry = result.find(r => String(r.label).toLowerCase() === 'real');
+  const label0 = result.find(r => String(r.label).toUpperCase() === 'LABEL_0');
+  const label1 = result.find(r => String(r.label).toUpperCase() === 'LABEL_1');
 
-    let aiProb;
-    let humanProb;
+  let aiProb;
+  let humanProb;
 
-    if (realScoreEntry) {
-      // When 'Real' exists, treat its score as human probability, AI is complement
-      humanProb = normalizeProbability(realScoreEntry.score || 0);
+  if (realScoreEntry) {
+    // When 'Real' exists, treat its score as human probability, AI is complement
+    humanProb = normalizeProbability(realScoreEntry.score || 0);
+    aiProb = normalizeProbability(1 - humanProb);
+  } else if (fakeScoreEntry) {
+    // When only 'Fake' exists, treat its score as AI probability, human is complement
+    aiProb = normalizeProbability(fakeScoreEntry.score || 0);
+    humanProb = normalizeProbability(1 - aiProb);
+  } else if (label0 && label1) {
+    // Unknown label mapping: pick the larger as AI if model likely outputs 'LABEL_1' for positive class.
+    // Use a conservative approach: consider LABEL_0 as 'Real' when its score is higher.
+    const s0 = label0.score || 0;
+    const s1 = label1.score || 0;
+    if (s0 >= s1) {
+      humanProb = normalizeProbability(s0);
       aiProb = normalizeProbability(1 - humanProb);
-    } else if (fakeScoreEntry) {
-      // When only 'Fake' exists, treat its score as AI probability, human is complement
-      aiProb = normalizeProbability(fakeScoreEntry.score || 0);
-      humanProb = normalizeProbability(1 - aiProb);
-    } else if (label0 && label1) {
-      // Unknown label mapping: pick the larger as AI if model likely outputs 'LABEL_1' for positive class.
-      // Use a conservative approach: consider LABEL_0 as 'Real' when its score is higher.
-      const s0 = label0.score || 0;
-      const s1 = label1.score || 0;
-      if (s0 >= s1) {
-        humanProb = normalizeProbability(s0);
-        aiProb = normalizeProbability(1 - humanProb);
-      } else {
-        aiProb = normalizeProbability(s1);
-        humanProb = normalizeProbability(1 - aiProb);
-      }
     } else {
-      // Fallback to heuristic if scores are not usable
-      const heuristic = heuristicDetection(text);
-      aiProb = heuristic.aiProbability;
-      humanProb = heuristic.humanProbability;
+      aiProb = normalizeProbability(s1);
+      humanProb = normalizeProbability(1 - aiProb);
+    }
+  } else {
+    // Fallback to the local model if scores are not usable
+    const local = localDetection(text);
+    aiProb = local.aiProbability;
+    humanProb = local.humanProbability;
+  }
+
+  recordInference('detect', 'model');
+  return {
+    aiProbability: aiProb,
+    humanProbability: humanProb,
+    rawScores: result,
+    source: 'huggingface'
+  };
+};
+
+const isUncertain = (detection) =>
+  detection.aiProbability >= ESCALATE_LOW && detection.aiProbability <= ESCALATE_HIGH;
+
+export const detectAIContent = async (text, options = {}) => {
+  if (DETECTION_MODE !== 'remote' || !hf) {
+    const local = localDetection(text);
+    if (DETECTION_MODE !== 'local-first' || !hf || local.source !== 'local' || !isUncertain(local)) {
+      localDetectionCounters.local += 1;
+      recordInference('detect', local.source === 'local' ? 'local' : 'heuristic');
+      return local;
     }
+    localDetectionCounters.escalated += 1;
+    try {
+      return await remoteDetection(text, options);
+    } catch (error) {
+      // The local score is already in hand, so even a shed request gets an answer.
+      if (!isGatewayRejection(error)) console.error('AI Detection Error:', error);
+      localDetectionCounters.escalationFailures += 1;
+      recordInference('detect', 'fallback');
+      return local;
+    }
+  }
 
-    return {
-      aiProbability: aiProb,
-      humanProbability: humanProb,
-      rawScores: result,
-      source: 'huggingface'
-    };
+  try {
+    return await remoteDetection(text, options);
   } catch (error) {
+    if (isGatewayRejection(error)) throw error;
     console.error('AI Detection Error:', error);
-    return heuristicDetection(text);
+    recordInference('detect', 'fallback');
+    return localDetection(text);
+  }
+};
+
+const buildChatParams = (promptOrMessages, options = {}) => ({
+  model: MODELS.LLAMA,
+  messages: Array.isArray(promptOrMessages)
+    ? promptOrMessages
+    : [{ role: 'user', content: promptOrMessages }],
+  max_tokens: options.maxTokens || 500,
+  temperature: options.temperature ?? 0.7,
+  top_p: options.topP ?? 0.95
+});
+
+// Splits text into a few words per chunk so the local fallback streams like the model does.
+const chunkText = function* (text, wordsPerChunk = 4) {
+  const parts = text.split(/(\s+)/);
+  for (let i = 0; i < parts.length; i += wordsPerChunk * 2) {
+    yield parts.slice(i, i + wordsPerChunk * 2).join('');
   }
 };
 
 export const generateText = async (promptOrMessages, options = {}) => {
   try {
     if (!hf) {
+      recordInference('generate', 'fallback');
       return fallbackGenerateText(promptOrMessages);
     }
 
-    const messages = Array.isArray(promptOrMessages)
-      ? promptOrMessages
-      : [{ role: 'user', content: promptOrMessages }];
-
-    const result = await hf.chatCompletion({
-      model: MODELS.LLAMA,
-      messages,
-      max_tokens: options.maxTokens || 500,
-      temperature: options.temperature ?? 0.7,
-      top_p: options.topP ?? 0.95
-    });
-    return result.choices?.[0]?.message?.content || '';
+    const params = buildChatParams(promptOrMessages, options);
+    const text = await responseCache.wrap(
+      'generate',
+      params,
+      () => coalesce('generate', params, async () => {
+        const result = await timeSpan('llm.generate', () =>
+          inferenceGateway.call(
+            MODELS.LLAMA,
+            (signal) => hf.chatCompletion({ ...params, ...modelEndpointArgs(params.model) }, { signal }),
+            { deadline: options.deadline }
+          )
+        );
+        return result.choices?.[0]?.message?.content || '';
+      }),
+      { refresh: options.refresh, temperature: params.temperature, validate: options.validate }
+    );
+    recordInference('generate', 'model');
+    return text;
   } catch (error) {
+    if (isGatewayRejection(error)) throw error;
     console.error('Text Generation Error:', error);
+    recordInference('generate', 'fallback');
     return fallbackGenerateText(promptOrMessages);
   }
 };
 
-export const classifyText = async (text, labels) => {
+/**
+ * Streaming counterpart of generateText: yields text deltas as the model
+ * produces them. Falls back to chunks of the deterministic local response
+ * when HF is unavailable or fails before the first token.
+ */
+export const streamText = async function* (promptOrMessages, options = {}) {
+  if (!hf) {
+    recordInference('stream', 'fallback');
+    yield* chunkText(fallbackGenerateText(promptOrMessages));
+    return;
+  }
+
+  const params = buildChatParams(promptOrMessages, options);
+  const tokens = () =>
+    inferenceGateway.stream(
+      MODELS.LLAMA,
+      async function* (signal) {
+        for await (const chunk of hf.chatCompletionStream({ ...params, ...modelEndpointArgs(params.model) }, { signal })) {
+          const delta = chunk.choices?.[0]?.delta?.content;
+          if (delta) yield delta;
+        }
+      },
+      { deadline: options.deadline }
+    );
+
+  let emitted = false;
+  // Time to first token; the rest of the stream is covered by the HTTP duration.
+  const endFirstToken = startSpan('llm.first_token');
+  try {
+    for await (const delta of responseCache.wrapStream('generate', params, tokens, {
+      refresh: options.refresh,
+      temperature: params.temperature
+    })) {
+      endFirstToken();
+      emitted = true;
+      yield delta;
+    }
+    recordInference('stream', 'model');
+  } catch (error) {
+    endFirstToken();
+    if (!emitted && isGatewayRejection(error)) throw error;
+    console.error('Text Generation Stream Error:', error);
+    recordInference('stream', emitted ? 'model' : 'fallback');
+    if (!emitted) {
+      yield* chunkText(fallbackGenerateText(promptOrMessages));
+    }
+  }
+};
+
+export const classifyText = async (text, labels, options = {}) => {
   if (!Array.isArray(labels) || labels.length === 0) throw new Error('Labels array required');
   try {
     const prompt = `You are a classifier. Rate relevance (0-1) for each label to the text. Return JSON {"labels":[...],"scores":[...]}. Sort descending by score.
-Text: """${text.slice(0,3000)}"""
+Text: """${retrievePassages({ text, query: labels.join(' '), tokenBudget: TOKEN_BUDGETS.classify }).context}"""
 Labels: ${labels.join(', ')}`;
-    const raw = await generateText(prompt, { maxTokens: 400, temperature: 0.2, topP: 0.9 });
+    const raw = await generateText(prompt, { maxTokens: 400, temperature: 0.2, topP: 0.9, refresh: options.refresh, deadline: options.deadline });
     const jsonMatch = raw.match(/\{[\s\S]*\}/);
     if (!jsonMatch) throw new Error('No JSON returned by model');
     const parsed = JSON.parse(jsonMatch[0]);
     if (!parsed.labels || !parsed.scores || parsed.labels.length !== parsed.scores.length) throw new Error('Malformed JSON');
     const pairs = parsed.labels.map((l,i)=>({label:l,score:parsed.scores[i]})).sort((a,b)=>b.score-a.score);
+    recordInference('classify', 'model');
     return { labels: pairs.map(p=>p.label), scores: pairs.map(p=>p.score), topLabel: pairs[0].label, topScore: pairs[0].score, model: MODELS.LLAMA };
   } catch (error) {
+    if (isGatewayRejection(error)) throw error;
     console.error('Prompt classification error:', error.message);
+    recordInference('classify', 'fallback');
     const lower = text.toLowerCase();
     const pairs = labels.map(l=>{ const tokens = l.toLowerCase().split(/\s+/); const hits = tokens.reduce((a,t)=>a+(lower.includes(t)?1:0),0); return {label:l,score:hits/tokens.length}; }).sort((a,b)=>b.score-a.score);
     return { labels: pairs.map(p=>p.label), scores: pairs.map(p=>p.score), topLabel: pairs[0].label, topScore: pairs[0].score, model: MODELS.LLAMA, fallback: true };
   }
 };
 
-export const analyzeText = async (text) => {
+export const analyzeText = async (text, options = {}) => {
   try {
 
     const sentimentLabels = ['Very Positive','Positive','Neutral','Negative','Very Negative'];
-    const sentiment = await classifyText(text, sentimentLabels);
+    const sentiment = await classifyText(text, sentimentLabels, options);
 
-    const wordCount = text.split(/\s+/).filter(w => w.length > 0).length;
-    const sentenceCount = text.split(/[.!?]+/).filter(s => s.trim().length > 0).length;
-    const avgWordLength = text.replace(/\s+/g, '').length / wordCount;
-    const avgSentenceLength = wordCount / sentenceCount;
+    const { wordCount, sentenceCount, avgWordLength, avgSentenceLength, readabilityScore } = getTextStats(text);
 
     return {
       sentiment: {
@@ -174,11 +386,13 @@ export const analyzeText = async (text) => {
         sentenceCount,
         avgWordLength: Math.round(avgWordLength * 10) / 10,
         avgSentenceLength: Math.round(avgSentenceLength * 10) / 10,
-        readabilityScore: Math.min(100, Math.max(0, Math.round((100 - avgSentenceLength * 2) + (avgWordLength * 5))))
+        readabilityScore
       }
     };
   } catch (error) {
     console.error('Text Analysis Error:', error);
+    // Gateway errors (503 saturation, 504 deadline) keep their status code.
+    if (error?.statusCode) throw error;
     throw new Error('Failed to analyze text: ' + error.message);
   }
 };
@@ -0,0 +1,266 @@
+import ApiError from './ApiError.js';
+import { startSpan } from './metrics.js';
+
+const RETRYABLE_STATUS = new Set([408, 425, 429, 500, 502, 503, 504]);
+const NETWORK_ERROR_CODES = new Set(['ECONNRESET', 'ECONNREFUSED', 'ETIMEDOUT', 'EPIPE', 'EAI_AGAIN', 'UND_ERR_SOCKET']);
+
+export const SATURATED = 'INFERENCE_SATURATED';
+export const CIRCUIT_OPEN = 'CIRCUIT_OPEN';
+export const DEADLINE_EXCEEDED = 'DEADLINE_EXCEEDED';
+
+// Saturation must reach the client as a 503 instead of being masked by a local fallback.
+export const isGatewayRejection = (error) => error?.code === SATURATED;
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// Full-jitter exponential backoff: uniform in [0, min(maxMs, baseMs * 2^attempt)].
+export const backoffDelay = (attempt, { baseMs = 200, maxMs = 2000 } = {}) =>
+  Math.round(Math.random() * Math.min(maxMs, baseMs * 2 ** attempt));
+
+const statusOf = (error) => error?.statusCode ?? error?.status ?? error?.httpResponse?.status;
+
+const isRetryable = (error) => {
+  if (error?.code === DEADLINE_EXCEEDED || error?.code === SATURATED || error?.code === CIRCUIT_OPEN) {
+    return false;
+  }
+  const status = statusOf(error);
+  if (status) return RETRYABLE_STATUS.has(Number(status));
+  return (
+    error?.name === 'AbortError' ||
+    error?.name === 'TimeoutError' ||
+    NETWORK_ERROR_CODES.has(error?.code) ||
+    NETWORK_ERROR_CODES.has(error?.cause?.code) ||
+    /fetch failed|network|socket hang up/i.test(error?.message || '')
+  );
+};
+
+const gatewayError = (statusCode, code, message) => {
+  const error = new ApiError(statusCode, message);
+  error.code = code;
+  return error;
+};
+
+export const deadlineExceededError = (message) => gatewayError(504, DEADLINE_EXCEEDED, message);
+
+/**
+ * Shared guard around upstream inference calls, one lane per model:
+ * - a semaphore with a bounded wait queue that fails fast with 503 when full
+ * - per-attempt timeouts clipped to the caller's deadline (epoch ms)
+ * - retries with full-jitter exponential backoff on transient failures
+ * - a circuit breaker that rejects immediately while the model is failing
+ */
+export const createInferenceGateway = ({
+  maxConcurrent = 8,
+  maxQueue = 64,
+  timeoutMs = 20000,
+  maxRetries = 2,
+  retryBaseMs = 200,
+  retryMaxMs = 2000,
+  breakerFailures = 5,
+  breakerResetMs = 30000
+} = {}) => {
+  const lanes = new Map();
+
+  const laneFor = (model) => {
+    if (!lanes.has(model)) {
+      lanes.set(model, {
+        active: 0,
+        waiters: [],
+        breaker: { state: 'closed', failures: 0, openedAt: 0, probing: false },
+        counters: { calls: 0, succeeded: 0, failed: 0, retries: 0, rejectedSaturated: 0, rejectedOpen: 0, timedOut: 0 }
+      });
+    }
+    return lanes.get(model);
+  };
+
+  const remainingMs = (deadline) => (deadline ? deadline - Date.now() : Infinity);
+
+  const acquire = (lane, deadline) => {
+    if (lane.active < maxConcurrent) {
+      lane.active += 1;
+      return Promise.resolve();
+    }
+    if (lane.waiters.length >= maxQueue) {
+      lane.counters.rejectedSaturated += 1;
+      return Promise.reject(gatewayError(503, SATURATED, 'Inference service is at capacity, please retry shortly'));
+    }
+    return new Promise((resolve, reject) => {
+      const waiter = { resolve, reject, timer: null };
+      const wait = remainingMs(deadline);
+      if (Number.isFinite(wait)) {
+        waiter.timer = setTimeout(() => {
+          lane.waiters.splice(lane.waiters.indexOf(waiter), 1);
+          lane.counters.timedOut += 1;
+          reject(gatewayError(504, DEADLINE_EXCEEDED, 'Request deadline exceeded while waiting for inference capacity'));
+        }, Math.max(0, wait));
+      }
+      lane.waiters.push(waiter);
+    });
+  };
+
+  const release = (lane) => {
+    const next = lane.waiters.shift();
+    if (next) {
+      clearTimeout(next.timer);
+      next.resolve();
+    } else {
+      lane.active -= 1;
+    }
+  };
+
+  const checkBreaker = (lane) => {
+    const { breaker } = lane;
+    if (breaker.state === 'open') {
+      if (Date.now() - breaker.openedAt < breakerResetMs) {
+        lane.counters.rejectedOpen += 1;
+        throw gatewayError(503, CIRCUIT_OPEN, 'Inference circuit is open');
+      }
+      breaker.state = 'half-open';
+    }
+    if (breaker.state === 'half-open') {
+      // Let exactly one probe through; everything else keeps failing fast.
+      if (breaker.probing) {
+        lane.counters.rejectedOpen += 1;
+        throw gatewayError(503, CIRCUIT_OPEN, 'Inference circuit is half-open');
+      }
+      breaker.probing = true;
+    }
+  };
+
+  const recordSuccess = (lane) => {
+    lane.counters.succeeded += 1;
+    lane.breaker.failures = 0;
+    lane.breaker.probing = false;
+    lane.breaker.state = 'closed';
+  };
+
+  const recordFailure = (lane, error) => {
+    lane.counters.failed += 1;
+    const { breaker } = lane;
+    breaker.probing = false;
+    // Client errors (bad input, auth) say nothing about upstream health.
+    if (!isRetryable(error) && error?.code !== DEADLINE_EXCEEDED) return;
+    breaker.failures += 1;
+    if (breaker.state === 'half-open' || breaker.failures >= breakerFailures) {
+      breaker.state = 'open';
+      breaker.openedAt = Date.now();
+    }
+  };
+
+  const attempt = async (fn, deadline) => {
+    const budget = Math.min(timeoutMs, remainingMs(deadline));
+    if (budget <= 0) {
+      throw gatewayError(504, DEADLINE_EXCEEDED, 'Request deadline exceeded before inference call');
+    }
+    const controller = new AbortController();
+    const timer = setTimeout(() => controller.abort(), budget);
+    try {
+      return await fn(controller.signal);
+    } catch (error) {
+      if (controller.signal.aborted) {
+        const expired = remainingMs(deadline) <= 0;
+        throw gatewayError(504, expired ? DEADLINE_EXCEEDED : 'INFERENCE_TIMEOUT', `Inference call timed out after ${budget}ms`);
+      }
+      throw error;
+    } finally {
+      clearTimeout(timer);
+    }
+  };
+
+  /**
+   * Runs `fn(signal)` for `model` under the gateway's limits. `deadline` is an
+   * absolute timestamp (ms) usually taken from the HTTP request.
+   */
+  const call = async (model, fn, { deadline, retries = maxRetries } = {}) => {
+    const lane = laneFor(model);
+    lane.counters.calls += 1;
+    checkBreaker(lane);
+
+    const endQueueSpan = startSpan('inference.queue');
+    try {
+      await acquire(lane, deadline);
+    } catch (error) {
+      lane.breaker.probing = false;
+      throw error;
+    } finally {
+      endQueueSpan();
+    }
+
+    try {
+      for (let attemptNo = 0; ; attemptNo++) {
+        try {
+          const result = await attempt(fn, deadline);
+          recordSuccess(lane);
+          return result;
+        } catch (error) {
+          const delay = backoffDelay(attemptNo, { baseMs: retryBaseMs, maxMs: retryMaxMs });
+          if (attemptNo >= retries || !isRetryable(error) || delay >= remainingMs(deadline)) {
+            if (error?.code === 'INFERENCE_TIMEOUT' || error?.code === DEADLINE_EXCEEDED) {
+              lane.counters.timedOut += 1;
+            }
+            recordFailure(lane, error);
+            throw error;
+          }
+          lane.counters.retries += 1;
+          await sleep(delay);
+        }
+      }
+    } finally {
+      release(lane);
+    }
+  };
+
+  /**
+   * Streaming variant: holds a permit for the lifetime of the stream and is
+   * bounded by the caller's deadline only, since long generations are
+   * expected. Streams are not retried.
+   */
+  const stream = async function* (model, generatorFn, { deadline } = {}) {
+    const lane = laneFor(model);
+    lane.counters.calls += 1;
+    checkBreaker(lane);
+
+    const endQueueSpan = startSpan('inference.queue');
+    try {
+      await acquire(lane, deadline);
+    } catch (error) {
+      lane.breaker.probing = false;
+      throw error;
+    } finally {
+      endQueueSpan();
+    }
+
+    const controller = new AbortController();
+    const wait = remainingMs(deadline);
+    const timer = Number.isFinite(wait) ? setTimeout(() => controller.abort(), Math.max(0, wait)) : null;
+    try {
+      for await (const chunk of generatorFn(controller.signal)) {
+        yield chunk;
+      }
+      recordSuccess(lane);
+    } catch (error) {
+      recordFailure(lane, error);
+      throw error;
+    } finally {
+      // Also reached when the consumer stops early; free the half-open probe slot.
+      lane.breaker.probing = false;
+      clearTimeout(timer);
+      release(lane);
+    }
+  };
+
+  const stats = () =>
+    Object.fromEntries(
+      [...lanes.entries()].map(([model, lane]) => [
+        model,
+        {
+          active: lane.active,
+          queued: lane.waiters.length,
+          breaker: lane.breaker.state,
+          ...lane.counters
+        }
+      ])
+    );
+
+  return { call, stream, stats };
+};
@@ -0,0 +1,294 @@
+import crypto from 'crypto';
+import { EventEmitter } from 'events';
+import ApiError from './ApiError.js';
+import { createJobStore } from './jobStore.js';
+import { workerShare } from './clusterBus.js';
+import { detachSpooledFile, removeSpooledFile } from '../middlewares/spoolStorage.js';
+
+const JOB_ID_PATTERN = /^[a-f0-9-]{36}$/;
+const PRIORITIES = { high: 0, normal: 1, low: 2 };
+const TERMINAL = new Set(['done', 'failed']);
+
+export const isValidJobId = (jobId) => typeof jobId === 'string' && JOB_ID_PATTERN.test(jobId);
+
+export const isTerminalJob = (job) => TERMINAL.has(job?.status);
+
+// `?async=true` or an RFC 7240 `Prefer: respond-async` header asks for a 202 and a job id.
+export const wantsAsyncJob = (req) =>
+  ['1', 'true', 'yes'].includes(String(req.query?.async || '').toLowerCase()) ||
+  /\brespond-async\b/i.test(String(req.headers.prefer || ''));
+
+export const jobPriority = (req) => {
+  const requested = String(req.query?.priority || req.headers['x-job-priority'] || 'normal').toLowerCase();
+  return requested in PRIORITIES ? requested : 'normal';
+};
+
+const publicView = (job) => ({
+  id: job.id,
+  kind: job.kind,
+  status: job.status,
+  priority: job.priority,
+  result: job.result ?? null,
+  error: job.error ?? null,
+  createdAt: job.createdAt,
+  startedAt: job.startedAt ?? null,
+  finishedAt: job.finishedAt ?? null,
+  expiresAt: new Date(job.expiresAt).toISOString(),
+  statusUrl: `/api/jobs/${job.id}`,
+  eventsUrl: `/api/jobs/${job.id}/events`
+});
+
+// Binary min-heap ordered by priority, then submission order.
+const createPriorityHeap = () => {
+  const items = [];
+  const before = (a, b) => a.rank < b.rank || (a.rank === b.rank && a.seq < b.seq);
+  const swap = (i, j) => {
+    [items[i], items[j]] = [items[j], items[i]];
+  };
+
+  return {
+    get size() {
+      return items.length;
+    },
+    push(item) {
+      items.push(item);
+      let i = items.length - 1;
+      while (i > 0) {
+        const parent = (i - 1) >> 1;
+        if (!before(items[i], items[parent])) break;
+        swap(i, parent);
+        i = parent;
+      }
+    },
+    pop() {
+      const top = items[0];
+      const last = items.pop();
+      if (items.length > 0) {
+        items[0] = last;
+        let i = 0;
+        for (;;) {
+          const left = 2 * i + 1;
+          const right = left + 1;
+          let smallest = i;
+          if (left < items.length && before(items[left], items[smallest])) smallest = left;
+          if (right < items.length && before(items[right], items[smallest])) smallest = right;
+          if (smallest === i) break;
+          swap(i, smallest);
+          i = smallest;
+        }
+      }
+      return top;
+    },
+    countBy(priority) {
+      return items.filter((item) => item.job.priority === priority).length;
+    }
+  };
+};
+
+/**
+ * Bounded worker queue for requests that outlive a client timeout. Jobs run
+ * `concurrency` at a time in priority order; each state change is saved to
+ * `store`, and records expire `ttlMs` after their last update. Jobs execute
+ * in the process that accepted them, while status lookups and watchers can
+ * be served by any process sharing the store.
+ */
+export const createJobQueue = ({
+  store,
+  concurrency = 2,
+  maxQueue = 100,
+  ttlMs = 60 * 60 * 1000,
+  timeoutMs = 120000,
+  pollMs = 500
+}) => {
+  const heap = createPriorityHeap();
+  const local = new Map();
+  const events = new EventEmitter();
+  const counters = { submitted: 0, succeeded: 0, failed: 0, rejected: 0 };
+  let active = 0;
+  // Slots taken by submits still awaiting the store; counted against maxQueue.
+  let reserved = 0;
+  let seq = 0;
+  let idleWaiters = [];
+  events.setMaxListeners(0);
+
+  const save = async (job) => {
+    job.expiresAt = Date.now() + ttlMs;
+    try {
+      await store.save(job);
+    } catch (error) {
+      console.error(`[WARN] Could not save job ${job.id}:`, error.message);
+    }
+    events.emit(job.id, publicView(job));
+  };
+
+  const settleIdle = () => {
+    if (active > 0 || heap.size > 0 || reserved > 0) return;
+    idleWaiters.forEach((resolve) => resolve());
+    idleWaiters = [];
+  };
+
+  const runJob = async ({ job, run, file }) => {
+    active += 1;
+    job.status = 'running';
+    job.startedAt = new Date().toISOString();
+    await save(job);
+    try {
+      job.result = await run(file, { deadline: Date.now() + timeoutMs });
+      job.status = 'done';
+      counters.succeeded += 1;
+    } catch (error) {
+      job.status = 'failed';
+      job.error = { statusCode: error.statusCode || 500, message: error.message || 'Internal Server Error' };
+      counters.failed += 1;
+      if (!error.statusCode || error.statusCode >= 500) console.error(`[ERROR] Job ${job.id} (${job.kind}) failed:`, error);
+    } finally {
+      removeSpooledFile(file);
+      job.finishedAt = new Date().toISOString();
+      local.delete(job.id);
+      await save(job);
+      active -= 1;
+      pump();
+    }
+  };
+
+  const pump = () => {
+    while (active < concurrency && heap.size > 0) {
+      runJob(heap.pop());
+    }
+    settleIdle();
+  };
+
+  /**
+   * Queues `run(file, { deadline })` and resolves with the job's public view.
+   * The queue takes ownership of the uploaded `file` (moved out of the
+   * request's spool cleanup) and deletes it once the job has run. The value
+   * `run` resolves with becomes the job result; a thrown error's statusCode
+   * and message become the job error.
+   */
+  const submit = async (kind, run, { priority = 'normal', file = null } = {}) => {
+    // Reserved before the first await so concurrent submits cannot all pass the check.
+    if (heap.size + reserved >= maxQueue) {
+      counters.rejected += 1;
+      throw new ApiError(503, 'Job queue is full, please retry shortly');
+    }
+    reserved += 1;
+    let entry;
+    try {
+      await store.init();
+      const job = {
+        id: crypto.randomUUID(),
+        kind,
+        status: 'queued',
+        priority: priority in PRIORITIES ? priority : 'normal',
+        result: null,
+        error: null,
+        createdAt: new Date().toISOString()
+      };
+      entry = { job, run, file: await detachSpooledFile(file), rank: PRIORITIES[job.priority], seq: seq++ };
+      local.set(job.id, job);
+      counters.submitted += 1;
+      await save(job);
+    } finally {
+      reserved -= 1;
+    }
+    heap.push(entry);
+    pump();
+    return publicView(entry.job);
+  };
+
+  const get = async (id) => {
+    if (!isValidJobId(id)) return null;
+    const job = local.get(id) || (await store.get(id));
+    return job ? publicView(job) : null;
+  };
+
+  /**
+   * Calls `listener(view)` on every change to the job until it finishes.
+   * Jobs running elsewhere (another cluster worker) are polled from the
+   * store. Returns a function that stops watching.
+   */
+  const watch = (id, listener) => {
+    if (local.has(id)) {
+      events.on(id, listener);
+      return () => events.off(id, listener);
+    }
+    let lastSeen = null;
+    let stopped = false;
+    let timer = null;
+    const poll = async () => {
+      const view = await get(id).catch(() => null);
+      if (stopped) return;
+      const fingerprint = view && `${view.status}:${view.finishedAt}`;
+      if (view && fingerprint !== lastSeen) {
+        lastSeen = fingerprint;
+        listener(view);
+      }
+      if (!view || isTerminalJob(view)) return;
+      timer = setTimeout(poll, pollMs);
+    };
+    timer = setTimeout(poll, pollMs);
+    return () => {
+      stopped = true;
+      clearTimeout(timer);
+    };
+  };
+
+  // Resolves with the job once it finishes, or with its current state after `waitMs`.
+  const waitFor = async (id, waitMs) => {
+    const current = await get(id);
+    if (!current || isTerminalJob(current) || waitMs <= 0) return current;
+    return new Promise((resolve) => {
+      let settled = false;
+      const settle = (view) => {
+        if (settled) return;
+        settled = true;
+        clearTimeout(timer);
+        stop();
+        resolve(view);
+      };
+      const timer = setTimeout(async () => settle(await get(id)), waitMs);
+      const stop = watch(id, (view) => {
+        if (isTerminalJob(view)) settle(view);
+      });
+      // It may have finished between the first lookup and subscribing.
+      get(id).then((view) => {
+        if (isTerminalJob(view)) settle(view);
+      });
+    });
+  };
+
+  // Resolves once every accepted job has finished, for graceful shutdown.
+  const drain = () =>
+    new Promise((resolve) => {
+      idleWaiters.push(resolve);
+      settleIdle();
+    });
+
+  const stats = () => ({
+    store: store.name,
+    active,
+    queued: heap.size,
+    reserved,
+    queuedByPriority: Object.fromEntries(Object.keys(PRIORITIES).map((priority) => [priority, heap.countBy(priority)])),
+    concurrency,
+    maxQueue,
+    ...counters
+  });
+
+  return { submit, get, watch, waitFor, drain, stats };
+};
+
+const jobQueue = createJobQueue({
+  store: createJobStore(),
+  concurrency: workerShare(Number(process.env.JOB_CONCURRENCY || 2)),
+  maxQueue: workerShare(Number(process.env.JOB_QUEUE_LIMIT || 100)),
+  ttlMs: Number(process.env.JOB_RESULT_TTL_MS || 60 * 60 * 1000),
+  timeoutMs: Number(process.env.JOB_TIMEOUT_MS || 120000)
+});
+
+export const submitJob = (kind, run, options) => jobQueue.submit(kind, run, options);
+export const getJob = (id) => jobQueue.get(id);
+export const watchJob = (id, listener) => jobQueue.watch(id, listener);
+export const waitForJob = (id, waitMs) => jobQueue.waitFor(id, waitMs);
+export const drainJobQueue = () => jobQueue.drain();
+export const getJobQueueStats = () => jobQueue.stats();
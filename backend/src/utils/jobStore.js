@@ -0,0 +1,115 @@
+import { isClusterWorker, requestPrimary } from './clusterBus.js';
+
+const PURGE_INTERVAL_MS = 60 * 1000;
+
+/**
+ * Job records kept in process memory until `expiresAt` (epoch ms). Used for
+ * local runs, and by the cluster primary as the store its workers share.
+ */
+export const createMemoryJobStore = () => {
+  const records = new Map();
+
+  const purge = () => {
+    const now = Date.now();
+    for (const [id, record] of records) {
+      if (record.expiresAt <= now) records.delete(id);
+    }
+  };
+
+  const timer = setInterval(purge, PURGE_INTERVAL_MS);
+  timer.unref();
+
+  return {
+    name: 'memory',
+    init: async () => {},
+    save: async (job) => {
+      records.set(job.id, job);
+    },
+    get: async (id) => {
+      const record = records.get(id);
+      if (!record) return null;
+      if (record.expiresAt <= Date.now()) {
+        records.delete(id);
+        return null;
+      }
+      return record;
+    },
+    size: () => records.size
+  };
+};
+
+// Cluster workers keep memory-backed jobs in the primary so any worker can answer a status lookup.
+export const createClusterJobStore = () => ({
+  name: 'cluster',
+  init: async () => {},
+  save: (job) => requestPrimary('jobs:save', { job }),
+  get: async (id) => (await requestPrimary('jobs:get', { id })) ?? null
+});
+
+/**
+ * Job records in the `async_jobs` table behind db.js. The Neon handle is
+ * imported on first use so memory-only setups never need DB_Url.
+ */
+export const createPostgresJobStore = () => {
+  let sqlClient = null;
+  let ready = null;
+
+  const sql = () => {
+    if (!sqlClient) sqlClient = import('../../db.js').then((module) => module.default);
+    return sqlClient;
+  };
+
+  const purge = async () => {
+    try {
+      const db = await sql();
+      await db`DELETE FROM async_jobs WHERE expires_at <= now()`;
+    } catch (error) {
+      console.error('[WARN] Job store purge failed:', error.message);
+    }
+  };
+
+  const init = () => {
+    if (!ready) {
+      ready = (async () => {
+        const db = await sql();
+        await db`CREATE TABLE IF NOT EXISTS async_jobs (
+          id uuid PRIMARY KEY,
+          record jsonb NOT NULL,
+          expires_at timestamptz NOT NULL
+        )`;
+        await db`CREATE INDEX IF NOT EXISTS async_jobs_expires_at_idx ON async_jobs (expires_at)`;
+        setInterval(purge, PURGE_INTERVAL_MS).unref();
+      })().catch((error) => {
+        ready = null;
+        throw error;
+      });
+    }
+    return ready;
+  };
+
+  return {
+    name: 'postgres',
+    init,
+    save: async (job) => {
+      await init();
+      const db = await sql();
+      await db`
+        INSERT INTO async_jobs (id, record, expires_at)
+        VALUES (${job.id}, ${JSON.stringify(job)}::jsonb, ${new Date(job.expiresAt).toISOString()}::timestamptz)
+        ON CONFLICT (id) DO UPDATE SET record = EXCLUDED.record, expires_at = EXCLUDED.expires_at
+      `;
+    },
+    get: async (id) => {
+      await init();
+      const db = await sql();
+      const rows = await db`SELECT record FROM async_jobs WHERE id = ${id} AND expires_at > now()`;
+      return rows[0]?.record ?? null;
+    }
+  };
+};
+
+// JOB_STORE=postgres keeps jobs in the db.js database; anything else stays in memory.
+export const createJobStore = (kind = process.env.JOB_STORE?.trim() || 'memory') => {
+  if (kind.toLowerCase() === 'postgres') return createPostgresJobStore();
+  return isClusterWorker ? createClusterJobStore() : createMemoryJobStore();
+};
@@ -0,0 +1,290 @@
+import fs from 'fs';
+import { fileURLToPath } from 'url';
+
+const DEFAULT_MODEL_PATH = fileURLToPath(new URL('../models/localDetector.json', import.meta.url));
+
+export const HASH_BITS = 8;
+const BUCKETS = 1 << HASH_BITS;
+
+export const DENSE_FEATURES = [
+  'meanSentenceWords',
+  'sentenceLengthCv',
+  'typeTokenRatio',
+  'meanWordLength',
+  'longWordRate',
+  'commaRate',
+  'colonSemicolonRate',
+  'exclaimQuestionRate',
+  'dashParenQuoteRate',
+  'contractionRate',
+  'firstPersonRate',
+  'digitRate',
+  'capitalRate',
+  'lowercaseSentenceStartRate',
+  'repeatedPunctuationRate'
+];
+
+// Type-token ratio over a fixed prefix so it does not just track text length.
+const TTR_WINDOW = 200;
+
+const fnvStart = () => 0x811c9dc5;
+const fnvStep = (hash, code) => Math.imul(hash ^ code, 0x01000193);
+
+// murmur3 finalizer, so neighbouring FNV values spread over all buckets.
+const bucketOf = (hash) => {
+  let h = hash;
+  h ^= h >>> 16;
+  h = Math.imul(h, 0x85ebca6b);
+  h ^= h >>> 13;
+  h = Math.imul(h, 0xc2b2ae35);
+  h ^= h >>> 16;
+  return (h >>> 0) & (BUCKETS - 1);
+};
+
+const hashWord = (word) => {
+  let hash = fnvStart();
+  for (let i = 0; i < word.length; i++) hash = fnvStep(hash, word.charCodeAt(i));
+  return hash;
+};
+
+const FIRST_PERSON = new Set(
+  ['i', 'me', 'my', 'mine', 'myself', 'we', 'us', 'our', 'ours', "i'm", "i've", "i'd", "i'll", "we're", "we've"].map(hashWord)
+);
+
+const APOSTROPHES = new Set([39, 8217]);
+const DASH_PAREN_QUOTE = new Set([45, 8211, 8212, 40, 41, 34, 8220, 8221]);
+
+const isSpace = (code) => code === 32 || (code >= 9 && code <= 13) || code === 160 || code === 8239 || code === 12288;
+const isSentenceEnd = (code) => code === 46 || code === 33 || code === 63 || code === 8230;
+const isWordChar = (code) =>
+  (code >= 97 && code <= 122) || (code >= 48 && code <= 57) ||
+  (code > 127 && !isSpace(code) && !APOSTROPHES.has(code) && !DASH_PAREN_QUOTE.has(code) && code !== 8230);
+
+// Reused between calls; scoring is synchronous so calls never interleave.
+const counts = new Float64Array(BUCKETS);
+const touched = [];
+const dense = new Float64Array(DENSE_FEATURES.length);
+const seenWords = new Set();
+
+const bump = (bucket) => {
+  if (counts[bucket] === 0) touched.push(bucket);
+  counts[bucket] += 1;
+};
+
+/**
+ * One pass over `text` that fills `counts`/`touched` with hashed word
+ * unigrams, word bigrams and character trigrams, and `dense` with the
+ * stylometric features named in DENSE_FEATURES.
+ */
+const scan = (text) => {
+  for (const bucket of touched) counts[bucket] = 0;
+  touched.length = 0;
+  seenWords.clear();
+
+  const source = String(text);
+  const lower = source.toLowerCase();
+  // Case-sensitive features only when lowercasing kept every index aligned.
+  const original = lower.length === source.length ? source : lower;
+
+  let words = 0;
+  let wordChars = 0;
+  let longWords = 0;
+  let contractions = 0;
+  let firstPerson = 0;
+  let letters = 0;
+  let capitals = 0;
+  let digits = 0;
+  let commas = 0;
+  let colons = 0;
+  let exclaims = 0;
+  let dashes = 0;
+  let repeated = 0;
+
+  let sentences = 0;
+  let sentenceWords = 0;
+  let sentenceSum = 0;
+  let sentenceSumSq = 0;
+  let lowercaseStarts = 0;
+
+  let wordHash = 0;
+  let wordLength = 0;
+  let wordHasApostrophe = false;
+  let previousWordHash = 0;
+  let c1 = 32;
+  let c2 = 32;
+  let previous = 32;
+
+  const closeWord = () => {
+    words += 1;
+    wordChars += wordLength;
+    if (wordLength >= 8) longWords += 1;
+    if (wordHasApostrophe) contractions += 1;
+    if (FIRST_PERSON.has(wordHash)) firstPerson += 1;
+    if (words <= TTR_WINDOW) seenWords.add(wordHash);
+    bump(bucketOf(wordHash ^ 0x9e3779b9));
+    if (previousWordHash !== 0) bump(bucketOf(fnvStep(previousWordHash, wordHash) ^ 0x7f4a7c15));
+    previousWordHash = wordHash;
+    sentenceWords += 1;
+    wordLength = 0;
+    wordHasApostrophe = false;
+  };
+
+  const closeSentence = () => {
+    if (sentenceWords === 0) return;
+    sentences += 1;
+    sentenceSum += sentenceWords;
+    sentenceSumSq += sentenceWords * sentenceWords;
+    sentenceWords = 0;
+  };
+
+  for (let i = 0; i < lower.length; i++) {
+    const code = lower.charCodeAt(i);
+    const space = isSpace(code);
+
+    // Character trigrams over the lowercased text with whitespace runs collapsed.
+    if (!(space && c2 === 32)) {
+      const c3 = space ? 32 : code;
+      bump(bucketOf((Math.imul(Math.imul(c1, 65599) + c2, 65599) + c3) ^ 0x632be5ab));
+      c1 = c2;
+      c2 = c3;
+    }
+
+    const inWord = isWordChar(code) ||
+      (APOSTROPHES.has(code) && wordLength > 0 && isWordChar(lower.charCodeAt(i + 1)));
+
+    if (inWord) {
+      if (wordLength === 0) {
+        wordHash = fnvStart();
+        if (sentenceWords === 0) {
+          const first = original.charCodeAt(i);
+          if (first >= 97 && first <= 122) lowercaseStarts += 1;
+        }
+      }
+      if (APOSTROPHES.has(code)) {
+        wordHasApostrophe = true;
+        wordHash = fnvStep(wordHash, 39);
+      } else {
+        wordHash = fnvStep(wordHash, code);
+      }
+      wordLength += 1;
+
+      const cased = original.charCodeAt(i);
+      if (code >= 48 && code <= 57) {
+        digits += 1;
+      } else {
+        letters += 1;
+        if (cased !== code) capitals += 1;
+      }
+    } else {
+      if (wordLength > 0) closeWord();
+      if (code === 44) commas += 1;
+      else if (code === 58 || code === 59) colons += 1;
+      else if (code === 33 || code === 63) exclaims += 1;
+      else if (DASH_PAREN_QUOTE.has(code)) dashes += 1;
+      if (isSentenceEnd(code)) {
+        if (code === previous || code === 8230) repeated += 1;
+        closeSentence();
+      }
+    }
+    previous = code;
+  }
+  if (wordLength > 0) closeWord();
+  closeSentence();
+
+  const perWord = (value) => (words === 0 ? 0 : value / words);
+  const perSentence = (value) => (sentences === 0 ? 0 : value / sentences);
+  const meanSentence = perSentence(sentenceSum);
+  const variance = sentences === 0 ? 0 : Math.max(0, sentenceSumSq / sentences - meanSentence * meanSentence);
+
+  dense[0] = meanSentence;
+  dense[1] = meanSentence === 0 ? 0 : Math.sqrt(variance) / meanSentence;
+  dense[2] = words === 0 ? 0 : seenWords.size / Math.min(words, TTR_WINDOW);
+  dense[3] = perWord(wordChars);
+  dense[4] = perWord(longWords);
+  dense[5] = perWord(commas);
+  dense[6] = perWord(colons);
+  dense[7] = perSentence(exclaims);
+  dense[8] = perWord(dashes);
+  dense[9] = perWord(contractions);
+  dense[10] = perWord(firstPerson);
+  dense[11] = letters + digits === 0 ? 0 : digits / (letters + digits);
+  dense[12] = letters === 0 ? 0 : capitals / letters;
+  dense[13] = perSentence(lowercaseStarts);
+  dense[14] = perSentence(repeated);
+
+  // Sublinear term frequency, L2-normalised over the hashed block.
+  let norm = 0;
+  for (const bucket of touched) {
+    counts[bucket] = Math.log1p(counts[bucket]);
+    norm += counts[bucket] * counts[bucket];
+  }
+  norm = Math.sqrt(norm) || 1;
+  for (const bucket of touched) counts[bucket] /= norm;
+
+  return words;
+};
+
+/**
+ * Feature vector for training: hashed features as sparse `indices`/`values`
+ * plus the raw (unstandardised) stylometric `dense` values.
+ */
+export const extractFeatures = (text) => {
+  const words = scan(text);
+  const indices = Int32Array.from(touched).sort();
+  return {
+    words,
+    indices,
+    values: Float64Array.from(indices, (bucket) => counts[bucket]),
+    dense: Float64Array.from(dense)
+  };
+};
+
+const sigmoid = (z) => 1 / (1 + Math.exp(-z));
+
+/**
+ * Wraps trained weights (the JSON written by bench/trainLocalDetector.js) as
+ * a logistic-regression scorer returning P(AI-generated).
+ */
+export const createLocalDetector = (model) => {
+  if (model.hashBits !== HASH_BITS || model.hashedWeights.length !== BUCKETS) {
+    throw new Error(`Local detector model expects ${model.hashBits}-bit hashing, this build uses ${HASH_BITS}`);
+  }
+  const hashedWeights = Float64Array.from(model.hashedWeights);
+  const denseWeights = Float64Array.from(model.dense.weights);
+  const { mean, std } = model.dense;
+
+  const score = (text) => {
+    scan(text);
+    let z = model.bias;
+    for (const bucket of touched) z += hashedWeights[bucket] * counts[bucket];
+    for (let i = 0; i < denseWeights.length; i++) z += denseWeights[i] * ((dense[i] - mean[i]) / (std[i] || 1));
+    return sigmoid(z);
+  };
+
+  return {
+    score,
+    scoreBatch: (texts) => Float64Array.from(texts, score),
+    info: {
+      version: model.version,
+      trainedAt: model.trainedAt,
+      samples: model.samples,
+      hashBits: model.hashBits,
+      evaluation: model.evaluation ?? null
+    }
+  };
+};
+
+let detector;
+
+// Loads the bundled model once (LOCAL_DETECTOR_MODEL overrides the path); null when unavailable.
+export const loadLocalDetector = () => {
+  if (detector !== undefined) return detector;
+  const modelPath = process.env.LOCAL_DETECTOR_MODEL?.trim() || DEFAULT_MODEL_PATH;
+  try {
+    detector = createLocalDetector(JSON.parse(fs.readFileSync(modelPath, 'utf-8')));
+  } catch (error) {
+    console.error('[WARN] Local detection model unavailable, using the heuristic:', error.message);
+    detector = null;
+  }
+  return detector;
+};
@@ -0,0 +1,248 @@
+import { AsyncLocalStorage } from 'async_hooks';
+import { monitorEventLoopDelay, performance } from 'perf_hooks';
+
+export const METRICS_ENABLED = (process.env.METRICS_ENABLED || 'true').toLowerCase() !== 'false';
+
+const DURATION_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30];
+const LAG_WINDOW_MS = Number(process.env.METRICS_LAG_WINDOW_MS || 15000);
+
+const HELP = {
+  http_request_duration_seconds: ['histogram', 'HTTP request duration by route and status'],
+  app_span_duration_seconds: ['histogram', 'Duration of instrumented stages (upload, extraction, inference, storage)'],
+  app_inference_results_total: ['counter', 'Inference results by kind and source (model, local, fallback, heuristic)'],
+  nodejs_eventloop_lag_seconds: ['gauge', 'Event-loop delay over the last sampling window'],
+  process_resident_memory_bytes: ['gauge', 'Resident set size'],
+  nodejs_heap_used_bytes: ['gauge', 'V8 heap in use']
+};
+
+const requestContext = new AsyncLocalStorage();
+const histograms = new Map();
+const counters = new Map();
+const NOOP = () => {};
+
+const labelKey = (labels) => JSON.stringify(Object.entries(labels).sort(([a], [b]) => (a < b ? -1 : 1)));
+
+const seriesFor = (store, name, labels, create) => {
+  if (!store.has(name)) store.set(name, new Map());
+  const series = store.get(name);
+  const key = labelKey(labels);
+  if (!series.has(key)) series.set(key, create());
+  return series.get(key);
+};
+
+const observe = (name, labels, seconds) => {
+  const series = seriesFor(histograms, name, labels, () => ({
+    labels,
+    counts: new Array(DURATION_BUCKETS.length).fill(0),
+    sum: 0,
+    count: 0
+  }));
+  // Buckets are stored non-cumulatively and summed when rendered.
+  const index = DURATION_BUCKETS.findIndex((bound) => seconds <= bound);
+  if (index !== -1) series.counts[index] += 1;
+  series.sum += seconds;
+  series.count += 1;
+};
+
+export const incrementCounter = (name, labels, by = 1) => {
+  if (!METRICS_ENABLED) return;
+  seriesFor(counters, name, labels, () => ({ labels, value: 0 })).value += by;
+};
+
+// `source` is 'model', 'local', 'fallback' or 'heuristic'; the fallback rate is derived from these counts.
+export const recordInference = (kind, source) =>
+  incrementCounter('app_inference_results_total', { kind, source });
+
+// Records an externally measured duration (e.g. timings returned from a worker thread).
+export const recordSpan = (name, ms) => {
+  if (!METRICS_ENABLED) return;
+  observe('app_span_duration_seconds', { span: name }, ms / 1000);
+  requestContext.getStore()?.spans.push({ name, ms });
+};
+
+// Starts a named span and returns the function that ends it. A no-op when metrics are disabled.
+export const startSpan = (name) => {
+  if (!METRICS_ENABLED) return NOOP;
+  const startedAt = performance.now();
+  let ended = false;
+  return () => {
+    if (ended) return;
+    ended = true;
+    recordSpan(name, performance.now() - startedAt);
+  };
+};
+
+export const timeSpan = async (name, fn) => {
+  if (!METRICS_ENABLED) return fn();
+  const end = startSpan(name);
+  try {
+    return await fn();
+  } finally {
+    end();
+  }
+};
+
+// Repeated spans (e.g. two LLM calls) are summed into one entry.
+const formatServerTiming = (spans, totalMs) => {
+  const merged = new Map();
+  for (const { name, ms } of spans) {
+    const entry = merged.get(name) || { ms: 0, count: 0 };
+    entry.ms += ms;
+    entry.count += 1;
+    merged.set(name, entry);
+  }
+  const parts = [...merged].map(([name, { ms, count }]) =>
+    `${name};dur=${ms.toFixed(1)}${count > 1 ? `;desc="x${count}"` : ''}`
+  );
+  parts.push(`total;dur=${totalMs.toFixed(1)}`);
+  return parts.join(', ');
+};
+
+/**
+ * Opens a span context for the request, writes the collected spans as a
+ * Server-Timing header when headers go out, and records the request in the
+ * HTTP duration histogram. Streaming responses only carry the spans that
+ * finished before their headers were flushed.
+ */
+export const timingMiddleware = (req, res, next) => {
+  if (!METRICS_ENABLED) return next();
+  const context = { spans: [], startedAt: performance.now() };
+
+  const writeHead = res.writeHead;
+  res.writeHead = function writeHeadWithTiming(...args) {
+    if (!this.headersSent) {
+      this.setHeader('Server-Timing', formatServerTiming(context.spans, performance.now() - context.startedAt));
+    }
+    return writeHead.apply(this, args);
+  };
+
+  res.once('finish', () => {
+    const route = req.route ? `${req.baseUrl}${req.route.path}` : 'unmatched';
+    observe(
+      'http_request_duration_seconds',
+      { method: req.method, route, status: String(res.statusCode) },
+      (performance.now() - context.startedAt) / 1000
+    );
+  });
+
+  requestContext.run(context, next);
+};
+
+const lagMonitor = METRICS_ENABLED ? monitorEventLoopDelay({ resolution: 20 }) : null;
+let lastLagWindow = null;
+
+const lagSnapshot = () => {
+  const toSeconds = (ns) => (Number.isFinite(ns) ? ns / 1e9 : 0);
+  return {
+    p50: toSeconds(lagMonitor.percentile(50)),
+    p99: toSeconds(lagMonitor.percentile(99)),
+    max: toSeconds(lagMonitor.max),
+    mean: toSeconds(lagMonitor.mean)
+  };
+};
+
+if (lagMonitor) {
+  lagMonitor.enable();
+  setInterval(() => {
+    lastLagWindow = lagSnapshot();
+    lagMonitor.reset();
+  }, LAG_WINDOW_MS).unref();
+}
+
+const serialize = (store) =>
+  [...store].map(([name, series]) => [name, [...series.values()]]);
+
+/** Plain-data copy of this process's metrics, mergeable across cluster workers. */
+export const getMetricsSnapshot = () => {
+  const memory = process.memoryUsage();
+  return {
+    pid: process.pid,
+    histograms: serialize(histograms),
+    counters: serialize(counters),
+    lag: lagMonitor ? lastLagWindow || lagSnapshot() : null,
+    rss: memory.rss,
+    heapUsed: memory.heapUsed
+  };
+};
+
+// Exposition-format label escaping: backslash, double quote and newline as \\, \" and \n.
+const escapeLabelValue = (value) =>
+  String(value).replace(/\\/g, '\\\\').replace(/"/g, '\\"').replace(/\n/g, '\\n');
+
+const formatLabels = (labels) => {
+  const entries = Object.entries(labels);
+  if (entries.length === 0) return '';
+  return `{${entries.map(([key, value]) => `${key}="${escapeLabelValue(value)}"`).join(',')}}`;
+};
+
+const header = (name) => {
+  const [type, help] = HELP[name] || ['untyped', name];
+  return `# HELP ${name} ${help}\n# TYPE ${name} ${type}`;
+};
+
+/**
+ * Renders snapshots (one per process) in the Prometheus text format.
+ * Histograms and counters are summed; gauges are labelled by pid.
+ */
+export const renderMetrics = (snapshots) => {
+  const mergedHistograms = new Map();
+  const mergedCounters = new Map();
+
+  for (const snapshot of snapshots) {
+    for (const [name, seriesList] of snapshot.histograms) {
+      for (const series of seriesList) {
+        const target = seriesFor(mergedHistograms, name, series.labels, () => ({
+          labels: series.labels,
+          counts: new Array(DURATION_BUCKETS.length).fill(0),
+          sum: 0,
+          count: 0
+        }));
+        series.counts.forEach((value, index) => {
+          target.counts[index] += value;
+        });
+        target.sum += series.sum;
+        target.count += series.count;
+      }
+    }
+    for (const [name, seriesList] of snapshot.counters) {
+      for (const series of seriesList) {
+        seriesFor(mergedCounters, name, series.labels, () => ({ labels: series.labels, value: 0 })).value += series.value;
+      }
+    }
+  }
+
+  const lines = [];
+  for (const [name, series] of mergedHistograms) {
+    lines.push(header(name));
+    for (const { labels, counts, sum, count } of series.values()) {
+      let cumulative = 0;
+      DURATION_BUCKETS.forEach((bound, index) => {
+        cumulative += counts[index];
+        lines.push(`${name}_bucket${formatLabels({ ...labels, le: bound })} ${cumulative}`);
+      });
+      lines.push(`${name}_bucket${formatLabels({ ...labels, le: '+Inf' })} ${count}`);
+      lines.push(`${name}_sum${formatLabels(labels)} ${sum}`);
+      lines.push(`${name}_count${formatLabels(labels)} ${count}`);
+    }
+  }
+  for (const [name, series] of mergedCounters) {
+    lines.push(header(name));
+    for (const { labels, value } of series.values()) {
+      lines.push(`${name}${formatLabels(labels)} ${value}`);
+    }
+  }
+
+  lines.push(header('nodejs_eventloop_lag_seconds'));
+  for (const { pid, lag } of snapshots) {
+    if (!lag) continue;
+    for (const [stat, value] of Object.entries(lag)) {
+      lines.push(`nodejs_eventloop_lag_seconds${formatLabels({ pid, stat })} ${value}`);
+    }
+  }
+  lines.push(header('process_resident_memory_bytes'));
+  for (const { pid, rss } of snapshots) lines.push(`process_resident_memory_bytes${formatLabels({ pid })} ${rss}`);
+  lines.push(header('nodejs_heap_used_bytes'));
+  for (const { pid, heapUsed } of snapshots) lines.push(`nodejs_heap_used_bytes${formatLabels({ pid })} ${heapUsed}`);
+
+  return `${lines.join('\n')}\n`;
+};
@@ -0,0 +1,111 @@
+import readline from 'readline';
+
+const BATCH_CONCURRENCY = Number(process.env.BATCH_CONCURRENCY || 8);
+const BATCH_MAX_ITEMS = Number(process.env.BATCH_MAX_ITEMS || 10000);
+
+const isNdjsonRequest = (req) => /application\/(x-)?ndjson/i.test(String(req.headers['content-type'] || ''));
+
+/**
+ * Yields `{ index, item }` from a JSON array body (`[...]` or `{ items: [...] }`)
+ * or, for `application/x-ndjson`, from the request stream line by line so
+ * large batches never sit in memory as one document. Unparseable lines are
+ * yielded with a `parseError`.
+ */
+export const readBatchItems = async function* (req) {
+  if (!isNdjsonRequest(req)) {
+    const items = Array.isArray(req.body) ? req.body : req.body?.items;
+    if (!Array.isArray(items)) return;
+    for (let index = 0; index < items.length; index++) {
+      yield { index, item: items[index] };
+    }
+    return;
+  }
+
+  const lines = readline.createInterface({ input: req, crlfDelay: Infinity });
+  let index = 0;
+  for await (const line of lines) {
+    if (!line.trim()) continue;
+    try {
+      yield { index, item: JSON.parse(line) };
+    } catch (error) {
+      yield { index, parseError: `Invalid JSON on line ${index + 1}` };
+    }
+    index += 1;
+  }
+};
+
+/**
+ * Runs `handler(item)` over every batch item with bounded concurrency and
+ * writes one NDJSON line per item as it completes (completion order, tagged
+ * with the input `index`), followed by a summary line. A failing item only
+ * produces an error line; the rest of the batch continues.
+ */
+export const streamBatchResults = async (req, res, handler, { concurrency = BATCH_CONCURRENCY, maxItems = BATCH_MAX_ITEMS } = {}) => {
+  const items = readBatchItems(req);
+  const first = await items.next();
+  if (first.done) {
+    return res.status(400).json({
+      success: false,
+      message: 'Batch requests need a JSON array, an { "items": [...] } object, or an application/x-ndjson body'
+    });
+  }
+
+  res.status(200);
+  res.set({ 'Content-Type': 'application/x-ndjson; charset=utf-8', 'Cache-Control': 'no-cache' });
+  res.flushHeaders();
+
+  let closed = false;
+  res.on('close', () => {
+    closed = true;
+  });
+  const writeLine = (payload) => {
+    if (!closed) res.write(`${JSON.stringify(payload)}\n`);
+  };
+
+  const summary = { total: 0, succeeded: 0, failed: 0, truncated: false };
+  let pendingFirst = first;
+
+  const nextItem = async () => {
+    if (pendingFirst) {
+      const entry = pendingFirst;
+      pendingFirst = null;
+      return entry;
+    }
+    return items.next();
+  };
+
+  const worker = async () => {
+    while (!closed) {
+      const { value, done } = await nextItem();
+      if (done) return;
+      if (value.index >= maxItems) {
+        summary.truncated = true;
+        return;
+      }
+      summary.total += 1;
+      const startedAt = Date.now();
+      try {
+        if (value.parseError) {
+          const error = new Error(value.parseError);
+          error.statusCode = 400;
+          throw error;
+        }
+        const data = await handler(value.item, value.index);
+        summary.succeeded += 1;
+        writeLine({ index: value.index, success: true, durationMs: Date.now() - startedAt, data });
+      } catch (error) {
+        summary.failed += 1;
+        writeLine({
+          index: value.index,
+          success: false,
+          durationMs: Date.now() - startedAt,
+          error: { statusCode: error.statusCode || 500, message: error.message || 'Internal Server Error' }
+        });
+      }
+    }
+  };
+
+  await Promise.all(Array.from({ length: Math.max(1, concurrency) }, worker));
+  writeLine({ done: true, ...summary });
+  if (!closed) res.end();
+};
@@ -0,0 +1,18 @@
+const NO_CACHE_PATTERN = /\bno-cache\b/i;
+
+export const wantsFreshResponse = (req) =>
+  NO_CACHE_PATTERN.test(String(req.headers['cache-control'] || '')) ||
+  NO_CACHE_PATTERN.test(String(req.headers.pragma || ''));
+
+// Options forwarded from the HTTP request to the inference helpers in huggingface.js.
+export const inferenceOptions = (req) => ({
+  refresh: wantsFreshResponse(req),
+  deadline: req.deadline
+});
+
+// Batch items each get the request's full timeout budget instead of sharing one deadline.
+export const batchItemOptions = (req) => {
+  const { refresh, deadline } = inferenceOptions(req);
+  const budget = deadline ? deadline - Date.now() : null;
+  return () => ({ refresh, deadline: budget ? Date.now() + budget : undefined });
+};
@@ -0,0 +1,184 @@
+import crypto from 'crypto';
+
+const toNumber = (value, fallback) => {
+  const num = Number(value);
+  return Number.isFinite(num) ? num : fallback;
+};
+
+// Stable JSON so that { a, b } and { b, a } hash to the same key.
+const stableStringify = (value) => {
+  if (Array.isArray(value)) {
+    return `[${value.map(stableStringify).join(',')}]`;
+  }
+  if (value && typeof value === 'object') {
+    return `{${Object.keys(value)
+      .filter((key) => value[key] !== undefined)
+      .sort()
+      .map((key) => `${JSON.stringify(key)}:${stableStringify(value[key])}`)
+      .join(',')}}`;
+  }
+  return JSON.stringify(value);
+};
+
+export const hashPayload = (payload) =>
+  crypto.createHash('sha256').update(stableStringify(payload)).digest('hex');
+
+const isCacheable = (value) => value !== undefined && value !== null && value !== '';
+
+export const createResponseCache = ({
+  enabled = true,
+  maxEntries = 500,
+  maxTemperature = 0.5,
+  ttls = {},
+  defaultTtlMs = 10 * 60 * 1000
+} = {}) => {
+  const entries = new Map();
+  const counters = { hits: 0, misses: 0, bypassed: 0, refreshed: 0, rejected: 0, sharedHits: 0, evictions: 0 };
+  let sharedTier = null;
+
+  const ttlFor = (namespace) => toNumber(ttls[namespace], defaultTtlMs);
+
+  const readLocal = (key) => {
+    const entry = entries.get(key);
+    if (!entry) return undefined;
+    if (entry.expiresAt <= Date.now()) {
+      entries.delete(key);
+      return undefined;
+    }
+    // Re-insert to mark as most recently used.
+    entries.delete(key);
+    entries.set(key, entry);
+    return entry.value;
+  };
+
+  const writeLocal = (key, value, ttlMs) => {
+    if (entries.has(key)) entries.delete(key);
+    entries.set(key, { value, expiresAt: Date.now() + ttlMs });
+    while (entries.size > maxEntries) {
+      entries.delete(entries.keys().next().value);
+      counters.evictions += 1;
+    }
+  };
+
+  const get = async (namespace, key) => {
+    const local = readLocal(key);
+    if (local !== undefined) return local;
+    if (!sharedTier) return undefined;
+    try {
+      const shared = await sharedTier.get(`${namespace}:${key}`);
+      if (isCacheable(shared)) {
+        counters.sharedHits += 1;
+        writeLocal(key, shared, ttlFor(namespace));
+        return shared;
+      }
+    } catch (error) {
+      console.error('[WARN] Shared cache read failed:', error.message);
+    }
+    return undefined;
+  };
+
+  const set = async (namespace, key, value) => {
+    if (!isCacheable(value)) return;
+    const ttlMs = ttlFor(namespace);
+    if (ttlMs <= 0) return;
+    writeLocal(key, value, ttlMs);
+    if (!sharedTier) return;
+    try {
+      await sharedTier.set(`${namespace}:${key}`, value, ttlMs);
+    } catch (error) {
+      console.error('[WARN] Shared cache write failed:', error.message);
+    }
+  };
+
+  /**
+   * Returns the cached value for `payload` or runs `fn` and stores its result.
+   * `refresh` skips the lookup (but still stores), and sampling above
+   * `maxTemperature` bypasses the cache entirely since outputs are meant to vary.
+   * Results for which `validate(value)` is false are returned but not stored,
+   * so output the caller cannot use is not replayed to every identical request.
+   */
+  const wrap = async (namespace, payload, fn, { refresh = false, temperature, validate } = {}) => {
+    if (!enabled || (typeof temperature === 'number' && temperature > maxTemperature)) {
+      counters.bypassed += 1;
+      return fn();
+    }
+
+    const key = hashPayload({ namespace, payload });
+    if (refresh) {
+      counters.refreshed += 1;
+    } else {
+      const cached = await get(namespace, key);
+      if (cached !== undefined) {
+        counters.hits += 1;
+        return cached;
+      }
+      counters.misses += 1;
+    }
+
+    const value = await fn();
+    if (validate && !validate(value)) {
+      counters.rejected += 1;
+      return value;
+    }
+    await set(namespace, key, value);
+    return value;
+  };
+
+  /**
+   * Streaming variant of wrap: replays a cached value as a single chunk, or
+   * yields the chunks of `generatorFn()` and stores their concatenation once
+   * the stream completes.
+   */
+  const wrapStream = async function* (namespace, payload, generatorFn, { refresh = false, temperature } = {}) {
+    if (!enabled || (typeof temperature === 'number' && temperature > maxTemperature)) {
+      counters.bypassed += 1;
+      yield* generatorFn();
+      return;
+    }
+
+    const key = hashPayload({ namespace, payload });
+    if (refresh) {
+      counters.refreshed += 1;
+    } else {
+      const cached = await get(namespace, key);
+      if (cached !== undefined) {
+        counters.hits += 1;
+        yield cached;
+        return;
+      }
+      counters.misses += 1;
+    }
+
+    let value = '';
+    for await (const chunk of generatorFn()) {
+      value += chunk;
+      yield chunk;
+    }
+    await set(namespace, key, value);
+  };
+
+  const stats = () => {
+    const lookups = counters.hits + counters.misses;
+    return {
+      enabled,
+      size: entries.size,
+      maxEntries,
+      ...counters,
+      hitRate: lookups === 0 ? 0 : Number((counters.hits / lookups).toFixed(4)),
+      sharedTier: Boolean(sharedTier)
+    };
+  };
+
+  return {
+    wrap,
+    wrapStream,
+    get,
+    set,
+    stats,
+    clear: () => entries.clear(),
+    // Shared tier contract: { get(key) => value | undefined, set(key, value, ttlMs) }, both may be async.
+    setSharedTier: (store) => {
+      sharedTier = store || null;
+    }
+  };
+};
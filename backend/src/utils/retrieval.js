@@ -0,0 +1,181 @@
+import { performance } from 'perf_hooks';
+import { recordSpan } from './metrics.js';
+import { fingerprintBuffer } from './documentStore.js';
+
+const PASSAGE_WORDS = Number(process.env.RETRIEVAL_PASSAGE_WORDS || 120);
+const PASSAGE_OVERLAP_WORDS = Number(process.env.RETRIEVAL_OVERLAP_WORDS || 30);
+const INDEX_CACHE_SIZE = Number(process.env.RETRIEVAL_INDEX_CACHE_SIZE || 32);
+
+// Passage budgets per prompt, sized to the character limits each prompt used to
+// truncate at (about 4 characters per token), so prompt sizes stay where they were.
+export const TOKEN_BUDGETS = Object.freeze({
+  assistant: Number(process.env.RETRIEVAL_TOKEN_BUDGET || 750),
+  classify: 750,
+  resume: 875,
+  ticket: 1000
+});
+
+// BM25 parameters (standard defaults).
+const K1 = 1.2;
+const B = 0.75;
+
+const STOP_WORDS = new Set([
+  'a', 'an', 'and', 'are', 'as', 'at', 'be', 'but', 'by', 'for', 'from', 'has', 'have', 'how',
+  'i', 'if', 'in', 'into', 'is', 'it', 'its', 'me', 'my', 'of', 'on', 'or', 'our', 'so', 'that',
+  'the', 'their', 'them', 'there', 'these', 'they', 'this', 'to', 'was', 'we', 'were', 'what',
+  'when', 'where', 'which', 'who', 'why', 'will', 'with', 'you', 'your', 'does', 'do', 'did',
+  'can', 'about', 'document', 'file'
+]);
+
+const indexCache = new Map();
+
+// Rough chars-per-token ratio for Llama tokenizers on English prose.
+export const estimateTokens = (text) => Math.ceil(text.length / 4);
+
+const tokenize = (text) => {
+  const terms = [];
+  const matches = text.toLowerCase().match(/[a-z0-9]+/g) || [];
+  for (const term of matches) {
+    if (term.length > 1 && !STOP_WORDS.has(term)) terms.push(term);
+  }
+  return terms;
+};
+
+// Overlapping word windows so answers spanning a boundary still land in one passage.
+const splitPassages = (text) => {
+  const words = text.split(/\s+/).filter(Boolean);
+  const step = Math.max(1, PASSAGE_WORDS - PASSAGE_OVERLAP_WORDS);
+  const passages = [];
+  for (let start = 0; start < words.length; start += step) {
+    passages.push(words.slice(start, start + PASSAGE_WORDS).join(' '));
+    if (start + PASSAGE_WORDS >= words.length) break;
+  }
+  return passages;
+};
+
+const buildIndex = (text) => {
+  const passages = splitPassages(text);
+  const postings = new Map();
+  const lengths = new Array(passages.length);
+  let totalLength = 0;
+
+  passages.forEach((passage, index) => {
+    const terms = tokenize(passage);
+    lengths[index] = terms.length;
+    totalLength += terms.length;
+    const counts = new Map();
+    for (const term of terms) counts.set(term, (counts.get(term) || 0) + 1);
+    for (const [term, tf] of counts) {
+      if (!postings.has(term)) postings.set(term, []);
+      postings.get(term).push([index, tf]);
+    }
+  });
+
+  return {
+    passages,
+    postings,
+    lengths,
+    avgLength: passages.length ? totalLength / passages.length : 0
+  };
+};
+
+const getIndex = (key, text) => {
+  const cached = indexCache.get(key);
+  if (cached) {
+    indexCache.delete(key);
+    indexCache.set(key, cached);
+    return { index: cached, cached: true };
+  }
+  const index = buildIndex(text);
+  indexCache.set(key, index);
+  while (indexCache.size > INDEX_CACHE_SIZE) {
+    indexCache.delete(indexCache.keys().next().value);
+  }
+  return { index, cached: false };
+};
+
+const scorePassages = (index, query) => {
+  const scores = new Float64Array(index.passages.length);
+  const n = index.passages.length;
+  for (const term of new Set(tokenize(query))) {
+    const posting = index.postings.get(term);
+    if (!posting) continue;
+    const idf = Math.log(1 + (n - posting.length + 0.5) / (posting.length + 0.5));
+    for (const [passageIndex, tf] of posting) {
+      const norm = 1 - B + B * (index.lengths[passageIndex] / (index.avgLength || 1));
+      scores[passageIndex] += idf * ((tf * (K1 + 1)) / (tf + K1 * norm));
+    }
+  }
+  return scores;
+};
+
+/**
+ * Selects the passages of `text` most relevant to `query` that fit within
+ * `tokenBudget`, returned in document order. Short texts are passed through
+ * unchanged. The BM25 index is cached per document so follow-up questions
+ * only pay the query cost.
+ */
+export const retrievePassages = ({ text, query, documentId = null, tokenBudget = TOKEN_BUDGETS.assistant }) => {
+  const source = text || '';
+  if (estimateTokens(source) <= tokenBudget) {
+    return {
+      context: source,
+      passages: [],
+      stats: { retrieved: false, passageCount: 1, selected: 1, buildMs: 0, queryMs: 0, cachedIndex: false }
+    };
+  }
+
+  const buildStart = performance.now();
+  const { index, cached } = getIndex(documentId || fingerprintBuffer(source), source);
+  const buildMs = performance.now() - buildStart;
+
+  const queryStart = performance.now();
+  const scores = scorePassages(index, query || '');
+  // Without any query-term hits fall back to document order.
+  const ranked = index.passages
+    .map((passage, position) => ({ position, score: scores[position] }))
+    .sort((a, b) => b.score - a.score || a.position - b.position);
+
+  const selected = [];
+  let usedTokens = 0;
+  for (const candidate of ranked) {
+    const cost = estimateTokens(index.passages[candidate.position]);
+    // Skip passages that do not fit; a shorter, lower-ranked one may still fill the gap.
+    if (usedTokens + cost > tokenBudget) continue;
+    selected.push(candidate);
+    usedTokens += cost;
+  }
+  // Unspaced text (CJK, long URLs, minified content) can leave every passage over
+  // budget; send the top-ranked one cut to the budget rather than an empty document.
+  let truncated = false;
+  if (selected.length === 0 && ranked.length > 0) {
+    selected.push(ranked[0]);
+    truncated = true;
+  }
+  selected.sort((a, b) => a.position - b.position);
+  const queryMs = performance.now() - queryStart;
+  recordSpan('retrieval.index', buildMs);
+  recordSpan('retrieval.query', queryMs);
+
+  const passages = selected.map(({ position, score }) => ({
+    position,
+    score: Number(score.toFixed(4)),
+    text: truncated ? index.passages[position].slice(0, tokenBudget * 4) : index.passages[position]
+  }));
+  if (truncated) usedTokens = estimateTokens(passages[0].text);
+
+  return {
+    context: passages.map((p) => p.text).join('\n[...]\n'),
+    passages,
+    stats: {
+      retrieved: true,
+      passageCount: index.passages.length,
+      selected: passages.length,
+      estimatedTokens: usedTokens,
+      truncated,
+      buildMs: Number(buildMs.toFixed(2)),
+      queryMs: Number(queryMs.toFixed(2)),
+      cachedIndex: cached
+    }
+  };
+};
@@ -0,0 +1,44 @@
+/**
+ * Collapses concurrent calls that share a key onto one in-flight promise.
+ * Settled promises are dropped immediately, so errors reach every waiter of
+ * that flight but are never replayed to later callers.
+ */
+export const createSingleFlight = ({ enabled = true } = {}) => {
+  const inflight = new Map();
+  const counters = { calls: 0, executed: 0, deduplicated: 0, errors: 0 };
+
+  const run = (key, fn) => {
+    counters.calls += 1;
+    if (!enabled) {
+      counters.executed += 1;
+      return fn();
+    }
+
+    const existing = inflight.get(key);
+    if (existing) {
+      counters.deduplicated += 1;
+      return existing;
+    }
+
+    counters.executed += 1;
+    const promise = Promise.resolve()
+      .then(fn)
+      .catch((error) => {
+        counters.errors += 1;
+        throw error;
+      })
+      .finally(() => {
+        inflight.delete(key);
+      });
+    inflight.set(key, promise);
+    return promise;
+  };
+
+  const stats = () => ({
+    enabled,
+    inflight: inflight.size,
+    ...counters
+  });
+
+  return { run, stats };
+};
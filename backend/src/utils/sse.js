@@ -0,0 +1,74 @@
+const truthy = (value) => ['1', 'true', 'yes'].includes(String(value || '').toLowerCase());
+
+export const wantsEventStream = (req) =>
+  truthy(req.query?.stream) ||
+  String(req.headers.accept || '').toLowerCase().includes('text/event-stream');
+
+const isEventStream = (res) => String(res.getHeader('Content-Type') || '').startsWith('text/event-stream');
+
+/**
+ * Ends a response whose headers are already sent. An open event stream gets an
+ * `error` event first, so clients can tell a failure from a finished stream.
+ */
+export const endWithError = (res, error) => {
+  if (isEventStream(res) && !res.writableEnded) {
+    const payload = { message: error?.message || 'Internal Server Error', statusCode: error?.statusCode || 500 };
+    res.write(`event: error\ndata: ${JSON.stringify(payload)}\n\n`);
+  }
+  if (!res.writableEnded) res.end();
+};
+
+/**
+ * Opens a Server-Sent Events response. `token` events carry model deltas as
+ * they arrive; the final event carries the same payload the JSON API returns.
+ */
+export const createEventStream = (res) => {
+  res.status(200);
+  res.set({
+    'Content-Type': 'text/event-stream; charset=utf-8',
+    'Cache-Control': 'no-cache, no-transform',
+    Connection: 'keep-alive',
+    'X-Accel-Buffering': 'no'
+  });
+  res.flushHeaders();
+
+  let closed = false;
+  res.on('close', () => {
+    closed = true;
+  });
+
+  const send = (event, data) => {
+    if (closed) return;
+    res.write(`event: ${event}\ndata: ${JSON.stringify(data)}\n\n`);
+  };
+
+  return {
+    get closed() {
+      return closed;
+    },
+    send,
+    // Forwards each delta as a `token` event and resolves with the full text.
+    pipeTokens: async (tokens) => {
+      let text = '';
+      for await (const token of tokens) {
+        if (closed) break;
+        text += token;
+        send('token', { text: token });
+      }
+      return text;
+    },
+    // Post-processing may append to the model output; streams that tail so the
+    // (trimmed) tokens add up to `text`. Returns false if `text` replaces them.
+    extend: (streamed, text) => {
+      const head = streamed.trim();
+      if (!text.startsWith(head)) return false;
+      if (text.length > head.length) send('token', { text: text.slice(head.length) });
+      return true;
+    },
+    end: (event, data) => {
+      send(event, data);
+      if (!closed) res.end();
+    },
+    fail: (error) => endWithError(res, error)
+  };
+};
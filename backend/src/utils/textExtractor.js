@@ -1,61 +1,40 @@
-import mammoth from 'mammoth';
-import { PDFDocument } from 'pdf-lib';
-import * as pdfjsLib from 'pdfjs-dist/legacy/build/pdf.mjs';
-
-const standardFontDataUrl = new URL(
-  '../../node_modules/pdfjs-dist/standard_fonts/',
-  import.meta.url
-).href;
-
-const workerSrc = new URL(
-  '../../node_modules/pdfjs-dist/legacy/build/pdf.worker.mjs',
-  import.meta.url
-).href;
-
-pdfjsLib.GlobalWorkerOptions.workerSrc = workerSrc;
-
-function toUint8Array(input) {
-  if (input instanceof Uint8Array && !(input instanceof Buffer)) {
-    return input;
-  }
-
-  if (Buffer.isBuffer(input)) {
-    return new Uint8Array(
-      input.buffer,
-      input.byteOffset,
-      input.byteLength
-    );
-  }
-
-  if (input instanceof ArrayBuffer) {
-    return new Uint8Array(input);
-  }
-
-  throw new Error(`Unsupported buffer type: ${input?.constructor?.name}`);
-}
-
-async function getPdfMetadata(buffer) {
-  try {
-    const pdfDoc = await PDFDocument.load(buffer, { ignoreEncryption: true });
-    return {
-      pageCount: pdfDoc.getPageCount(),
-      title: pdfDoc.getTitle?.() || null,
-      author: pdfDoc.getAuthor?.() || null,
-      subject: pdfDoc.getSubject?.() || null,
-      keywords: pdfDoc.getKeywords?.() || null,
-      producer: pdfDoc.getProducer?.() || null,
-      createdAt: pdfDoc.getCreationDate
-        ? pdfDoc.getCreationDate()?.toISOString?.() || null
-        : null,
-      modifiedAt: pdfDoc.getModificationDate
-        ? pdfDoc.getModificationDate()?.toISOString?.() || null
-        : null
-    };
-  } catch (error) {
-    
-    return null;
-  }
-}
+import fs from 'fs/promises';
+import { createDocumentStore, fingerprintBuffer } from './documentStore.js';
+import { createWorkerPool, defaultPoolSize } from './workerPool.js';
+import { recordSpan, startSpan } from './metrics.js';
+import { workerShare } from './clusterBus.js';
+
+const WORD_MIME_TYPES = [
+  'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+  'application/msword'
+];
+
+const MAX_PDF_PAGES = Number(process.env.EXTRACTION_MAX_PAGES || 300);
+const extractionWorkers = process.env.EXTRACTION_WORKERS?.trim()
+  ? Number(process.env.EXTRACTION_WORKERS)
+  : workerShare(defaultPoolSize());
+
+// EXTRACTION_WORKERS=0 keeps parsing on the main thread (handy when debugging).
+const extractionPool = extractionWorkers > 0
+  ? createWorkerPool({
+      workerUrl: new URL('../workers/extractionWorker.js', import.meta.url),
+      size: extractionWorkers,
+      maxQueue: Number(process.env.EXTRACTION_QUEUE_LIMIT || 64),
+      jobTimeoutMs: Number(process.env.EXTRACTION_TIMEOUT_MS || 30000),
+      name: 'Document extraction'
+    })
+  : null;
+
+export const getExtractionPoolStats = () => (extractionPool ? extractionPool.stats() : null);
+
+const documentStore = createDocumentStore({
+  maxBytes: Number(process.env.DOCUMENT_CACHE_MAX_BYTES || 64 * 1024 * 1024),
+  persistDir: process.env.DOCUMENT_CACHE_DIR?.trim() || null,
+  persistMaxBytes: Number(process.env.DOCUMENT_CACHE_DIR_MAX_BYTES || 256 * 1024 * 1024),
+  persistTtlMs: Number(process.env.DOCUMENT_CACHE_TTL_MS || 24 * 60 * 60 * 1000)
+});
+
+export const getDocumentCacheStats = () => documentStore.stats();
 
 export function validateFile(file, maxSizeMB = 5) {
   if (!file) {
@@ -80,68 +59,31 @@ export function validateFile(file, maxSizeMB = 5) {
   return { valid: true };
 }
 
-async function extractTextFromPdf(buffer) {
-  try {
-    
-
-    const uint8Array = toUint8Array(buffer);
-    const loadingTask = pdfjsLib.getDocument({
-      data: uint8Array,
-      useSystemFonts: true,
-      standardFontDataUrl
-    });
-
-    const pdf = await loadingTask.promise;
-    
-
-    const pageTexts = [];
-
-    for (let pageNum = 1; pageNum <= pdf.numPages; pageNum++) {
-      const page = await pdf.getPage(pageNum);
-      const textContent = await page.getTextContent();
-
-      const text = textContent.items
-        .map((item) => {
-          if (typeof item === 'string') return item;
-          if (item.str) return item.str;
-          return '';
-        })
-        .join(' ')
-        .replace(/\s+/g, ' ')
-        .trim();
-
-      if (text.length > 0) {
-        pageTexts.push(text);
-      }
-    }
-
-    const combinedText = pageTexts.join('\n\n').trim();
-
-    const metadata = await getPdfMetadata(buffer);
-    if (metadata) {
-      
-    }
-
-    if (!combinedText) {
-      const fallbackNote = 'No extractable text found in PDF. The document may be image-based (scanned) or uses embedded fonts that prevent text extraction.';
-      const metaText = metadata
-        ? `Pages: ${metadata.pageCount || 'N/A'}; Title: ${metadata.title || 'N/A'}; Author: ${metadata.author || 'N/A'}`
-        : 'Metadata unavailable';
-      const safeSummary = `\n[Extraction Notice] ${fallbackNote}\n[Metadata] ${metaText}`;
-      
-      return safeSummary;
-    }
+// Hand the bytes to the worker without copying when the Buffer owns its whole
+// ArrayBuffer; small Buffers live in Node's shared pool and must be copied.
+function toTransferable(buffer) {
+  if (buffer.byteOffset === 0 && buffer.byteLength === buffer.buffer.byteLength) {
+    return buffer.buffer;
+  }
+  return buffer.buffer.slice(buffer.byteOffset, buffer.byteOffset + buffer.byteLength);
+}
 
-    
-    return combinedText;
-  } catch (error) {
-    console.error('[ERROR] PDF extraction error:', error);
-    throw new Error(`PDF extraction failed: ${error.message}`);
+// `source` is `{ buffer }` or `{ path }` for an upload spooled to disk; a path
+// is read inside the worker so the bytes never pass through the main thread.
+async function parseBinaryOffThread({ buffer, path }, mimetype) {
+  if (!extractionPool) {
+    const { parseBinaryDocument } = await import('./documentParsers.js');
+    return parseBinaryDocument(buffer ?? await fs.readFile(path), mimetype, { maxPages: MAX_PDF_PAGES });
   }
+  if (path) {
+    return extractionPool.run({ path, mimetype, maxPages: MAX_PDF_PAGES });
+  }
+  const data = toTransferable(buffer);
+  return extractionPool.run({ data, mimetype, maxPages: MAX_PDF_PAGES }, [data]);
 }
 
-export async function extractTextFromFile(buffer, mimetype) {
-  if (!buffer) {
+async function parseDocument(source, mimetype) {
+  if (!source.buffer && !source.path) {
     throw new Error('File buffer is empty.');
   }
 
@@ -149,30 +91,24 @@ export async function extractTextFromFile(buffer, mimetype) {
     throw new Error('MIME type is required.');
   }
 
-  
-
   try {
     let extractedText = '';
-
-    if (mimetype === 'application/pdf') {
-      
-      extractedText = await extractTextFromPdf(buffer);
-    } else if (
-      mimetype === 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-    ) {
-      
-      const result = await mammoth.extractRawText({ buffer });
-      extractedText = result.value;
-      
-    } else if (mimetype === 'application/msword') {
-      
-      const result = await mammoth.extractRawText({ buffer });
-      extractedText = result.value;
-      
+    let metadata = null;
+
+    if (mimetype === 'application/pdf' || WORD_MIME_TYPES.includes(mimetype)) {
+      const endSpan = startSpan('extract.binary');
+      let timings;
+      try {
+        ({ text: extractedText, metadata, timings } = await parseBinaryOffThread(source, mimetype));
+      } finally {
+        endSpan();
+      }
+      // Parser stages measured inside the worker; extract.binary minus these is pool wait and transfer.
+      for (const [name, ms] of Object.entries(timings || {})) recordSpan(name, ms);
     } else if (mimetype === 'text/plain') {
-      
-      extractedText = buffer.toString('utf-8');
-      
+      const endSpan = startSpan('extract.text');
+      extractedText = source.buffer ? source.buffer.toString('utf-8') : await fs.readFile(source.path, 'utf-8');
+      endSpan();
     } else {
       throw new Error(`Unsupported MIME type: ${mimetype}`);
     }
@@ -180,13 +116,73 @@ export async function extractTextFromFile(buffer, mimetype) {
     if (!extractedText || extractedText.trim().length === 0) {
       const fallbackText = 'No extractable text found. The file might be empty, corrupted, or image-based. Please upload a text-based PDF/DOC/DOCX/TXT.';
       
-      return fallbackText;
+      return { text: fallbackText, metadata };
     }
 
     
-    return extractedText.trim();
+    return { text: extractedText.trim(), metadata };
   } catch (error) {
     console.error('[ERROR] File extraction failed:', error.message);
+    if (error.statusCode) {
+      // Pool saturation and timeouts are not the caller's fault; keep their status.
+      throw error;
+    }
     throw new Error(`Failed to extract text: ${error.message}`);
   }
-}
\ No newline at end of file
+}
+
+/**
+ * Extracts text and metadata, keyed by the SHA-256 of the file contents so
+ * re-uploads of the same file skip parsing. The returned `documentId` can be
+ * sent back by clients instead of the file.
+ *
+ * PDF/DOCX bytes are transferred to the extraction pool, so `buffer` may be
+ * detached afterwards; read anything else you need from it first.
+ */
+export async function extractDocument(buffer, mimetype, { name = null } = {}) {
+  if (!buffer) {
+    throw new Error('File buffer is empty.');
+  }
+
+  return extractWithCache({ buffer }, fingerprintBuffer(buffer), buffer.length, mimetype, name);
+}
+
+/**
+ * extractDocument for a multer file from either storage mode. Spooled uploads
+ * were hashed while streaming to disk, so a cache hit never reads the file.
+ */
+export async function extractUploadedFile(file) {
+  if (!file?.path) {
+    return extractDocument(file?.buffer, file?.mimetype, { name: file?.originalname ?? null });
+  }
+  const documentId = file.sha256 || fingerprintBuffer(await fs.readFile(file.path));
+  return extractWithCache({ path: file.path }, documentId, file.size, file.mimetype, file.originalname ?? null);
+}
+
+async function extractWithCache(source, documentId, size, mimetype, name) {
+  const cached = await documentStore.get(documentId);
+  if (cached && cached.mimetype === mimetype) {
+    return { ...cached, cached: true };
+  }
+
+  const { text, metadata } = await parseDocument(source, mimetype);
+  const record = await documentStore.set({
+    documentId,
+    text,
+    metadata,
+    mimetype,
+    name,
+    size,
+    createdAt: new Date().toISOString()
+  });
+  return { ...record, cached: false };
+}
+
+export async function getStoredDocument(documentId) {
+  return documentStore.get(documentId);
+}
+
+export async function extractTextFromFile(buffer, mimetype) {
+  const { text } = await extractDocument(buffer, mimetype);
+  return text;
+}
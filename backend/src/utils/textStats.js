@@ -0,0 +1,119 @@
+import crypto from 'crypto';
+
+const MEMO_SIZE = 64;
+const KEYWORD_LIMIT = 5;
+// Keyed by digest so the memo holds small stats objects, not the documents themselves.
+const memo = new Map();
+
+// Same set of code points as the regex class \s.
+const isWhitespace = (code) =>
+  (code >= 9 && code <= 13) ||
+  code === 32 ||
+  code === 160 ||
+  code === 5760 ||
+  (code >= 8192 && code <= 8202) ||
+  code === 8232 ||
+  code === 8233 ||
+  code === 8239 ||
+  code === 8287 ||
+  code === 12288 ||
+  code === 65279;
+
+const isSentenceEnd = (code) => code === 46 || code === 33 || code === 63; // . ! ?
+
+const isAlphanumeric = (code) =>
+  (code >= 48 && code <= 57) || (code >= 65 && code <= 90) || (code >= 97 && code <= 122);
+
+/**
+ * Computes word/sentence counts, vocabulary and readability figures in one
+ * linear scan. Counting rules match the regex splits previously used at each
+ * call site: words are runs of non-whitespace, sentences are non-blank
+ * segments between runs of . ! ?, and `keywords` are the first five
+ * lowercase [a-z0-9] runs longer than four characters, repeats included.
+ */
+export const computeTextStats = (text = '') => {
+  const source = String(text);
+  const uniqueWords = new Set();
+  const keywords = [];
+
+  let wordCount = 0;
+  let sentenceCount = 0;
+  let nonWhitespaceChars = 0;
+  let wordStart = -1;
+  let termStart = -1;
+  let segmentHasContent = false;
+
+  const closeWord = (end) => {
+    wordCount += 1;
+    uniqueWords.add(source.slice(wordStart, end).toLowerCase());
+    wordStart = -1;
+  };
+
+  const closeTerm = (end) => {
+    if (end - termStart > 4 && keywords.length < KEYWORD_LIMIT) {
+      keywords.push(source.slice(termStart, end).toLowerCase());
+    }
+    termStart = -1;
+  };
+
+  for (let i = 0; i < source.length; i++) {
+    const code = source.charCodeAt(i);
+
+    if (isWhitespace(code)) {
+      if (wordStart !== -1) closeWord(i);
+    } else {
+      nonWhitespaceChars += 1;
+      if (wordStart === -1) wordStart = i;
+    }
+
+    if (isAlphanumeric(code)) {
+      if (termStart === -1) termStart = i;
+    } else if (termStart !== -1) {
+      closeTerm(i);
+    }
+
+    if (isSentenceEnd(code)) {
+      if (segmentHasContent) sentenceCount += 1;
+      segmentHasContent = false;
+    } else if (!isWhitespace(code)) {
+      segmentHasContent = true;
+    }
+  }
+
+  if (wordStart !== -1) closeWord(source.length);
+  if (termStart !== -1) closeTerm(source.length);
+  if (segmentHasContent) sentenceCount += 1;
+
+  const avgWordLength = wordCount === 0 ? 0 : nonWhitespaceChars / wordCount;
+  const avgSentenceLength = sentenceCount === 0 ? wordCount : wordCount / sentenceCount;
+
+  return {
+    charCount: source.length,
+    nonWhitespaceChars,
+    wordCount,
+    sentenceCount,
+    uniqueWordCount: uniqueWords.size,
+    uniqueWordRatio: wordCount === 0 ? 0 : uniqueWords.size / wordCount,
+    avgWordLength,
+    avgSentenceLength,
+    readabilityScore: Math.min(100, Math.max(0, Math.round((100 - avgSentenceLength * 2) + (avgWordLength * 5)))),
+    keywords
+  };
+};
+
+/**
+ * Memoized computeTextStats. Controllers and huggingface.js helpers call it
+ * on the same input during one request, so only the first call scans.
+ */
+export const getTextStats = (text = '') => {
+  const source = String(text);
+  const key = crypto.createHash('sha1').update(source).digest('base64');
+  const cached = memo.get(key);
+  if (cached) return cached;
+  const stats = computeTextStats(source);
+  memo.set(key, stats);
+  if (memo.size > MEMO_SIZE) memo.delete(memo.keys().next().value);
+  return stats;
+};
+
+export const countWords = (text = '') => getTextStats(text).wordCount;
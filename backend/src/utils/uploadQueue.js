@@ -0,0 +1,322 @@
+import crypto from 'crypto';
+import fs from 'fs/promises';
+import path from 'path';
+import { fileURLToPath } from 'url';
+import { backoffDelay } from './inferenceGateway.js';
+import { uploadToCloudinary } from './cloudinary.js';
+
+const UPLOAD_ID_PATTERN = /^[a-f0-9-]{36}$/;
+
+export const isValidUploadId = (uploadId) =>
+  typeof uploadId === 'string' && UPLOAD_ID_PATTERN.test(uploadId);
+
+// Under the app directory rather than os.tmpdir(), which is often tmpfs and
+// cleared on restart; mount it as a volume when running in a container.
+export const DEFAULT_UPLOAD_QUEUE_DIR = fileURLToPath(new URL('../../data/upload-queue', import.meta.url));
+
+const writeJsonAtomic = async (target, value) => {
+  const tmp = `${target}.${process.pid}.tmp`;
+  await fs.writeFile(tmp, JSON.stringify(value));
+  await fs.rename(tmp, target);
+};
+
+// The queue keeps its own hard link (or copy) because the request's spooled file is deleted after the response.
+const stageFile = async (source, target) => {
+  try {
+    if (!source.path) {
+      await fs.writeFile(target, source.buffer);
+      return;
+    }
+    try {
+      await fs.link(source.path, target);
+    } catch (error) {
+      if (error.code !== 'EXDEV' && error.code !== 'EPERM') throw error;
+      await fs.copyFile(source.path, target);
+    }
+  } catch (error) {
+    await fs.unlink(target).catch(() => {});
+    throw error;
+  }
+};
+
+const publicView = (job) => ({
+  id: job.id,
+  status: job.status,
+  attempts: job.attempts,
+  name: job.name,
+  size: job.size,
+  folder: job.folder,
+  url: job.result?.secure_url || null,
+  cloudinaryId: job.result?.public_id || null,
+  error: job.error,
+  createdAt: job.createdAt,
+  updatedAt: job.updatedAt
+});
+
+/**
+ * Bounded background queue that archives uploads without holding up the
+ * request. Each job is a `<id>.json` record plus a payload file in
+ * `spoolDir`, so queued uploads survive restarts. The payload is named
+ * `<id>.<instance>.bin` after the queue instance that owns it, a random id
+ * per process start (PIDs repeat across container restarts). Every instance
+ * touches `owners/<instance>` each `heartbeatMs`; payloads whose owner has not
+ * done so for `ownerStaleMs` are claimed with an atomic rename, which keeps
+ * cluster workers sharing the directory from uploading the same file twice.
+ */
+export const createUploadQueue = ({
+  spoolDir,
+  upload,
+  concurrency = 2,
+  maxQueue = 100,
+  maxAttempts = 5,
+  retryBaseMs = 1000,
+  retryMaxMs = 60000,
+  statusTtlMs = 24 * 60 * 60 * 1000,
+  heartbeatMs = 10000,
+  ownerStaleMs = 3 * heartbeatMs
+}) => {
+  const instanceId = crypto.randomUUID();
+  const jobs = new Map();
+  const counters = { enqueued: 0, succeeded: 0, failed: 0, retries: 0, rejected: 0, restored: 0 };
+  let active = 0;
+  let timer = null;
+  let ready = null;
+
+  const ownersDir = path.join(spoolDir, 'owners');
+  const recordPath = (id) => path.join(spoolDir, `${id}.json`);
+  const payloadPath = (id, owner = instanceId) => path.join(spoolDir, `${id}.${owner}.bin`);
+
+  const pending = () => [...jobs.values()].filter((job) => job.status === 'queued' || job.status === 'uploading');
+
+  const persist = async (job) => {
+    job.updatedAt = new Date().toISOString();
+    try {
+      await writeJsonAtomic(recordPath(job.id), job);
+    } catch (error) {
+      console.error('[WARN] Upload queue could not persist job:', error.message);
+    }
+  };
+
+  // Finished jobs leave memory; their record stays on disk for status lookups.
+  const finish = async (job) => {
+    jobs.delete(job.id);
+    await fs.unlink(payloadPath(job.id)).catch(() => {});
+    await persist(job);
+  };
+
+  const runJob = async (job) => {
+    active += 1;
+    job.status = 'uploading';
+    job.attempts += 1;
+    await persist(job);
+    try {
+      job.result = await upload(payloadPath(job.id), job);
+      job.status = 'done';
+      job.error = null;
+      counters.succeeded += 1;
+      await finish(job);
+    } catch (error) {
+      job.error = error.message || String(error);
+      if (job.attempts >= maxAttempts) {
+        job.status = 'failed';
+        counters.failed += 1;
+        console.error(`[ERROR] Upload ${job.id} failed after ${job.attempts} attempts:`, job.error);
+        await finish(job);
+      } else {
+        job.status = 'queued';
+        job.nextAttemptAt = Date.now() + backoffDelay(job.attempts, { baseMs: retryBaseMs, maxMs: retryMaxMs });
+        counters.retries += 1;
+        await persist(job);
+      }
+    } finally {
+      active -= 1;
+      pump();
+    }
+  };
+
+  // Starts due jobs up to the concurrency limit and wakes up again for the next retry.
+  const pump = () => {
+    clearTimeout(timer);
+    timer = null;
+    const now = Date.now();
+    const queued = pending()
+      .filter((job) => job.status === 'queued')
+      .sort((a, b) => a.nextAttemptAt - b.nextAttemptAt);
+    for (const job of queued) {
+      if (active >= concurrency) return;
+      if (job.nextAttemptAt > now) {
+        timer = setTimeout(pump, job.nextAttemptAt - now);
+        timer.unref();
+        return;
+      }
+      runJob(job);
+    }
+  };
+
+  const heartbeat = async () => {
+    const target = path.join(ownersDir, instanceId);
+    const now = new Date();
+    await fs.utimes(target, now, now).catch(() => fs.writeFile(target, ''));
+  };
+
+  const isOwnerAlive = async (owner) => {
+    const { mtimeMs } = await fs.stat(path.join(ownersDir, owner)).catch(() => ({ mtimeMs: 0 }));
+    return Date.now() - mtimeMs < ownerStaleMs;
+  };
+
+  // Takes over payloads left by instances that stopped heartbeating (crashed or restarted).
+  const claimOrphans = async () => {
+    const names = await fs.readdir(spoolDir);
+    const owners = new Map();
+
+    for (const name of names) {
+      const match = /^([a-f0-9-]{36})\.([a-f0-9-]{36})\.bin$/.exec(name);
+      if (!match) continue;
+      const [, id, owner] = match;
+      if (owner === instanceId) continue;
+      if (!owners.has(owner)) owners.set(owner, await isOwnerAlive(owner));
+      if (owners.get(owner)) continue;
+      try {
+        await fs.rename(path.join(spoolDir, name), payloadPath(id));
+        const job = JSON.parse(await fs.readFile(recordPath(id), 'utf-8'));
+        if (job.status === 'done' || job.status === 'failed') {
+          // Crashed between finishing and removing the payload.
+          await fs.unlink(payloadPath(id)).catch(() => {});
+          continue;
+        }
+        job.status = 'queued';
+        job.nextAttemptAt = Date.now();
+        jobs.set(id, job);
+        counters.restored += 1;
+      } catch (error) {
+        // Another worker claimed it first, or the record is gone.
+        if (error.code !== 'ENOENT') console.error('[WARN] Could not restore upload job:', error.message);
+      }
+    }
+
+    for (const owner of await fs.readdir(ownersDir)) {
+      if (owner !== instanceId && !(await isOwnerAlive(owner))) {
+        await fs.unlink(path.join(ownersDir, owner)).catch(() => {});
+      }
+    }
+    pump();
+    return names;
+  };
+
+  // Finished records only serve status lookups; drop them once they expire.
+  const pruneRecords = async (names) => {
+    const cutoff = Date.now() - statusTtlMs;
+    for (const name of names) {
+      if (!name.endsWith('.json')) continue;
+      const target = path.join(spoolDir, name);
+      const { mtimeMs } = await fs.stat(target).catch(() => ({ mtimeMs: Infinity }));
+      if (mtimeMs < cutoff && !jobs.has(name.slice(0, -5))) await fs.unlink(target).catch(() => {});
+    }
+  };
+
+  const restore = async () => {
+    await fs.mkdir(ownersDir, { recursive: true });
+    await heartbeat();
+    const names = await claimOrphans();
+
+    // Owners that crashed after this scan are picked up once their heartbeat goes stale.
+    const beat = setInterval(() => {
+      heartbeat()
+        .then(claimOrphans)
+        .then(pruneRecords)
+        .catch((error) => console.error('[WARN] Upload queue heartbeat failed:', error.message));
+    }, heartbeatMs);
+    beat.unref();
+
+    await pruneRecords(names);
+    pump();
+  };
+
+  const init = () => {
+    if (!ready) {
+      ready = restore().catch((error) => {
+        console.error('[WARN] Upload queue restore failed:', error.message);
+      });
+    }
+    return ready;
+  };
+
+  /**
+   * Stages a multer file (spooled `path` or in-memory `buffer`) and queues
+   * it. Resolves with the job's public view, or null when the queue is full.
+   * An in-memory buffer is copied before the first await: extraction runs
+   * alongside and may transfer the original's ArrayBuffer to a worker thread.
+   */
+  const enqueue = async (file, { folder, resourceType }) => {
+    const source = file.path ? { path: file.path } : { buffer: Buffer.from(file.buffer) };
+    await init();
+    if (pending().length >= maxQueue) {
+      counters.rejected += 1;
+      return null;
+    }
+    const id = crypto.randomUUID();
+    const now = new Date().toISOString();
+    const job = {
+      id,
+      status: 'queued',
+      attempts: 0,
+      nextAttemptAt: Date.now(),
+      name: file.originalname ?? null,
+      mimetype: file.mimetype,
+      size: file.size,
+      folder,
+      resourceType,
+      result: null,
+      error: null,
+      createdAt: now,
+      updatedAt: now
+    };
+    await stageFile(source, payloadPath(id));
+    jobs.set(id, job);
+    counters.enqueued += 1;
+    await persist(job);
+    pump();
+    return publicView(job);
+  };
+
+  // Jobs owned by another process (cluster workers share spoolDir) are read from disk.
+  const status = async (id) => {
+    if (!isValidUploadId(id)) return null;
+    const job = jobs.get(id);
+    if (job) return publicView(job);
+    try {
+      return publicView(JSON.parse(await fs.readFile(recordPath(id), 'utf-8')));
+    } catch {
+      return null;
+    }
+  };
+
+  const stats = () => {
+    const current = pending();
+    return {
+      instance: instanceId,
+      queued: current.filter((job) => job.status === 'queued').length,
+      active,
+      concurrency,
+      maxQueue,
+      ...counters
+    };
+  };
+
+  return { enqueue, status, stats, init };
+};
+
+const archiveQueue = createUploadQueue({
+  spoolDir: process.env.UPLOAD_QUEUE_DIR?.trim() || DEFAULT_UPLOAD_QUEUE_DIR,
+  upload: (payload, job) => uploadToCloudinary(payload, job.folder, job.resourceType),
+  concurrency: Number(process.env.UPLOAD_QUEUE_CONCURRENCY || 2),
+  maxQueue: Number(process.env.UPLOAD_QUEUE_LIMIT || 100),
+  maxAttempts: Number(process.env.UPLOAD_MAX_ATTEMPTS || 5),
+  retryBaseMs: Number(process.env.UPLOAD_RETRY_BASE_MS || 1000),
+  retryMaxMs: Number(process.env.UPLOAD_RETRY_MAX_MS || 60000)
+});
+
+export const enqueueArchiveUpload = (file, options) => archiveQueue.enqueue(file, options);
+export const getArchiveUploadStatus = (id) => archiveQueue.status(id);
+export const getArchiveQueueStats = () => archiveQueue.stats();
+export const initArchiveQueue = () => archiveQueue.init();
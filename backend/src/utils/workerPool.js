@@ -0,0 +1,158 @@
+import { Worker } from 'worker_threads';
+import os from 'os';
+import ApiError from './ApiError.js';
+
+const LATENCY_SAMPLE_SIZE = 200;
+
+export const defaultPoolSize = () =>
+  Math.max(1, typeof os.availableParallelism === 'function' ? os.availableParallelism() : os.cpus().length);
+
+const percentile = (samples, p) => {
+  if (samples.length === 0) return 0;
+  const sorted = [...samples].sort((a, b) => a - b);
+  return sorted[Math.min(sorted.length - 1, Math.floor((p / 100) * sorted.length))];
+};
+
+/**
+ * Fixed-size worker_threads pool with a bounded FIFO queue. Each job gets
+ * its own timeout; a worker that overruns is terminated and replaced so a
+ * pathological document cannot wedge the pool.
+ */
+export const createWorkerPool = ({
+  workerUrl,
+  size = defaultPoolSize(),
+  maxQueue = 64,
+  jobTimeoutMs = 30000,
+  name = 'worker-pool'
+}) => {
+  const idle = [];
+  const workers = new Set();
+  const queue = [];
+  const waitSamples = [];
+  const runSamples = [];
+  const counters = { completed: 0, failed: 0, timedOut: 0, rejected: 0 };
+  let nextJobId = 1;
+  let closed = false;
+
+  const recordSample = (samples, value) => {
+    samples.push(value);
+    if (samples.length > LATENCY_SAMPLE_SIZE) samples.shift();
+  };
+
+  const spawn = () => {
+    const worker = new Worker(workerUrl);
+    worker.unref();
+    worker.currentJob = null;
+
+    worker.on('message', ({ id, result, error }) => {
+      const job = worker.currentJob;
+      if (!job || job.id !== id) return;
+      finish(worker, job);
+      if (error) {
+        counters.failed += 1;
+        job.reject(new Error(error));
+      } else {
+        counters.completed += 1;
+        job.resolve(result);
+      }
+    });
+
+    worker.on('error', (err) => {
+      const job = worker.currentJob;
+      if (job) {
+        worker.currentJob = null;
+        clearTimeout(job.timer);
+        counters.failed += 1;
+        job.reject(err);
+      }
+    });
+
+    worker.on('exit', (code) => {
+      const job = worker.currentJob;
+      if (job) {
+        worker.currentJob = null;
+        clearTimeout(job.timer);
+        counters.failed += 1;
+        job.reject(new Error(`${name} worker exited with code ${code}`));
+      }
+      workers.delete(worker);
+      const index = idle.indexOf(worker);
+      if (index !== -1) idle.splice(index, 1);
+      // Replace lazily so a worker that cannot even load does not respawn in a loop.
+      if (queue.length > 0) {
+        ensureCapacity();
+        drain();
+      }
+    });
+
+    workers.add(worker);
+    return worker;
+  };
+
+  const finish = (worker, job) => {
+    clearTimeout(job.timer);
+    recordSample(runSamples, Date.now() - job.startedAt);
+    worker.currentJob = null;
+    idle.push(worker);
+    drain();
+  };
+
+  const dispatch = (worker, job) => {
+    job.startedAt = Date.now();
+    recordSample(waitSamples, job.startedAt - job.enqueuedAt);
+    worker.currentJob = job;
+    job.timer = setTimeout(() => {
+      if (worker.currentJob !== job) return;
+      worker.currentJob = null;
+      counters.timedOut += 1;
+      job.reject(new ApiError(504, `${name} job exceeded ${jobTimeoutMs}ms`));
+      worker.terminate();
+    }, jobTimeoutMs);
+    worker.postMessage({ id: job.id, payload: job.payload }, job.transferList);
+  };
+
+  const drain = () => {
+    while (idle.length > 0 && queue.length > 0) {
+      dispatch(idle.pop(), queue.shift());
+    }
+  };
+
+  const ensureCapacity = () => {
+    if (closed) return;
+    while (workers.size < size) idle.push(spawn());
+  };
+
+  const run = (payload, transferList = []) => {
+    if (closed) {
+      return Promise.reject(new ApiError(503, `${name} is shut down`));
+    }
+    ensureCapacity();
+    if (idle.length === 0 && queue.length >= maxQueue) {
+      counters.rejected += 1;
+      return Promise.reject(new ApiError(503, `${name} is busy, please retry shortly`));
+    }
+    return new Promise((resolve, reject) => {
+      queue.push({ id: nextJobId++, payload, transferList, resolve, reject, enqueuedAt: Date.now() });
+      drain();
+    });
+  };
+
+  const stats = () => ({
+    size,
+    workers: workers.size,
+    busy: workers.size - idle.length,
+    queueDepth: queue.length,
+    maxQueue,
+    ...counters,
+    waitMs: { p50: percentile(waitSamples, 50), p95: percentile(waitSamples, 95) },
+    runMs: { p50: percentile(runSamples, 50), p95: percentile(runSamples, 95) }
+  });
+
+  const close = async () => {
+    closed = true;
+    queue.splice(0).forEach((job) => job.reject(new ApiError(503, `${name} is shut down`)));
+    await Promise.all([...workers].map((worker) => worker.terminate()));
+  };
+
+  return { run, stats, close };
+};
@@ -0,0 +1,14 @@
+import { readFile } from 'fs/promises';
+import { parentPort } from 'worker_threads';
+import { parseBinaryDocument } from '../utils/documentParsers.js';
+
+parentPort.on('message', async ({ id, payload }) => {
+  const { data, path, mimetype, maxPages } = payload;
+  try {
+    // Uploads spooled to disk are read here rather than copied over from the main thread.
+    const result = await parseBinaryDocument(path ? await readFile(path) : data, mimetype, { maxPages });
+    parentPort.postMessage({ id, result });
+  } catch (error) {
+    parentPort.postMessage({ id, error: error.message });
+  }
+});
@@ -0,0 +1,47 @@
+"""Python client for the AI Content & Utility Suite backend.
+
+:class:`Client` is the blocking client and :class:`AsyncClient` its asyncio
+counterpart; both pool keep-alive connections, retry rejected or dropped
+requests, and return the typed models from :mod:`ai_suite_client.models`.
+"""
+from .aio import AsyncClient
+from .client import DEFAULT_BASE_URL, Client
+from .errors import ApiError, ClientError, JobFailedError, TransportError
+from .models import (
+    Article,
+    AssistantAnswer,
+    BatchResult,
+    Detection,
+    Job,
+    Quotes,
+    ResumeAnalysis,
+    Rewrite,
+    Sentiment,
+    TicketClassification,
+    Titles,
+    Upload,
+)
+
+__version__ = "0.1.0"
+
+__all__ = [
+    "DEFAULT_BASE_URL",
+    "ApiError",
+    "Article",
+    "AssistantAnswer",
+    "AsyncClient",
+    "BatchResult",
+    "Client",
+    "ClientError",
+    "Detection",
+    "Job",
+    "JobFailedError",
+    "Quotes",
+    "ResumeAnalysis",
+    "Rewrite",
+    "Sentiment",
+    "TicketClassification",
+    "Titles",
+    "TransportError",
+    "Upload",
+]
@@ -0,0 +1,308 @@
+"""Pooled HTTP transport shared by the sync and async clients."""
+import io
+import json
+import mimetypes
+import os
+import random
+import threading
+import time
+import uuid
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError
+
+from .errors import ApiError, TransportError
+
+# 503 is what the backend sheds load with (inference gateway, job queue);
+# those requests were rejected before doing any work, so resending is safe.
+RETRY_STATUSES = frozenset({429, 503})
+# A proxy's 502/504 or a connection dropped mid-request says nothing about
+# whether the backend ran the request, so those are retried only when
+# resending is known to be harmless.
+IDEMPOTENT_RETRY_STATUSES = frozenset({502, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+CHUNK_SIZE = 64 * 1024
+
+# The upload routes validate the declared type, so common extensions are mapped explicitly.
+CONTENT_TYPES = {
+    ".pdf": "application/pdf",
+    ".doc": "application/msword",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".txt": "text/plain",
+}
+
+
+def guess_content_type(filename):
+    extension = os.path.splitext(filename)[1].lower()
+    return CONTENT_TYPES.get(extension) or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+
+class FilePart:
+    """An upload that can be (re)opened for every attempt without reading it into memory."""
+
+    def __init__(self, filename, content_type, size, opener, owned):
+        self.filename = filename
+        self.content_type = content_type
+        self.size = size
+        self.open = opener
+        self.owned = owned
+
+
+def file_part(file):
+    """Normalises a path, ``bytes``, a binary file object, or a ``(filename, content[, content_type])`` tuple."""
+    content_type = None
+    if isinstance(file, tuple):
+        filename, content = file[0], file[1]
+        content_type = file[2] if len(file) > 2 else None
+    elif isinstance(file, (str, os.PathLike)):
+        path = os.fspath(file)
+        filename = os.path.basename(path)
+        return FilePart(filename, guess_content_type(filename), os.path.getsize(path), lambda: open(path, "rb"), True)
+    elif isinstance(file, (bytes, bytearray)):
+        filename, content = "document.txt", file
+    else:
+        filename, content = os.path.basename(getattr(file, "name", None) or "document.txt"), file
+
+    content_type = content_type or guess_content_type(filename)
+    if isinstance(content, (bytes, bytearray)):
+        data = bytes(content)
+        return FilePart(filename, content_type, len(data), lambda: io.BytesIO(data), True)
+
+    # A caller-owned file object: measured from its current position and rewound for each attempt.
+    start = content.tell()
+    size = content.seek(0, io.SEEK_END) - start
+    content.seek(start)
+
+    def reopen():
+        content.seek(start)
+        return content
+
+    return FilePart(filename, content_type, size, reopen, False)
+
+
+class MultipartBody:
+    """A ``multipart/form-data`` body read in chunks, so uploads of any size stream from disk.
+
+    It has a known length, so requests sends a ``Content-Length`` instead of
+    chunked encoding.
+    """
+
+    def __init__(self, fields, part, field_name="file"):
+        boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+        head = bytearray()
+        for name, value in fields.items():
+            if value is None:
+                continue
+            head += (
+                f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'
+            ).encode("utf-8")
+        if part is not None:
+            head += (
+                f'--{boundary}\r\nContent-Disposition: form-data; name="{field_name}"; '
+                f'filename="{part.filename}"\r\nContent-Type: {part.content_type}\r\n\r\n'
+            ).encode("utf-8")
+        tail = (b"\r\n" if part is not None else b"") + f"--{boundary}--\r\n".encode("utf-8")
+
+        self._part = part
+        self._file = part.open() if part is not None else None
+        self._segments = [io.BytesIO(bytes(head)), self._file, io.BytesIO(tail)]
+        self._segments = [segment for segment in self._segments if segment is not None]
+        self._length = len(head) + (part.size if part is not None else 0) + len(tail)
+
+    def __len__(self):
+        return self._length
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self._length
+        chunks = []
+        while size > 0 and self._segments:
+            chunk = self._segments[0].read(min(size, CHUNK_SIZE))
+            if not chunk:
+                self._segments.pop(0)
+                continue
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+
+    def close(self):
+        if self._file is not None and self._part.owned:
+            self._file.close()
+
+
+def ndjson_body(items):
+    return (json.dumps(item).encode("utf-8") + b"\n" for item in items)
+
+
+def iter_ndjson(response):
+    for line in response.iter_lines():
+        if line.strip():
+            yield json.loads(line)
+
+
+def iter_sse(response):
+    """Yields ``(event, data)`` from a ``text/event-stream`` response, JSON-decoding ``data``."""
+    event, data = "message", []
+    for line in response.iter_lines(decode_unicode=True):
+        if not line:
+            if data:
+                yield event, json.loads("\n".join(data))
+            event, data = "message", []
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data.append(line[len("data:"):].lstrip())
+    if data:
+        yield event, json.loads("\n".join(data))
+
+
+def never_sent(error):
+    """True when the request failed while connecting, before any of it reached the server."""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(error, requests.ConnectionError) and isinstance(reason, ConnectTimeoutError)
+
+
+def error_message(body, fallback):
+    if isinstance(body, dict):
+        error = body.get("error")
+        if isinstance(error, dict):
+            error = error.get("message")
+        return body.get("message") if not error else error
+    return fallback
+
+
+class Transport:
+    """Keep-alive connection pool with retries.
+
+    ``requests.Session`` is not thread-safe, so every thread gets its own
+    session, but all of them mount one ``HTTPAdapter``: connections are
+    pooled per host across threads, and ``pool_block`` caps how many are
+    open at once at ``max_connections``.
+    """
+
+    def __init__(self, base_url, *, timeout, max_connections, retries, backoff, max_backoff, headers, retry_unsafe=False):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_unsafe = retry_unsafe
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.headers = {"Accept": "application/json", **(headers or {})}
+        self._adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_connections, pool_block=True, max_retries=0)
+        self._local = threading.local()
+        self._sessions = []
+        self._lock = threading.Lock()
+
+    def session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("http://", self._adapter)
+            session.mount("https://", self._adapter)
+            session.headers.update(self.headers)
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def _delay(self, attempt, error=None):
+        retry_after = error.retry_after if isinstance(error, ApiError) else None
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def _is_idempotent(self, method, headers):
+        if self.retry_unsafe or method.upper() in IDEMPOTENT_METHODS:
+            return True
+        return any(name.lower() == "idempotency-key" for name in [*self.headers, *(headers or {})])
+
+    def request(
+        self,
+        method,
+        path,
+        *,
+        params=None,
+        json=None,
+        data=None,
+        files=None,
+        headers=None,
+        body=None,
+        stream=False,
+        timeout=None,
+        idempotent=None,
+    ):
+        """Sends a request and returns the response, raising :class:`ApiError` for error statuses.
+
+        ``data`` and ``files`` are passed to requests as-is. ``body`` is a
+        zero-argument callable producing a fresh request body, so uploads
+        and NDJSON batches can be resent on retry. 429/503 answers and
+        failures to connect are retried with jittered exponential backoff
+        (honouring ``Retry-After``). 502/504 answers and connections lost
+        after sending are retried only for idempotent requests: ``GET`` and
+        the like, requests carrying an ``Idempotency-Key`` header, or any
+        request when ``idempotent=True`` (or the transport's
+        ``retry_unsafe``) says resending is harmless. Read timeouts are never
+        retried, since the server may still be working on the request.
+        """
+        url = path if path.startswith(("http://", "https://")) else self.base_url + path
+        if idempotent is None:
+            idempotent = self._is_idempotent(method, headers)
+        for attempt in range(self.retries + 1):
+            payload = body() if body else data
+            request_headers = dict(headers or {})
+            if isinstance(payload, MultipartBody):
+                request_headers["Content-Type"] = payload.content_type
+            try:
+                response = self.session().request(
+                    method,
+                    url,
+                    params=params,
+                    json=json,
+                    data=payload,
+                    files=files,
+                    headers=request_headers,
+                    stream=stream,
+                    timeout=timeout or self.timeout,
+                )
+            except requests.ReadTimeout as error:
+                raise TransportError(f"{method} {path} timed out: {error}") from error
+            except requests.RequestException as error:
+                if attempt < self.retries and (idempotent or never_sent(error)):
+                    time.sleep(self._delay(attempt))
+                    continue
+                raise TransportError(f"{method} {path} failed: {error}") from error
+            finally:
+                if isinstance(payload, MultipartBody):
+                    payload.close()
+
+            if response.status_code < 400:
+                return response
+            error = self._api_error(response)
+            retryable = response.status_code in RETRY_STATUSES or (
+                idempotent and response.status_code in IDEMPOTENT_RETRY_STATUSES
+            )
+            if retryable and attempt < self.retries:
+                time.sleep(self._delay(attempt, error))
+                continue
+            raise error
+
+    @staticmethod
+    def _api_error(response):
+        try:
+            body = response.json()
+        except ValueError:
+            body = response.text
+        finally:
+            response.close()
+        return ApiError(response.status_code, error_message(body, response.reason), body, response.headers)
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions.clear()
+        self._adapter.close()
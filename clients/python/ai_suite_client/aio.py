@@ -0,0 +1,124 @@
+"""asyncio front end for :class:`~ai_suite_client.client.Client`."""
+import asyncio
+import contextlib
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .client import DEFAULT_BASE_URL, Client
+
+
+def _delegate(name):
+    method = getattr(Client, name)
+
+    @functools.wraps(method)
+    async def call(self, *args, **kwargs):
+        return await self._run(functools.partial(getattr(self._client, name), *args, **kwargs))
+
+    return call
+
+
+class AsyncClient:
+    """Awaitable version of :class:`Client` with the same methods and arguments.
+
+    Calls run on a private pool of ``max_concurrency`` threads over the same
+    keep-alive connection pool, so at most that many requests are in flight
+    however many coroutines await the client; the rest queue. ``on_token``
+    callbacks run on those threads. Cancelling an awaiting coroutine does not
+    abort a request that has already been sent.
+
+        async with AsyncClient() as client:
+            detections = await asyncio.gather(*(client.detect(text) for text in texts))
+    """
+
+    def __init__(self, base_url=DEFAULT_BASE_URL, *, max_concurrency=16, **options):
+        self.max_concurrency = max_concurrency
+        self._client = Client(base_url, max_connections=max_concurrency, **options)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="ai-suite-async")
+
+    @property
+    def base_url(self):
+        return self._client.base_url
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        await self._run(functools.partial(self._executor.shutdown, wait=True), own_thread=True)
+        self._client.close()
+
+    def _run(self, call, own_thread=False):
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(None if own_thread else self._executor, call)
+
+    async def map(self, fn, items, *, return_exceptions=False):
+        """Awaits ``fn(item)`` for every item concurrently; results follow the order of ``items``."""
+        return await asyncio.gather(*(fn(item) for item in items), return_exceptions=return_exceptions)
+
+    async def analyze_resumes(self, files, *, job_title, return_exceptions=False):
+        return await self.map(
+            lambda file: self.analyze_resume(file, job_title=job_title), files, return_exceptions=return_exceptions
+        )
+
+    async def ask_many(self, question, files, *, return_exceptions=False):
+        return await self.map(lambda file: self.ask(question, file), files, return_exceptions=return_exceptions)
+
+    async def iter_detect(self, texts, *, fresh=False):
+        async for result in self._iterate(self._client.iter_detect(texts, fresh=fresh)):
+            yield result
+
+    async def iter_job_events(self, job, *, timeout=None):
+        async for item in self._iterate(self._client.iter_job_events(job, timeout=timeout)):
+            yield item
+
+    async def _iterate(self, iterator):
+        done = object()
+        lock = threading.Lock()
+        closed = threading.Event()
+
+        def step():
+            item = next(iterator, done)
+            with lock:
+                if closed.is_set():
+                    # Abandoned while this read was in flight: close the response now that we can.
+                    iterator.close()
+            return item
+
+        try:
+            while True:
+                item = await self._run(step)
+                if item is done:
+                    return
+                yield item
+        finally:
+            with lock:
+                closed.set()
+                # Raises ValueError while a cancelled read still runs on a worker
+                # thread; that thread then closes the iterator (and its response) in step().
+                with contextlib.suppress(ValueError):
+                    iterator.close()
+
+    request = _delegate("request")
+    detect = _delegate("detect")
+    detect_many = _delegate("detect_many")
+    generate_article = _delegate("generate_article")
+    generate_titles = _delegate("generate_titles")
+    generate_quotes = _delegate("generate_quotes")
+    rewrite = _delegate("rewrite")
+    classify_ticket = _delegate("classify_ticket")
+    classify_tickets = _delegate("classify_tickets")
+    analyze_sentiment = _delegate("analyze_sentiment")
+    analyze_sentiments = _delegate("analyze_sentiments")
+    analyze_resume = _delegate("analyze_resume")
+    submit_resume = _delegate("submit_resume")
+    ask = _delegate("ask")
+    submit_question = _delegate("submit_question")
+    get_job = _delegate("get_job")
+    wait_for_job = _delegate("wait_for_job")
+    get_upload = _delegate("get_upload")
+    wait_for_upload = _delegate("wait_for_upload")
+    health = _delegate("health")
+    metrics = _delegate("metrics")
@@ -0,0 +1,371 @@
+"""Synchronous client for every route under ``backend/src/routes``."""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ._http import MultipartBody, Transport, error_message, file_part, iter_ndjson, iter_sse, ndjson_body
+from .errors import ApiError, ClientError
+from .models import (
+    Article,
+    AssistantAnswer,
+    BatchResult,
+    Detection,
+    Job,
+    Quotes,
+    ResumeAnalysis,
+    Rewrite,
+    Sentiment,
+    TicketClassification,
+    Titles,
+    Upload,
+)
+
+DEFAULT_BASE_URL = "http://localhost:5000"
+# The server caps ?wait= at JOB_MAX_WAIT_SECONDS (25 by default).
+JOB_POLL_SECONDS = 20
+
+
+def _compact(payload):
+    return {key: value for key, value in payload.items() if value is not None}
+
+
+class Client:
+    """Blocking client with a pooled keep-alive connection set.
+
+    ``max_connections`` bounds both the connection pool and the worker
+    threads used by the fan-out helpers (:meth:`map`, :meth:`detect_many`,
+    :meth:`analyze_resumes`, :meth:`ask_many`). The client is safe to share
+    between threads. Pass ``fresh=True`` to an inference call to bypass the
+    server's response cache. POSTs are retried only when the server shed them
+    (429/503) or the connection could not be opened; ``retry_unsafe=True``
+    also retries them on 502/504 and dropped connections, which can run a
+    request twice.
+
+        with Client("http://localhost:5000") as client:
+            detection = client.detect(text)
+            answers = client.ask_many("What changed?", ["q1.pdf", "q2.pdf"])
+    """
+
+    def __init__(
+        self,
+        base_url=DEFAULT_BASE_URL,
+        *,
+        timeout=30,
+        max_connections=16,
+        retries=2,
+        backoff=0.2,
+        max_backoff=5.0,
+        batch_size=500,
+        headers=None,
+        retry_unsafe=False,
+    ):
+        self.max_connections = max_connections
+        self.batch_size = batch_size
+        self._transport = Transport(
+            base_url,
+            timeout=timeout,
+            max_connections=max_connections,
+            retries=retries,
+            backoff=backoff,
+            max_backoff=max_backoff,
+            headers=headers,
+            retry_unsafe=retry_unsafe,
+        )
+        self._executor = None
+
+    @property
+    def base_url(self):
+        return self._transport.base_url
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._transport.close()
+
+    # -- plumbing -----------------------------------------------------------
+
+    def request(self, method, path, **kwargs):
+        """Sends a raw request through the pool; returns the ``requests.Response``.
+
+        Accepts ``params``, ``json``, ``data``, ``files``, ``headers``,
+        ``stream`` and ``timeout`` as in requests, and ``idempotent=True`` to
+        allow retrying a POST after a 502/504 or a dropped connection.
+        Error statuses raise :class:`~ai_suite_client.errors.ApiError`.
+        """
+        return self._transport.request(method, path, **kwargs)
+
+    def _json(self, method, path, *, fresh=False, **kwargs):
+        headers = kwargs.pop("headers", None) or {}
+        if fresh:
+            headers["Cache-Control"] = "no-cache"
+        response = self._transport.request(method, path, headers=headers, **kwargs)
+        try:
+            return response.json()
+        except ValueError as error:
+            raise ApiError(response.status_code, "Response is not valid JSON", response.text, response.headers) from error
+
+    def _streamed(self, path, on_token, *, fresh=False, **request):
+        """POSTs with ``Accept: text/event-stream``, calls ``on_token`` per delta, returns the final body."""
+        headers = {"Accept": "text/event-stream"}
+        if fresh:
+            headers["Cache-Control"] = "no-cache"
+        response = self._transport.request("POST", path, headers=headers, stream=True, **request)
+        with response:
+            if not response.headers.get("Content-Type", "").startswith("text/event-stream"):
+                return response.json()
+            for event, data in iter_sse(response):
+                if event == "token":
+                    on_token(data.get("text", ""))
+                elif event == "done":
+                    return data
+                elif event == "error":
+                    raise ApiError(data.get("statusCode") or 500, error_message(data, "Stream failed"), data)
+        raise ClientError(f"Event stream from {path} ended without a result")
+
+    def _multipart(self, path, fields, file, *, params=None, fresh=False):
+        upload = file_part(file) if file is not None else None
+        headers = {"Cache-Control": "no-cache"} if fresh else None
+        response = self._transport.request(
+            "POST", path, params=params, headers=headers, body=lambda: MultipartBody(fields, upload)
+        )
+        return response.json()
+
+    def _executor_for_fan_out(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_connections, thread_name_prefix="ai-suite-client")
+        return self._executor
+
+    def map(self, fn, items, *, return_exceptions=False):
+        """Calls ``fn(item)`` for every item on the client's worker threads and returns results in order.
+
+        With ``return_exceptions=True`` a failing item's exception takes its
+        place in the list instead of being raised. ``fn`` must not call
+        :meth:`map` itself.
+        """
+        futures = [self._executor_for_fan_out().submit(fn, item) for item in items]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as error:
+                if not return_exceptions:
+                    for pending in futures:
+                        pending.cancel()
+                    raise
+                results.append(error)
+        return results
+
+    def _iter_batch_chunk(self, path, chunk, offset, parse, fresh):
+        headers = {"Content-Type": "application/x-ndjson"}
+        if fresh:
+            headers["Cache-Control"] = "no-cache"
+        response = self._transport.request(
+            "POST", path, headers=headers, body=lambda: ndjson_body(chunk), stream=True
+        )
+        with response:
+            for line in iter_ndjson(response):
+                if line.get("done"):
+                    if line.get("truncated"):
+                        raise ClientError(f"{path} truncated the batch; lower batch_size")
+                    return
+                yield BatchResult(
+                    index=offset + line["index"],
+                    success=line["success"],
+                    value=parse(line["data"]) if line["success"] else None,
+                    error=line.get("error"),
+                    duration_ms=line.get("durationMs"),
+                )
+        raise ClientError(f"Batch response from {path} ended early")
+
+    def _iter_batch(self, path, items, parse, fresh):
+        items = list(items)
+        for offset in range(0, len(items), self.batch_size):
+            yield from self._iter_batch_chunk(path, items[offset:offset + self.batch_size], offset, parse, fresh)
+
+    def _batch(self, path, items, parse, fresh):
+        items = list(items)
+        chunks = [(offset, items[offset:offset + self.batch_size]) for offset in range(0, len(items), self.batch_size)]
+        if len(chunks) <= 1:
+            results = list(self._iter_batch(path, items, parse, fresh))
+        else:
+            # Separate requests can land on different cluster workers.
+            parts = self.map(lambda entry: list(self._iter_batch_chunk(path, entry[1], entry[0], parse, fresh)), chunks)
+            results = [result for part in parts for result in part]
+        return sorted(results, key=lambda result: result.index)
+
+    # -- /api/ai ------------------------------------------------------------
+
+    def detect(self, text, *, fresh=False):
+        """Scores one text (10 to 5000 words) as AI-generated vs human-written."""
+        return Detection.from_response(self._json("POST", "/api/ai/detect", json={"text": text}, fresh=fresh))
+
+    def detect_many(self, texts, *, fresh=False):
+        """Scores many texts through ``/api/ai/detect/batch``; returns one :class:`BatchResult` per text, in order."""
+        return self._batch("/api/ai/detect/batch", texts, Detection.from_data, fresh)
+
+    def iter_detect(self, texts, *, fresh=False):
+        """Like :meth:`detect_many` but yields results as the server finishes them (completion order)."""
+        return self._iter_batch("/api/ai/detect/batch", texts, Detection.from_data, fresh)
+
+    # -- /api/generate ------------------------------------------------------
+
+    def generate_article(self, topic, *, keywords=None, word_count=None, on_token=None, fresh=False):
+        """Drafts an article; ``on_token(text)`` receives model deltas as they stream in."""
+        if isinstance(keywords, (list, tuple)):
+            keywords = ", ".join(keywords)
+        payload = _compact({"topic": topic, "keywords": keywords, "wordCount": word_count})
+        if on_token:
+            return Article.from_response(self._streamed("/api/generate/article", on_token, json=payload, fresh=fresh))
+        return Article.from_response(self._json("POST", "/api/generate/article", json=payload, fresh=fresh))
+
+    def generate_titles(self, topic, *, tone=None, count=None, fresh=False):
+        body = self._json(
+            "POST",
+            "/api/generate/titles",
+            params={"withMeta": "true"},
+            json=_compact({"topic": topic, "tone": tone, "count": count}),
+            fresh=fresh,
+        )
+        return Titles.from_response(body)
+
+    def generate_quotes(self, theme, *, type="quote", count=None, fresh=False):
+        """``type`` is ``"quote"`` or ``"tagline"``."""
+        body = self._json("POST", "/api/generate/quotes", json=_compact({"theme": theme, "type": type, "count": count}), fresh=fresh)
+        return Quotes.from_response(body)
+
+    def rewrite(self, text, *, mode="standard", on_token=None, fresh=False):
+        """``mode`` is one of standard, formal, casual, creative, concise."""
+        payload = {"text": text, "mode": mode}
+        if on_token:
+            return Rewrite.from_response(self._streamed("/api/generate/rewrite", on_token, json=payload, fresh=fresh))
+        return Rewrite.from_response(self._json("POST", "/api/generate/rewrite", json=payload, fresh=fresh))
+
+    # -- /api/classify ------------------------------------------------------
+
+    def classify_ticket(self, text, *, user_id=None, fresh=False):
+        body = self._json("POST", "/api/classify/ticket", json=_compact({"text": text, "userId": user_id}), fresh=fresh)
+        return TicketClassification.from_response(body)
+
+    def classify_tickets(self, tickets, *, fresh=False):
+        """Batch triage; each ticket is a string or a ``{"text", "userId"}`` dict."""
+        return self._batch("/api/classify/ticket/batch", tickets, TicketClassification.from_data, fresh)
+
+    def analyze_sentiment(self, text, *, fresh=False):
+        return Sentiment.from_response(self._json("POST", "/api/classify/sentiment", json={"text": text}, fresh=fresh))
+
+    def analyze_sentiments(self, texts, *, fresh=False):
+        return self._batch("/api/classify/sentiment/batch", texts, Sentiment.from_data, fresh)
+
+    def analyze_resume(self, file=None, *, job_title, document_id=None, fresh=False):
+        """Scores a resume against ``job_title``.
+
+        ``file`` is a path (streamed from disk), ``bytes``, a binary file
+        object or a ``(filename, content[, content_type])`` tuple. Pass
+        ``document_id`` from an earlier response instead to skip the upload.
+        """
+        fields = {"jobTitle": job_title, "document_id": document_id}
+        return ResumeAnalysis.from_response(self._multipart("/api/classify/resume", fields, file, fresh=fresh))
+
+    def submit_resume(self, file=None, *, job_title, document_id=None, priority=None):
+        """Queues a resume analysis as an async job; see :meth:`wait_for_job`."""
+        fields = {"jobTitle": job_title, "document_id": document_id}
+        params = {"async": "true", "priority": priority}
+        return Job.from_response(self._multipart("/api/classify/resume", fields, file, params=params))
+
+    def analyze_resumes(self, files, *, job_title, return_exceptions=False):
+        """Uploads and scores many resumes concurrently; results follow the order of ``files``."""
+        return self.map(lambda file: self.analyze_resume(file, job_title=job_title), files, return_exceptions=return_exceptions)
+
+    # -- /api/assistant -----------------------------------------------------
+
+    def ask(self, question, file=None, *, document_id=None, on_token=None, fresh=False):
+        """Answers ``question`` from an uploaded document or an earlier ``document_id``."""
+        fields = {"user_input": question, "document_id": document_id}
+        if on_token:
+            upload = file_part(file) if file is not None else None
+            body = self._streamed(
+                "/api/assistant/respond", on_token, body=lambda: MultipartBody(fields, upload), fresh=fresh
+            )
+            return AssistantAnswer.from_response(body)
+        return AssistantAnswer.from_response(self._multipart("/api/assistant/respond", fields, file, fresh=fresh))
+
+    def submit_question(self, question, file=None, *, document_id=None, priority=None):
+        fields = {"user_input": question, "document_id": document_id}
+        params = {"async": "true", "priority": priority}
+        return Job.from_response(self._multipart("/api/assistant/respond", fields, file, params=params))
+
+    def ask_many(self, question, files, *, return_exceptions=False):
+        """Asks the same question of many documents concurrently."""
+        return self.map(lambda file: self.ask(question, file), files, return_exceptions=return_exceptions)
+
+    # -- /api/jobs ----------------------------------------------------------
+
+    def get_job(self, job_id, *, wait=None):
+        """Current job state; ``wait`` long-polls up to that many seconds for it to finish."""
+        job_id = job_id.id if isinstance(job_id, Job) else job_id
+        timeout = self._transport.timeout + wait if wait else None
+        body = self._json("GET", f"/api/jobs/{job_id}", params={"wait": wait}, timeout=timeout)
+        return Job.from_response(body)
+
+    def wait_for_job(self, job, *, timeout=120, raise_on_failure=False):
+        """Long-polls until the job is done or failed; raises ``TimeoutError`` after ``timeout`` seconds."""
+        job_id = job.id if isinstance(job, Job) else job
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            current = self.get_job(job_id, wait=max(1, min(JOB_POLL_SECONDS, int(remaining))))
+            if current.finished:
+                return current.raise_for_error() if raise_on_failure else current
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Job {job_id} did not finish within {timeout}s")
+
+    def iter_job_events(self, job, *, timeout=None):
+        """Yields ``(event, Job)`` from the job's event stream until it ends with ``done`` or ``failed``.
+
+        The server sends nothing while a job sits in one state, so by default
+        only connecting is timed; ``timeout`` also bounds each read.
+        """
+        job_id = job.id if isinstance(job, Job) else job
+        response = self._transport.request(
+            "GET",
+            f"/api/jobs/{job_id}/events",
+            headers={"Accept": "text/event-stream"},
+            stream=True,
+            timeout=(self._transport.timeout, timeout),
+        )
+        with response:
+            for event, data in iter_sse(response):
+                yield event, Job.from_data(data)
+                if event in ("done", "failed"):
+                    return
+
+    # -- /api/uploads -------------------------------------------------------
+
+    def get_upload(self, upload_id):
+        """Status of a background archive upload (``AssistantAnswer.upload["id"]``)."""
+        return Upload.from_response(self._json("GET", f"/api/uploads/{upload_id}"))
+
+    def wait_for_upload(self, upload_id, *, timeout=30, interval=0.5):
+        deadline = time.monotonic() + timeout
+        while True:
+            upload = self.get_upload(upload_id)
+            if upload.finished:
+                return upload
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Upload {upload_id} did not finish within {timeout}s")
+            time.sleep(interval)
+
+    # -- operations ---------------------------------------------------------
+
+    def health(self):
+        return self._json("GET", "/health")
+
+    def metrics(self):
+        """Prometheus exposition text from ``/metrics``."""
+        return self._transport.request("GET", "/metrics", headers={"Accept": "text/plain"}).text
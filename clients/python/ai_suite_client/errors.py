@@ -0,0 +1,43 @@
+"""Exceptions raised by the client."""
+
+
+class ClientError(Exception):
+    """Base class for every error raised by this package."""
+
+
+class TransportError(ClientError):
+    """The request never produced an HTTP response (connection refused, reset, timeout)."""
+
+
+class ApiError(ClientError):
+    """The server answered with an error status.
+
+    ``message`` is taken from whichever error shape the endpoint uses
+    (``{"message": ...}`` from the API error handler, ``{"error": ...}`` from
+    the assistant route, or a failed job's ``error`` object).
+    """
+
+    def __init__(self, status_code, message, body=None, headers=None):
+        super().__init__(f"{status_code}: {message}")
+        self.status_code = status_code
+        self.message = message
+        self.body = body
+        self.headers = dict(headers or {})
+
+    @property
+    def retry_after(self):
+        """Seconds from a ``Retry-After`` header, or ``None``."""
+        value = self.headers.get("Retry-After") or self.headers.get("retry-after")
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            return None
+
+
+class JobFailedError(ApiError):
+    """An async job finished with status ``failed``; ``job`` is the final :class:`~ai_suite_client.models.Job`."""
+
+    def __init__(self, job):
+        error = job.error or {}
+        super().__init__(error.get("statusCode", 500), error.get("message", "Job failed"), body=job.raw)
+        self.job = job
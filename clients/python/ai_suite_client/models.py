@@ -0,0 +1,322 @@
+"""Typed views of the backend's JSON responses.
+
+Every model keeps the decoded body in ``raw`` so fields the model does not
+name are still reachable. ``from_response`` accepts the full response body
+(``{"statusCode", "message", "data", ...}``); for routes that duplicate a
+field at the top level (``answer``/``response``/``data.answer``,
+``rewritten``/``result``/``data.rewrittenText``) the model exposes one name.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .errors import ApiError, JobFailedError
+
+
+def _data(body):
+    data = body.get("data") if isinstance(body, dict) else None
+    return data if isinstance(data, dict) else {}
+
+
+@dataclass
+class Detection:
+    ai_probability: float
+    human_probability: float
+    verdict: str
+    confidence: str
+    analysis: Dict[str, Any]
+    indicators: List[str]
+    metadata: Dict[str, Any]
+    raw: Dict[str, Any] = field(repr=False)
+
+    @classmethod
+    def from_response(cls, body):
+        return cls.from_data(_data(body), raw=body)
+
+    @classmethod
+    def from_data(cls, data, raw=None):
+        detection = data.get("detection") or {}
+        return cls(
+            ai_probability=detection.get("aiProbability"),
+            human_probability=detection.get("humanProbability"),
+            verdict=detection.get("verdict"),
+            confidence=detection.get("confidence"),
+            analysis=data.get("analysis") or {},
+            indicators=data.get("indicators") or [],
+            metadata=data.get("metadata") or {},
+            raw=raw if raw is not None else data,
+        )
+
+
+@dataclass
+class Article:
+    topic: str
+    keywords: List[str]
+    text: str
+    word_count: int
+    target_word_count: int
+    raw: Dict[str, Any] = field(repr=False)
+
+    @classmethod
+    def from_response(cls, body):
+        data = _data(body)
+        return cls(
+            topic=data.get("topic"),
+            keywords=data.get("keywords") or [],
+            text=data.get("generatedText") or body.get("article") or "",
+            word_count=data.get("actualWordCount"),
+            target_word_count=data.get("targetWordCount"),
+            raw=body,
+        )
+
+
+@dataclass
+class Titles:
+    topic: str
+    tone: str
+    titles: List[str]
+    raw: Any = field(repr=False)
+
+    @classmethod
+    def from_response(cls, body):
+        # Without ?withMeta=true the route answers with a bare list.
+        if isinstance(body, list):
+            return cls(topic=None, tone=None, titles=body, raw=body)
+        data = _data(body)
+        return cls(
+            topic=data.get("topic"),
+            tone=data.get("tone"),
+            titles=data.get("titles") or body.get("titles") or [],
+            raw=body,
+        )
+
+
+@dataclass
+class Quotes:
+    theme: str
+    type: str
+    quotes: List[str]
+    raw: Dict[str, Any] = field(repr=False)
+
+    @classmethod
+    def from_response(cls, body):
+        data = _data(body)
+        return cls(
+            theme=data.get("theme"),
+            type=data.get("type"),
+            quotes=data.get("quotes") or body.get("quotes") or [],
+            raw=body,
+        )
+
+
+@dataclass
+class Rewrite:
+    mode: str
+    original_text: str
+    text: str
+    raw: Dict[str, Any] = field(repr=False)
+
+    @classmethod
+    def from_response(cls, body):
+        data = _data(body)
+        return cls(
+            mode=data.get("mode"),
+            original_text=data.get("originalText"),
+            text=data.get("rewrittenText") or body.get("rewritten") or body.get("result") or "",
+            raw=body,
+        )
+
+
+@dataclass
+class TicketClassification:
+    category: str
+    priority: str
+    department: str
+    sentiment: str
+    estimated_response_time: str
+    keywords: List[str]
+    reasoning: str
+    metadata: Dict[str, Any]
+    raw: Dict[str, Any] = field(repr=False)
+
+    @classmethod
+    def from_response(cls, body):
+        return cls.from_data(_data(body), raw=body)
+
+    @classmethod
+    def from_data(cls, data, raw=None):
+        return cls(
+            category=data.get("category"),
+            priority=data.get("priority"),
+            department=data.get("department"),
+            sentiment=data.get("sentiment"),
+            estimated_response_time=data.get("estimatedResponseTime"),
+            keywords=data.get("keywords") or [],
+            reasoning=data.get("reasoning"),
+            metadata=data.get("metadata") or {},
+            raw=raw if raw is not None else data,
+        )
+
+
+@dataclass
+class Sentiment:
+    label: str
+    confidence: float
+    scores: Dict[str, float]
+    raw: Dict[str, Any] = field(repr=False)
+
+    @classmethod
+    def from_response(cls, body):
+        return cls.from_data(_data(body), raw=body)
+
+    @classmethod
+    def from_data(cls, data, raw=None):
+        return cls(
+            label=data.get("label") or data.get("sentiment"),
+            confidence=data.get("confidence"),
+            scores={entry["label"]: entry["score"] for entry in data.get("allScores") or []},
+            raw=raw if raw is not None else data,
+        )
+
+
+@dataclass
+class ResumeAnalysis:
+    overall_score: float
+    key_strengths: List[str]
+    critical_weaknesses: List[str]
+    skill_gaps: List[str]
+    ats_keywords: List[str]
+    top_priority_action: str
+    document_id: Optional[str]
+    metadata: Dict[str, Any]
+    raw: Dict[str, Any] = field(repr=False)
+
+    @classmethod
+    def from_response(cls, body):
+        data = _data(body)
+        metadata = data.get("metadata") or {}
+        return cls(
+            overall_score=data.get("overallScore"),
+            key_strengths=data.get("keyStrengths") or [],
+            critical_weaknesses=data.get("criticalWeaknesses") or [],
+            skill_gaps=data.get("skillGaps") or [],
+            ats_keywords=data.get("atsKeywords") or [],
+            top_priority_action=data.get("topPriorityAction"),
+            document_id=metadata.get("documentId"),
+            metadata=metadata,
+            raw=body,
+        )
+
+
+@dataclass
+class AssistantAnswer:
+    answer: str
+    document_id: Optional[str]
+    file_info: Dict[str, Any]
+    retrieval: Dict[str, Any]
+    raw: Dict[str, Any] = field(repr=False)
+
+    @classmethod
+    def from_response(cls, body):
+        data = _data(body)
+        answer = data.get("answer") or body.get("answer") or body.get("response") or ""
+        return cls(
+            answer=answer,
+            document_id=data.get("document_id"),
+            file_info=data.get("file_info") or {},
+            retrieval=data.get("retrieval") or {},
+            raw=body,
+        )
+
+    @property
+    def upload(self):
+        """Background archive upload (``id``, ``status``, ``statusUrl``), when one was queued."""
+        return self.file_info.get("upload")
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    status: str
+    priority: str
+    result: Any
+    error: Optional[Dict[str, Any]]
+    status_url: str
+    events_url: str
+    created_at: str
+    finished_at: Optional[str]
+    raw: Dict[str, Any] = field(repr=False)
+
+    @classmethod
+    def from_response(cls, body):
+        return cls.from_data(_data(body) if "data" in body else body, raw=body)
+
+    @classmethod
+    def from_data(cls, data, raw=None):
+        return cls(
+            id=data.get("id"),
+            kind=data.get("kind"),
+            status=data.get("status"),
+            priority=data.get("priority"),
+            result=data.get("result"),
+            error=data.get("error"),
+            status_url=data.get("statusUrl"),
+            events_url=data.get("eventsUrl"),
+            created_at=data.get("createdAt"),
+            finished_at=data.get("finishedAt"),
+            raw=raw if raw is not None else data,
+        )
+
+    @property
+    def finished(self):
+        return self.status in ("done", "failed")
+
+    def raise_for_error(self):
+        """Raises :class:`~ai_suite_client.errors.JobFailedError` when the job failed."""
+        if self.status == "failed":
+            raise JobFailedError(self)
+        return self
+
+
+@dataclass
+class Upload:
+    id: str
+    status: str
+    attempts: int
+    url: Optional[str]
+    error: Any
+    raw: Dict[str, Any] = field(repr=False)
+
+    @classmethod
+    def from_response(cls, body):
+        data = _data(body)
+        return cls(
+            id=data.get("id"),
+            status=data.get("status"),
+            attempts=data.get("attempts"),
+            url=data.get("url"),
+            error=data.get("error"),
+            raw=body,
+        )
+
+    @property
+    def finished(self):
+        return self.status in ("done", "failed")
+
+
+@dataclass
+class BatchResult:
+    """One line of a batch endpoint's NDJSON answer; ``value`` is the typed item when it succeeded."""
+
+    index: int
+    success: bool
+    value: Any
+    error: Optional[Dict[str, Any]]
+    duration_ms: Optional[float]
+
+    def unwrap(self):
+        """Returns ``value`` or raises the item's error as :class:`~ai_suite_client.errors.ApiError`."""
+        if not self.success:
+            error = self.error or {}
+            raise ApiError(error.get("statusCode", 500), error.get("message", "Batch item failed"), body=error)
+        return self.value
@@ -0,0 +1,384 @@
+"""Client behaviour against an in-process stand-in for the backend routes."""
+import asyncio
+import json
+import threading
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ai_suite_client import ApiError, AsyncClient, Client, JobFailedError, TransportError
+
+JOB_ID = "11111111-2222-3333-4444-555555555555"
+
+
+def detection_data(text):
+    probability = 0.9 if "delve" in text else 0.1
+    return {
+        "detection": {"aiProbability": probability, "humanProbability": 1 - probability, "verdict": "v", "confidence": "High"},
+        "analysis": {},
+        "indicators": ["x"],
+        "metadata": {"wordCount": len(text.split())},
+    }
+
+
+def job_view(status, result=None, error=None):
+    return {
+        "id": JOB_ID,
+        "kind": "resume.analyze",
+        "status": status,
+        "priority": "normal",
+        "result": result,
+        "error": error,
+        "createdAt": "2026-01-01T00:00:00.000Z",
+        "finishedAt": None,
+        "statusUrl": f"/api/jobs/{JOB_ID}",
+        "eventsUrl": f"/api/jobs/{JOB_ID}/events",
+    }
+
+
+class Stub:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.connections = set()
+        self.requests = []
+        self.fail_next = 0
+        self.fail_status = 503
+        self.drop_next = 0
+        self.job_status = "done"
+        self.peak_in_flight = 0
+        self.in_flight = 0
+
+
+def make_handler(stub):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Like Node's HTTP server; otherwise replies on kept-alive connections stall on delayed ACKs.
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status, payload, content_type="application/json"):
+            data = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _stream(self, content_type, chunks):
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for chunk in chunks:
+                data = chunk.encode("utf-8")
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+
+        def _body(self):
+            if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+                data = b""
+                while True:
+                    length = int(self.rfile.readline().strip() or b"0", 16)
+                    if length == 0:
+                        self.rfile.readline()
+                        return data
+                    data += self.rfile.read(length)
+                    self.rfile.readline()
+            return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        def _record(self, body):
+            with stub.lock:
+                stub.connections.add(self.client_address)
+                stub.requests.append((self.command, self.path, dict(self.headers), body))
+
+        def do_GET(self):
+            self._record(b"")
+            if self.path.startswith(f"/api/jobs/{JOB_ID}/events"):
+                events = [("status", job_view("running"))]
+                events.append(("done", job_view("done", result={"statusCode": 200, "data": {"overallScore": 80}}))
+                              if stub.job_status == "done" else
+                              ("failed", job_view("failed", error={"statusCode": 500, "message": "boom"})))
+                return self._stream("text/event-stream", [f"event: {e}\ndata: {json.dumps(d)}\n\n" for e, d in events])
+            if self.path.startswith(f"/api/jobs/{JOB_ID}"):
+                error = {"statusCode": 500, "message": "boom"} if stub.job_status == "failed" else None
+                return self._send(200, {"statusCode": 200, "data": job_view(stub.job_status, error=error)})
+            if self.path.startswith("/api/jobs/"):
+                return self._send(404, {"success": False, "message": "Unknown or expired job id"})
+            return self._send(404, {"success": False, "message": "not found"})
+
+        def do_POST(self):
+            body = self._body()
+            self._record(body)
+            with stub.lock:
+                stub.in_flight += 1
+                stub.peak_in_flight = max(stub.peak_in_flight, stub.in_flight)
+                failing = stub.fail_next > 0
+                stub.fail_next -= 1 if failing else 0
+                dropping = stub.drop_next > 0
+                stub.drop_next -= 1 if dropping else 0
+            try:
+                if dropping:
+                    # The request arrived, but the connection dies before any reply.
+                    self.close_connection = True
+                    return None
+                if failing:
+                    return self._send(stub.fail_status, {"success": False, "message": "Inference gateway is overloaded"})
+                self._route(body)
+            finally:
+                with stub.lock:
+                    stub.in_flight -= 1
+
+        def _route(self, body):
+            if self.path == "/api/ai/detect":
+                text = json.loads(body).get("text") or ""
+                if len(text.split()) < 10:
+                    return self._send(400, {"success": False, "message": "Text must contain at least 10 words"})
+                threading.Event().wait(0.02)
+                return self._send(200, {"statusCode": 200, "data": detection_data(text)})
+            if self.path == "/api/ai/detect/batch":
+                lines = [json.loads(line) for line in body.decode().splitlines() if line.strip()]
+                out = [
+                    json.dumps({"index": i, "success": True, "durationMs": 1, "data": detection_data(t)}) + "\n"
+                    if len(t.split()) >= 10 else
+                    json.dumps({"index": i, "success": False, "error": {"statusCode": 400, "message": "too short"}}) + "\n"
+                    for i, t in reversed(list(enumerate(lines)))
+                ]
+                out.append(json.dumps({"done": True, "total": len(lines), "truncated": False}) + "\n")
+                return self._stream("application/x-ndjson", out)
+            if self.path.startswith("/api/classify/resume") or self.path == "/api/assistant/respond":
+                message = BytesParser(policy=HTTP).parsebytes(
+                    f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode() + body
+                )
+                fields, upload = {}, None
+                for part in message.iter_parts():
+                    if part.get_filename():
+                        upload = (part.get_filename(), part.get_content_type(), part.get_payload(decode=True))
+                    else:
+                        fields[part.get_param("name", header="content-disposition")] = part.get_content()
+                if self.path == "/api/assistant/respond":
+                    if not fields.get("user_input"):
+                        return self._send(400, {"error": "user_input is required and cannot be empty."})
+                    answer = f"{fields['user_input']} -> {len(upload[2]) if upload else 0} bytes"
+                    data = {"answer": answer, "document_id": "doc-1", "file_info": {"name": upload and upload[0]}}
+                    if "text/event-stream" in self.headers.get("Accept", ""):
+                        final = {"statusCode": 200, "data": data, "answer": answer, "response": answer}
+                        return self._stream("text/event-stream", [
+                            f"event: token\ndata: {json.dumps({'text': word + ' '})}\n\n" for word in answer.split()
+                        ] + [f"event: done\ndata: {json.dumps(final)}\n\n"])
+                    return self._send(200, {"statusCode": 200, "data": data, "answer": answer, "response": answer})
+                if "async=true" in self.path:
+                    return self._send(202, {"statusCode": 202, "data": job_view("queued")})
+                return self._send(200, {"statusCode": 200, "data": {
+                    "overallScore": 70,
+                    "metadata": {"jobTitle": fields.get("jobTitle"), "fileName": upload[0], "documentId": "doc-2",
+                                 "contentType": upload[1], "size": len(upload[2])},
+                }})
+            return self._send(404, {"success": False, "message": "not found"})
+
+    return Handler
+
+
+@pytest.fixture
+def stub():
+    state = Stub()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    state.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+HUMAN = "we grabbed lunch near the station and argued about the match for an hour"
+AI = "in this essay we delve into the many facets of modern remote work culture today"
+
+
+def test_detect_reuses_one_keep_alive_connection(stub):
+    with Client(stub.url) as client:
+        results = [client.detect(HUMAN) for _ in range(5)]
+    assert all(result.ai_probability == pytest.approx(0.1) for result in results)
+    assert results[0].metadata["wordCount"] == len(HUMAN.split())
+    assert len(stub.connections) == 1
+
+
+def test_error_statuses_raise_api_error_with_server_message(stub):
+    with Client(stub.url, retries=0) as client:
+        with pytest.raises(ApiError) as raised:
+            client.detect("too short")
+        assert raised.value.status_code == 400
+        assert "at least 10 words" in raised.value.message
+
+        with pytest.raises(ApiError) as raised:
+            client.ask("", ("notes.txt", b"hello"))
+        assert raised.value.message == "user_input is required and cannot be empty."
+
+
+def test_shed_requests_are_retried(stub):
+    stub.fail_next = 2
+    with Client(stub.url, retries=2, backoff=0.01) as client:
+        assert client.detect(AI).ai_probability == pytest.approx(0.9)
+    assert len(stub.requests) == 3
+
+    stub.fail_next = 5
+    with Client(stub.url, retries=1, backoff=0.01) as client:
+        with pytest.raises(ApiError) as raised:
+            client.detect(AI)
+    assert raised.value.status_code == 503
+
+
+def test_bad_gateway_posts_are_retried_only_when_idempotent(stub):
+    stub.fail_status = 502
+    stub.fail_next = 1
+    with Client(stub.url, retries=2, backoff=0.01) as client:
+        with pytest.raises(ApiError) as raised:
+            client.detect(AI)
+    assert raised.value.status_code == 502
+    assert len(stub.requests) == 1
+
+    stub.fail_next = 1
+    with Client(stub.url, retries=2, backoff=0.01) as client:
+        response = client.request(
+            "POST", "/api/ai/detect", json={"text": AI}, headers={"Idempotency-Key": "detect-1"}
+        )
+    assert response.status_code == 200
+    assert len(stub.requests) == 3
+
+    stub.fail_next = 1
+    with Client(stub.url, retries=2, backoff=0.01, retry_unsafe=True) as client:
+        assert client.detect(AI).ai_probability == pytest.approx(0.9)
+    assert len(stub.requests) == 5
+
+
+def test_connection_failures_are_retried_only_before_sending(stub, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("ai_suite_client._http.time.sleep", sleeps.append)
+    with Client("http://127.0.0.1:1", retries=2, backoff=0.01) as client:
+        with pytest.raises(TransportError):
+            client.detect(AI)
+    assert len(sleeps) == 2
+
+    sleeps.clear()
+    stub.drop_next = 1
+    with Client(stub.url, retries=2, backoff=0.01) as client:
+        with pytest.raises(TransportError):
+            client.detect(AI)
+    assert not sleeps
+    assert len(stub.requests) == 1
+
+
+def test_detect_many_streams_ndjson_and_keeps_input_order(stub):
+    texts = [HUMAN, AI, "short one", AI, HUMAN]
+    with Client(stub.url, batch_size=2) as client:
+        results = client.detect_many(texts)
+    assert [result.index for result in results] == [0, 1, 2, 3, 4]
+    assert [result.success for result in results] == [True, True, False, True, True]
+    assert results[1].value.ai_probability == pytest.approx(0.9)
+    assert results[2].error["message"] == "too short"
+    with pytest.raises(ApiError):
+        results[2].unwrap()
+    batch_requests = [r for r in stub.requests if r[1] == "/api/ai/detect/batch"]
+    assert len(batch_requests) == 3
+    assert all(r[2]["Content-Type"] == "application/x-ndjson" for r in batch_requests)
+
+
+def test_uploads_stream_from_a_path_with_length_and_type(stub, tmp_path):
+    resume = tmp_path / "resume.pdf"
+    resume.write_bytes(b"%PDF-1.4 " + b"x" * 200000)
+    with Client(stub.url) as client:
+        analysis = client.analyze_resume(resume, job_title="Engineer")
+    assert analysis.overall_score == 70
+    assert analysis.document_id == "doc-2"
+    assert analysis.metadata["fileName"] == "resume.pdf"
+    assert analysis.metadata["contentType"] == "application/pdf"
+    assert analysis.metadata["size"] == 200009
+    headers = stub.requests[-1][2]
+    assert "Content-Length" in headers and "Transfer-Encoding" not in headers
+
+
+def test_assistant_answer_and_token_stream(stub):
+    tokens = []
+    with Client(stub.url) as client:
+        plain = client.ask("What is it?", ("notes.txt", b"0123456789"))
+        streamed = client.ask("What is it?", ("notes.txt", b"0123456789"), on_token=tokens.append)
+    assert plain.answer == "What is it? -> 10 bytes"
+    assert plain.document_id == "doc-1"
+    assert streamed.answer == plain.answer
+    assert "".join(tokens).strip() == plain.answer
+
+
+def test_async_jobs_long_poll_and_events(stub):
+    with Client(stub.url) as client:
+        job = client.submit_resume(("resume.txt", b"Jane"), job_title="Engineer", priority="high")
+        assert job.status == "queued" and job.status_url == f"/api/jobs/{JOB_ID}"
+        assert "priority=high" in stub.requests[-1][1]
+
+        finished = client.wait_for_job(job)
+        assert finished.status == "done"
+        assert "wait=" in stub.requests[-1][1]
+
+        events = list(client.iter_job_events(job))
+        assert [event for event, _ in events] == ["status", "done"]
+        assert events[-1][1].result["data"]["overallScore"] == 80
+
+        stub.job_status = "failed"
+        with pytest.raises(JobFailedError) as raised:
+            client.wait_for_job(job, raise_on_failure=True)
+        assert raised.value.message == "boom"
+        assert raised.value.job.status == "failed"
+
+        with pytest.raises(ApiError) as raised:
+            client.get_job("00000000-0000-0000-0000-000000000000")
+        assert raised.value.status_code == 404
+
+
+def test_async_client_bounds_concurrency(stub):
+    async def run():
+        async with AsyncClient(stub.url, max_concurrency=3) as client:
+            results = await asyncio.gather(*(client.detect(HUMAN) for _ in range(12)))
+            answers = await client.ask_many("Q", [("a.txt", b"ab"), ("b.txt", b"abc")])
+            streamed = [result async for result in client.iter_detect([HUMAN, AI])]
+            return results, answers, streamed
+
+    results, answers, streamed = asyncio.run(run())
+    assert len(results) == 12
+    assert [answer.answer for answer in answers] == ["Q -> 2 bytes", "Q -> 3 bytes"]
+    assert sorted(result.index for result in streamed) == [0, 1]
+    assert stub.peak_in_flight <= 3
+    assert len(stub.connections) <= 3
+
+
+def test_async_iteration_cancelled_mid_read_closes_the_stream(stub):
+    closed = threading.Event()
+    reading = threading.Event()
+
+    def events():
+        try:
+            yield "first"
+            reading.set()
+            threading.Event().wait(0.2)
+            yield "second"
+        finally:
+            closed.set()
+
+    iterator = events()
+
+    async def run():
+        async with AsyncClient(stub.url, max_concurrency=2) as client:
+            async def consume():
+                async for _ in client._iterate(iterator):
+                    pass
+
+            task = asyncio.create_task(consume())
+            while not reading.is_set():
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+    asyncio.run(run())
+    assert closed.wait(1)
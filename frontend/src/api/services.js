@@ -111,7 +111,20 @@ export const classificationService = {
  */
 export const assistantService = {
   // Document Q&A assistant with file upload
-  respondToQuery: async (file, userInput) => {
+  respondToQuery: async (file, userInput, documentId = null) => {
+    // Follow-up questions reuse the server-side parsed document and skip the upload
+    if (documentId) {
+      try {
+        const response = await apiClient.post('/api/assistant/respond', {
+          document_id: documentId,
+          user_input: userInput,
+        });
+        return response.data;
+      } catch (error) {
+        if (error.response?.status !== 404) throw error;
+      }
+    }
+
     const formData = new FormData();
     formData.append('file', file);
     formData.append('user_input', userInput);
@@ -18,6 +18,7 @@ const FileUploadChat = () => {
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState('');
   const [fileInfo, setFileInfo] = useState(null);
+  const [documentId, setDocumentId] = useState(null);
 
   const handleFileUpload = (e) => {
     const file = e.target.files[0];
@@ -32,6 +33,7 @@ const FileUploadChat = () => {
       ]);
       setError('');
       setFileInfo(null);
+      setDocumentId(null);
     }
   };
 
@@ -49,7 +51,7 @@ const FileUploadChat = () => {
     setError('');
 
     try {
-      const response = await assistantService.respondToQuery(selectedFile, inputMessage.trim());
+      const response = await assistantService.respondToQuery(selectedFile, inputMessage.trim(), documentId);
       
       // Extract answer from response
       const answer = response.answer || response.response || response.data?.answer || response.data?.response || 'Response received';
@@ -59,6 +61,7 @@ const FileUploadChat = () => {
         { role: 'assistant', content: answer }
       ]);
       setFileInfo(response.file_info || response.data?.file_info || null);
+      setDocumentId(response.data?.document_id || null);
     } catch (err) {
       setMessages(nextMessages);
       setError(err.response?.data?.message || err.message || 'Document Q&A failed. Try again.');
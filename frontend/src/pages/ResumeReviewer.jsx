@@ -3,6 +3,9 @@ import { Link } from 'react-router-dom';
 import { useAuth } from '@clerk/clerk-react';
 import { classificationService } from '../api/services';
 
+// Mirrors the backend's UPLOAD_MAX_MB, which depends on its storage mode.
+const UPLOAD_MAX_MB = import.meta.env.VITE_UPLOAD_MAX_MB;
+
 /**
  * Resume Reviewer Tool
  * Provides AI-powered feedback on resumes
@@ -101,7 +104,7 @@ const ResumeReviewer = () => {
                   {fileName || 'Click to upload your resume'}
                 </p>
                 <p className="text-sm text-gray-500">
-                  Supports PDF, DOC, DOCX, TXT (Max 5MB)
+                  Supports PDF, DOC, DOCX, TXT{UPLOAD_MAX_MB ? ` (Max ${UPLOAD_MAX_MB}MB)` : ''}
                 </p>
                 {fileName && (
                   <div className="mt-4 inline-flex items-center bg-blue-100 text-blue-800 px-4 py-2 rounded-lg">
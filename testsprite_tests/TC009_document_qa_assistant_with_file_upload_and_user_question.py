@@ -1,54 +1,25 @@
-import requests
-import io
+import os
+import sys
 
-def test_tc009_document_qa_assistant_with_file_upload_and_user_question():
-    base_url = "http://localhost:5000"
-    endpoint = f"{base_url}/api/assistant/respond"
-    timeout = 30
-    headers = {}
-
-    # Prepare a simple document content for upload (a small text file)
-    document_content = b"Python is a high-level programming language. It is widely used for web development, data analysis, AI, and more."
-    file_tuple = ('test_document.txt', io.BytesIO(document_content), 'text/plain')
-
-    user_question = "What is Python used for?"
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "clients", "python"))
+from ai_suite_client import Client  # noqa: E402
 
-    try:
-        files = {
-            'file': file_tuple
-        }
-        data = {
-            'user_input': user_question
-        }
+BASE_URL = "http://localhost:5000"
+TIMEOUT = 30
 
-        response = requests.post(endpoint, files=files, data=data, headers=headers, timeout=timeout)
-        assert response.status_code == 200, f"Expected status 200 but got {response.status_code}"
-        json_response = response.json()
 
-        # Validate response contains AI-generated answer related to the document content
-        assert 'answer' in json_response or 'data' in json_response, "Response missing expected answer data"
-
-        # Heuristic checks on answer presence and type
-        answer_text = None
-        if 'answer' in json_response:
-            answer_text = json_response['answer']
-        elif 'data' in json_response and isinstance(json_response['data'], dict):
-            # Try to find answer inside data object
-            for key in ['answer', 'response', 'content']:
-                if key in json_response['data']:
-                    answer_text = json_response['data'][key]
-                    break
+def test_tc009_document_qa_assistant_with_file_upload_and_user_question():
+    document_content = b"Python is a high-level programming language. It is widely used for web development, data analysis, AI, and more."
 
-        assert answer_text is not None, "Answer text not found in response"
-        assert isinstance(answer_text, str), "Answer text should be a string"
-        assert len(answer_text.strip()) > 0, "Answer text is empty"
+    with Client(BASE_URL, timeout=TIMEOUT) as client:
+        result = client.ask("What is Python used for?", ("test_document.txt", document_content))
 
-        # Check that the answer is related to the document context (basic containment check)
-        # We'll check it contains the word 'Python' since that is the core content
-        assert "Python" in answer_text or "python" in answer_text, "Answer does not appear grounded in document content"
+    answer_text = result.answer
+    assert isinstance(answer_text, str), "Answer text should be a string"
+    assert len(answer_text.strip()) > 0, "Answer text is empty"
 
-    except requests.RequestException as e:
-        assert False, f"Request failed: {str(e)}"
+    # The answer should be grounded in the document, which is about Python
+    assert "Python" in answer_text or "python" in answer_text, "Answer does not appear grounded in document content"
 
 
-test_tc009_document_qa_assistant_with_file_upload_and_user_question()
\ No newline at end of file
+test_tc009_document_qa_assistant_with_file_upload_and_user_question()
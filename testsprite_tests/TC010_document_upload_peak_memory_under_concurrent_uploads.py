@@ -0,0 +1,96 @@
+import os
+import sys
+import threading
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "clients", "python"))
+from ai_suite_client import Client, ClientError  # noqa: E402
+
+# /health reports the RSS of the process that answers it, so run the server
+# with CLUSTER_WORKERS=1 for a meaningful measurement. The spool check reads the
+# server's upload directory, so the test must run on the server host.
+BASE_URL = "http://localhost:5000"
+TIMEOUT = 60
+CONCURRENT_UPLOADS = 8
+FILE_SIZE_MB = 4
+SPOOL_DIR = os.environ.get("UPLOAD_SPOOL_DIR") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "backend", "public", "temp"
+)
+# Allowed server RSS growth per concurrent upload, as a multiple of the file size.
+# Extraction and the retrieval index hold the document text, so this is a coarse
+# bound; the spool check is what catches a revert to in-memory upload buffers.
+RSS_BUDGET_FACTOR = float(os.environ.get("UPLOAD_RSS_BUDGET_FACTOR", "10"))
+
+
+def _health_rss(client):
+    memory = client.health().get("memory")
+    assert memory and isinstance(memory.get("rss"), int), "/health does not report memory.rss"
+    return memory["rss"]
+
+
+def _make_document():
+    # A unique token per file keeps the document cache from skipping extraction.
+    line = f"Quarterly report {uuid.uuid4()}: revenue grew while support costs fell across regions.\n"
+    repeats = FILE_SIZE_MB * 1024 * 1024 // len(line)
+    return (line * repeats).encode("utf-8")
+
+
+def _spooled_uploads():
+    try:
+        return sum(1 for name in os.listdir(SPOOL_DIR) if name.endswith(".upload"))
+    except FileNotFoundError:
+        return 0
+
+
+def test_document_upload_peak_memory_under_concurrent_uploads():
+    documents = [("report.txt", _make_document()) for _ in range(CONCURRENT_UPLOADS)]
+    # One extra connection so /health sampling never waits behind the uploads.
+    client = Client(BASE_URL, timeout=TIMEOUT, max_connections=CONCURRENT_UPLOADS + 1, retries=0)
+    baseline_rss = _health_rss(client)
+
+    samples = []
+    spooled = []
+    stop = threading.Event()
+
+    def sample_rss():
+        while not stop.is_set():
+            spooled.append(_spooled_uploads())
+            try:
+                samples.append(_health_rss(client))
+            except (ClientError, AssertionError):
+                pass
+            stop.wait(0.02)
+
+    sampler = threading.Thread(target=sample_rss, daemon=True)
+    sampler.start()
+    started = time.perf_counter()
+    try:
+        results = client.ask_many("How did support costs change?", documents, return_exceptions=True)
+    finally:
+        stop.set()
+        sampler.join()
+        client.close()
+    elapsed = time.perf_counter() - started
+
+    failures = [result for result in results if isinstance(result, Exception)]
+    assert not failures, f"Unexpected failures: {failures}"
+    assert samples, "No RSS samples were collected during the uploads"
+    # Disk mode writes each in-flight upload to the spool directory; memory mode never does.
+    assert max(spooled) > 0, f"No spooled uploads appeared in {SPOOL_DIR} while requests were in flight"
+
+    peak_delta_mb = max(0, max(samples) - baseline_rss) / (1024 * 1024)
+    per_upload_mb = peak_delta_mb / CONCURRENT_UPLOADS
+    print(
+        f"{CONCURRENT_UPLOADS} x {FILE_SIZE_MB}MB uploads in {elapsed:.2f}s: "
+        f"baseline RSS {baseline_rss / (1024 * 1024):.1f}MB, peak +{peak_delta_mb:.1f}MB, "
+        f"~{per_upload_mb:.1f}MB per concurrent upload, up to {max(spooled)} files spooled at once"
+    )
+
+    budget_mb = FILE_SIZE_MB * RSS_BUDGET_FACTOR
+    assert per_upload_mb <= budget_mb, (
+        f"Peak RSS grew {per_upload_mb:.1f}MB per upload, above the {budget_mb:.1f}MB budget"
+    )
+
+
+test_document_upload_peak_memory_under_concurrent_uploads()
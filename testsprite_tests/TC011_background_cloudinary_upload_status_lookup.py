@@ -0,0 +1,54 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench"))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "clients", "python"))
+from ai_suite_client import ApiError, Client  # noqa: E402
+from cloudinary_stub import CloudinaryStubConfig, start_cloudinary_stub  # noqa: E402
+
+# The server must archive to this stub:
+#   SAVE_UPLOADS_TO_CLOUDINARY=true CLOUDINARY_CLOUD_NAME=stub CLOUDINARY_API_KEY=stub
+#   CLOUDINARY_API_SECRET=stub CLOUDINARY_UPLOAD_PREFIX=http://127.0.0.1:8091 UPLOAD_RETRY_BASE_MS=200
+BASE_URL = "http://localhost:5000"
+STUB_PORT = int(os.environ.get("CLOUDINARY_STUB_PORT", "8091"))
+TIMEOUT = 30
+POLL_SECONDS = 30
+
+
+def test_background_cloudinary_upload_status_lookup():
+    # One injected failure exercises the retry path; the latency would have
+    # delayed the response before uploads moved off the request path.
+    stub, stub_config = start_cloudinary_stub(
+        port=STUB_PORT, config=CloudinaryStubConfig(latency_ms=1500, fail_first=1)
+    )
+    client = Client(BASE_URL, timeout=TIMEOUT)
+    try:
+        answer = client.ask("What is Python used for?", ("notes.txt", b"Python is widely used for web development and data analysis."))
+
+        upload = answer.upload
+        assert upload, "file_info.upload missing; is the server configured to archive to the stub?"
+        assert upload["status"] in ("queued", "uploading", "done"), f"Unexpected upload status {upload['status']}"
+        assert upload["statusUrl"] == f"/api/uploads/{upload['id']}"
+
+        try:
+            status = client.wait_for_upload(upload["id"], timeout=POLL_SECONDS)
+        except TimeoutError:
+            status = client.get_upload(upload["id"])
+        assert status.status == "done", f"Upload did not finish: {status.raw}"
+        assert status.attempts >= 2, "The injected failure should have been retried"
+        assert status.url and status.url.startswith("http"), "Finished upload has no url"
+        assert stub_config.stats["uploaded"] >= 1
+
+        for upload_id, expected in (("00000000-0000-0000-0000-000000000000", 404), ("not-an-id", 400)):
+            try:
+                client.get_upload(upload_id)
+                status_code = 200
+            except ApiError as error:
+                status_code = error.status_code
+            assert status_code == expected, f"Upload id {upload_id!r} should be {expected}, got {status_code}"
+    finally:
+        client.close()
+        stub.shutdown()
+
+
+test_background_cloudinary_upload_status_lookup()
@@ -0,0 +1,59 @@
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "clients", "python"))
+from ai_suite_client import Client  # noqa: E402
+
+BASE_URL = "http://localhost:5000"
+TIMEOUT = 60
+
+SERVER_TIMING_ENTRY = re.compile(r"^[\w.]+;dur=\d+(\.\d+)?")
+
+
+def parse_server_timing(header):
+    entries = {}
+    for part in header.split(","):
+        part = part.strip()
+        assert SERVER_TIMING_ENTRY.match(part), f"Malformed Server-Timing entry: {part!r}"
+        name, _, rest = part.partition(";dur=")
+        entries[name] = float(rest.split(";")[0])
+    return entries
+
+
+def test_server_timing_header_and_prometheus_metrics():
+    with Client(BASE_URL, timeout=TIMEOUT) as client:
+        # The raw response, since the header is the subject of the test.
+        response = client.request(
+            "POST",
+            "/api/ai/detect",
+            json={"text": "Server timing should list every stage this request went through. " * 5},
+        )
+        metrics = client.request("GET", "/metrics")
+    assert response.status_code == 200, f"Detection failed: {response.status_code} {response.text}"
+
+    header = response.headers.get("Server-Timing")
+    assert header, "Response has no Server-Timing header"
+    entries = parse_server_timing(header)
+    assert "total" in entries, f"Server-Timing lacks the total entry: {header}"
+    assert all(value >= 0 for value in entries.values())
+
+    assert metrics.status_code == 200, f"/metrics returned {metrics.status_code}"
+    assert metrics.headers.get("Content-Type", "").startswith("text/plain")
+
+    body = metrics.text
+    for family in (
+        "http_request_duration_seconds",
+        "app_inference_results_total",
+        "nodejs_eventloop_lag_seconds",
+        "process_resident_memory_bytes",
+    ):
+        assert f"# TYPE {family}" in body, f"/metrics is missing {family}"
+
+    assert re.search(r'http_request_duration_seconds_count\{[^}]*route="/api/ai/detect"', body), \
+        "Detection request was not recorded in the HTTP histogram"
+    assert re.search(r'app_inference_results_total\{kind="detect",source="(model|local|heuristic|fallback)"\} \d+', body), \
+        "Detection result source was not counted"
+
+
+test_server_timing_header_and_prometheus_metrics()
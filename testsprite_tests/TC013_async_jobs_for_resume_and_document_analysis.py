@@ -0,0 +1,73 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "clients", "python"))
+from ai_suite_client import ApiError, Client, Job  # noqa: E402
+
+BASE_URL = "http://localhost:5000"
+TIMEOUT = 30
+MAX_WAIT_SECONDS = 120
+
+RESUME = (
+    "Jane Roe\n"
+    "Senior Backend Engineer\n"
+    "Experience:\n"
+    "- Led the migration of a payments platform to Node.js services\n"
+    "- Cut p99 latency by 40% with caching and connection pooling\n"
+    "Education:\n"
+    "MSc Computer Science\n"
+).encode("utf-8")
+
+
+def status_of(call):
+    try:
+        call()
+    except ApiError as error:
+        return error.status_code
+    return 200
+
+
+def test_async_jobs_for_resume_and_document_analysis():
+    with Client(BASE_URL, timeout=TIMEOUT) as client:
+        # Resume analysis via ?async=true, result fetched by long-polling.
+        accepted = client.submit_resume(("resume.txt", RESUME), job_title="Backend Engineer", priority="high")
+        assert accepted.raw["statusCode"] == 202, f"Expected 202, got {accepted.raw}"
+        assert accepted.status in ("queued", "running", "done")
+        assert accepted.priority == "high"
+
+        finished = client.wait_for_job(accepted, timeout=MAX_WAIT_SECONDS)
+        assert finished.status == "done", f"Resume job failed: {finished.error}"
+        result = finished.result
+        assert result["statusCode"] == 200
+        assert "overallScore" in result["data"] and "metadata" in result["data"]
+
+        # Document Q&A via the Prefer header (the raw response, to check the
+        # HTTP contract), result delivered over SSE.
+        response = client.request(
+            "POST",
+            "/api/assistant/respond",
+            headers={"Prefer": "respond-async"},
+            files={"file": ("notes.txt", b"The launch is scheduled for March 3rd in Lisbon. " * 40, "text/plain")},
+            data={"user_input": "Where is the launch?"},
+        )
+        assert response.status_code == 202, f"Expected 202, got {response.status_code}: {response.text}"
+        accepted = Job.from_response(response.json())
+        assert response.headers.get("Location") == accepted.status_url
+
+        events = list(client.iter_job_events(accepted, timeout=MAX_WAIT_SECONDS))
+        assert events, "No events received"
+        final_event, final_job = events[-1]
+        assert final_event == "done", f"Assistant job ended with {final_event}: {final_job.error}"
+        assert final_job.result["answer"], "Finished assistant job has no answer"
+
+        # Input errors are still reported synchronously.
+        rejected = status_of(lambda: client.submit_resume(("resume.txt", RESUME), job_title=None))
+        assert rejected == 400, f"Missing jobTitle should be 400, got {rejected}"
+
+        missing = status_of(lambda: client.get_job("00000000-0000-0000-0000-000000000000"))
+        assert missing == 404, f"Unknown job id should be 404, got {missing}"
+        malformed = status_of(lambda: client.get_job("not-a-job"))
+        assert malformed == 400, f"Malformed job id should be 400, got {malformed}"
+
+
+test_async_jobs_for_resume_and_document_analysis()
@@ -0,0 +1,30 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "clients", "python"))
+from ai_suite_client import Client  # noqa: E402
+
+BASE_URL = "http://localhost:5000"
+TIMEOUT = 30
+
+# Each document is one whitespace-free "word" well above the assistant's passage
+# budget, so no retrieval passage fits it whole.
+DOCUMENTS = {
+    "cjk.txt": ("退款申请已提交但支付失败请尽快处理" * 300)[:4800],
+    "url.txt": "https://example.com/orders?" + "&".join(f"item{i}=refund" for i in range(400)),
+}
+
+
+def test_document_qa_with_unspaced_text_keeps_document_context():
+    with Client(BASE_URL, timeout=TIMEOUT) as client:
+        for name, text in DOCUMENTS.items():
+            result = client.ask("What is this request about?", (name, text.encode("utf-8")))
+            retrieval = result.retrieval
+            assert retrieval.get("retrieved"), f"{name}: expected retrieval for a document over the budget"
+            assert retrieval.get("selected", 0) >= 1, f"{name}: no passage was selected: {retrieval}"
+            assert retrieval.get("estimatedTokens", 0) > 0, f"{name}: the prompt context was empty: {retrieval}"
+            assert retrieval.get("truncated") is True, f"{name}: expected the oversized passage to be cut: {retrieval}"
+            assert result.answer.strip(), f"{name}: empty answer"
+
+
+test_document_qa_with_unspaced_text_keeps_document_context()
@@ -0,0 +1,187 @@
+"""Throughput of the Python client against a running backend.
+
+Sends the same detection (or sentiment) workload four ways and compares
+wall time, requests per second and per-call latency:
+
+* ``naive``: one ``requests.post`` per call, as the TC scripts used to, so
+  every call opens a new connection
+* ``pooled``: :class:`ai_suite_client.Client` fanning out over its
+  keep-alive pool
+* ``async``: :class:`ai_suite_client.AsyncClient` with ``asyncio.gather``
+* ``batch``: one NDJSON request per ``--batch-size`` texts through the
+  ``/batch`` endpoint (per-item latency is not observable here)
+
+Every text is unique and sent with ``Cache-Control: no-cache`` so the
+server's response cache does not flatter the later modes.
+
+    HF_INFERENCE_URL=http://127.0.0.1:8088 HUGGINGFACE_API_KEY=stub npm start
+    python testsprite_tests/bench/client_throughput.py --start-stub --requests 400 --concurrency 16
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "clients", "python"))
+from ai_suite_client import AsyncClient, Client  # noqa: E402
+from hf_stub import add_stub_arguments, config_from_args, start_stub  # noqa: E402
+from load_test import percentile  # noqa: E402
+
+BASE_URL = "http://localhost:5000"
+TIMEOUT = 30
+MODES = ("naive", "pooled", "async", "batch")
+ENDPOINTS = {
+    "detect": ("/api/ai/detect", "detect", "detect_many"),
+    "sentiment": ("/api/classify/sentiment", "analyze_sentiment", "analyze_sentiments"),
+}
+
+
+def make_texts(count, run_id):
+    return [
+        f"Sample {run_id}-{i}: the quarterly review covered hiring, the delayed data migration "
+        f"and a proposal to move the support rota to four-day weeks from next spring."
+        for i in range(count)
+    ]
+
+
+def timed(call):
+    started = time.perf_counter()
+    try:
+        call()
+        return (time.perf_counter() - started) * 1000, None
+    except Exception as error:
+        return (time.perf_counter() - started) * 1000, error
+
+
+def run_naive(args, texts):
+    path = ENDPOINTS[args.endpoint][0]
+
+    def call(text):
+        response = requests.post(args.base_url + path, json={"text": text},
+                                 headers={"Cache-Control": "no-cache"}, timeout=args.timeout)
+        response.raise_for_status()
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        return list(pool.map(lambda text: timed(lambda: call(text)), texts))
+
+
+def run_pooled(args, texts):
+    method = ENDPOINTS[args.endpoint][1]
+    with Client(args.base_url, timeout=args.timeout, max_connections=args.concurrency) as client:
+        call = getattr(client, method)
+        return client.map(lambda text: timed(lambda: call(text, fresh=True)), texts)
+
+
+def run_async(args, texts):
+    method = ENDPOINTS[args.endpoint][1]
+
+    async def main():
+        async with AsyncClient(args.base_url, timeout=args.timeout, max_concurrency=args.concurrency) as client:
+            call = getattr(client, method)
+            # Timed from when a slot frees up, like the thread-pool modes.
+            slots = asyncio.Semaphore(args.concurrency)
+
+            async def one(text):
+                async with slots:
+                    started = time.perf_counter()
+                    try:
+                        await call(text, fresh=True)
+                        return (time.perf_counter() - started) * 1000, None
+                    except Exception as error:
+                        return (time.perf_counter() - started) * 1000, error
+
+            return await asyncio.gather(*(one(text) for text in texts))
+
+    return asyncio.run(main())
+
+
+def run_batch(args, texts):
+    method = ENDPOINTS[args.endpoint][2]
+    with Client(args.base_url, timeout=args.timeout, max_connections=args.concurrency,
+                batch_size=args.batch_size) as client:
+        results = getattr(client, method)(texts, fresh=True)
+    return [(None, None if result.success else result.error) for result in results]
+
+
+RUNNERS = {"naive": run_naive, "pooled": run_pooled, "async": run_async, "batch": run_batch}
+
+
+def summarise(outcomes, elapsed):
+    latencies = sorted(ms for ms, error in outcomes if ms is not None and error is None)
+    errors = [error for _, error in outcomes if error is not None]
+    return {
+        "requests": len(outcomes),
+        "errors": len(errors),
+        "seconds": round(elapsed, 3),
+        "per_second": round(len(outcomes) / elapsed, 1) if elapsed else None,
+        "p50_ms": round(percentile(latencies, 50), 1) if latencies else None,
+        "p95_ms": round(percentile(latencies, 95), 1) if latencies else None,
+        "first_error": str(errors[0]) if errors else None,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Throughput of the Python client against a running backend")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--endpoint", choices=sorted(ENDPOINTS), default="detect")
+    parser.add_argument("--modes", default=",".join(MODES), help="comma-separated subset of: " + ", ".join(MODES))
+    parser.add_argument("--requests", type=int, default=400, help="texts per mode")
+    parser.add_argument("--concurrency", type=int, default=16, help="requests in flight for every mode")
+    parser.add_argument("--batch-size", type=int, default=100, help="texts per request in batch mode")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT)
+    parser.add_argument("--output", help="also write the results JSON here")
+    parser.add_argument("--start-stub", action="store_true", help="run the HF stub in this process")
+    add_stub_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = [mode for mode in modes if mode not in RUNNERS]
+    if unknown:
+        print(f"Unknown modes: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    stub = None
+    if args.start_stub:
+        stub, _ = start_stub(args.stub_host, args.stub_port, config_from_args(args))
+        print(f"HF stub on http://{args.stub_host}:{args.stub_port} "
+              "(start the backend with HF_INFERENCE_URL pointing here)")
+
+    results = {}
+    run_id = int(time.time())
+    try:
+        for mode in modes:
+            texts = make_texts(args.requests, f"{run_id}-{mode}")
+            print(f"-> {mode}: {args.requests} x {args.endpoint}, concurrency {args.concurrency}", flush=True)
+            started = time.perf_counter()
+            outcomes = RUNNERS[mode](args, texts)
+            results[mode] = summarise(outcomes, time.perf_counter() - started)
+    finally:
+        if stub:
+            stub.shutdown()
+
+    columns = ("requests", "errors", "seconds", "per_second", "p50_ms", "p95_ms")
+    print()
+    print(f"{'mode':<8} " + " ".join(f"{column:>11}" for column in columns))
+    for mode, row in results.items():
+        cells = ["-" if row[column] is None else str(row[column]) for column in columns]
+        print(f"{mode:<8} " + " ".join(f"{cell:>11}" for cell in cells))
+    for mode, row in results.items():
+        if row["first_error"]:
+            print(f"{mode}: first error: {row['first_error']}")
+
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump({"endpoint": args.endpoint, "concurrency": args.concurrency, "modes": results}, handle, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""Local stand-in for the Cloudinary upload API.
+
+Start the backend with ``CLOUDINARY_UPLOAD_PREFIX=http://127.0.0.1:<port>``,
+dummy ``CLOUDINARY_*`` credentials and ``SAVE_UPLOADS_TO_CLOUDINARY=true`` so
+background archive uploads land here. ``POST /v1_1/<cloud>/<type>/upload``
+answers like Cloudinary; ``GET /stats`` returns counters.
+
+    python cloudinary_stub.py --port 8091 --latency-ms 2000 --fail-first 1
+"""
+import argparse
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class CloudinaryStubConfig:
+    def __init__(self, latency_ms=0, fail_first=0, error_status=500):
+        self.latency_ms = latency_ms
+        self.fail_first = fail_first
+        self.error_status = error_status
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "uploaded": 0, "failed": 0, "bytes": 0}
+
+    def next_outcome(self):
+        with self.lock:
+            self.stats["requests"] += 1
+            if self.stats["requests"] <= self.fail_first:
+                self.stats["failed"] += 1
+                return False
+            return True
+
+
+def make_handler(config):
+    class CloudinaryStubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status, payload):
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _read_body(self):
+            if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+                size = 0
+                while True:
+                    length = int(self.rfile.readline().strip() or b"0", 16)
+                    if length == 0:
+                        self.rfile.readline()
+                        return size
+                    self.rfile.read(length)
+                    self.rfile.readline()
+                    size += length
+            length = int(self.headers.get("Content-Length") or 0)
+            self.rfile.read(length)
+            return length
+
+        def do_GET(self):
+            if self.path.rstrip("/") == "/stats":
+                with config.lock:
+                    self._send_json(200, dict(config.stats))
+                return
+            self._send_json(404, {"error": {"message": "not found"}})
+
+        def do_POST(self):
+            size = self._read_body()
+            parts = self.path.strip("/").split("/")
+            if len(parts) < 4 or parts[0] != "v1_1" or parts[-1] != "upload":
+                self._send_json(404, {"error": {"message": "not found"}})
+                return
+
+            time.sleep(config.latency_ms / 1000)
+            if not config.next_outcome():
+                self._send_json(config.error_status, {"error": {"message": "Injected upload failure"}})
+                return
+
+            cloud, resource_type = parts[1], parts[2]
+            public_id = f"stub/{uuid.uuid4().hex}"
+            host = self.headers.get("Host", "127.0.0.1")
+            with config.lock:
+                config.stats["uploaded"] += 1
+                config.stats["bytes"] += size
+            self._send_json(200, {
+                "public_id": public_id,
+                "version": int(time.time()),
+                "resource_type": resource_type,
+                "type": "upload",
+                "bytes": size,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "url": f"http://{host}/{cloud}/{resource_type}/upload/{public_id}",
+                "secure_url": f"http://{host}/{cloud}/{resource_type}/upload/{public_id}",
+            })
+
+    return CloudinaryStubHandler
+
+
+def start_cloudinary_stub(host="127.0.0.1", port=8091, config=None):
+    """Starts the stub on a daemon thread and returns ``(server, config)``."""
+    config = config or CloudinaryStubConfig()
+    server = ThreadingHTTPServer((host, port), make_handler(config))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, config
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8091)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--fail-first", type=int, default=0, help="answer the first N uploads with --error-status")
+    parser.add_argument("--error-status", type=int, default=500)
+    args = parser.parse_args()
+    server, _ = start_cloudinary_stub(
+        args.host, args.port, CloudinaryStubConfig(args.latency_ms, args.fail_first, args.error_status)
+    )
+    print(f"Cloudinary stub listening on http://{args.host}:{args.port}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
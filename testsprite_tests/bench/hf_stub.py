@@ -0,0 +1,241 @@
+"""Local stand-in for the Hugging Face inference API used by the load benchmark.
+
+Start the backend with ``HF_INFERENCE_URL=http://127.0.0.1:<port>`` and a dummy
+``HUGGINGFACE_API_KEY`` so every upstream call lands here instead of the real
+service. The stub answers:
+
+* ``POST .../v1/chat/completions``: chat completions, streamed as SSE when the
+  body asks for ``stream: true``
+* ``POST`` on any other path: text classification (Real/Fake scores) for a
+  single input or a batched ``inputs`` list
+* ``GET /stats``: request and injected-error counters
+
+Latency and failures are configurable so the benchmark can model a slow or
+flaky provider.
+
+    python hf_stub.py --port 8088 --latency-ms 150 --jitter-ms 50 --error-rate 0.02
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FILLER_WORDS = (
+    "the team reviewed the latest results and agreed that steady improvements in "
+    "quality and reliability matter more than short bursts of speed for every user"
+).split()
+
+
+class StubConfig:
+    def __init__(self, latency_ms=120, jitter_ms=40, per_item_ms=2, token_ms=5,
+                 completion_words=120, error_rate=0.0, error_status=503, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.per_item_ms = per_item_ms
+        self.token_ms = token_ms
+        self.completion_words = completion_words
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "chat": 0, "classification": 0, "streams": 0, "injected_errors": 0}
+
+    def count(self, key):
+        with self.lock:
+            self.stats[key] += 1
+
+    def delay(self, items=1):
+        with self.lock:
+            jitter = self.random.uniform(-self.jitter_ms, self.jitter_ms)
+        time.sleep(max(0.0, self.latency_ms + jitter + self.per_item_ms * max(0, items - 1)) / 1000)
+
+    def should_fail(self):
+        with self.lock:
+            return self.random.random() < self.error_rate
+
+
+def _last_user_message(body):
+    messages = body.get("messages") or []
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            return str(message.get("content") or "")
+    return ""
+
+
+def _completion_text(prompt, words):
+    """Returns text shaped like what the controllers parse for this prompt."""
+    labels = re.search(r"^Labels:\s*(.+)$", prompt, re.MULTILINE)
+    if labels:
+        names = [name.strip() for name in labels.group(1).split(",") if name.strip()]
+        scores = [round(1 / (index + 2), 3) for index in range(len(names))]
+        return json.dumps({"labels": names, "scores": scores})
+    if "JSON" in prompt:
+        return json.dumps({
+            "category": "technical",
+            "priority": "medium",
+            "sentiment": "neutral",
+            "summary": "Stub summary of the submitted text.",
+            "keywords": ["stub", "benchmark"],
+            "score": 72,
+            "strengths": ["Clear structure"],
+            "improvements": ["Add measurable results"],
+        })
+    return " ".join(FILLER_WORDS[index % len(FILLER_WORDS)] for index in range(words)) + "."
+
+
+def _classification_scores(config, text):
+    with config.lock:
+        real = round(config.random.uniform(0.05, 0.95), 4)
+    return [{"label": "Real", "score": real}, {"label": "Fake", "score": round(1 - real, 4)}]
+
+
+def make_handler(config):
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status, payload):
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path.rstrip("/") == "/stats":
+                with config.lock:
+                    self._send_json(200, dict(config.stats))
+                return
+            self._send_json(404, {"error": "not found"})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                self._send_json(400, {"error": "invalid JSON"})
+                return
+
+            config.count("requests")
+            if config.should_fail():
+                config.count("injected_errors")
+                config.delay()
+                self._send_json(config.error_status, {"error": "injected failure"})
+                return
+
+            if self.path.rstrip("/").endswith("/chat/completions") or "messages" in body:
+                self._chat(body)
+            else:
+                self._classify(body)
+
+        def _chat(self, body):
+            config.count("chat")
+            text = _completion_text(_last_user_message(body), config.completion_words)
+            model = body.get("model", "stub-model")
+            config.delay()
+
+            if not body.get("stream"):
+                self._send_json(200, {
+                    "id": "chatcmpl-stub",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": text},
+                        "finish_reason": "stop",
+                    }],
+                    "usage": {"prompt_tokens": 0, "completion_tokens": len(text.split()), "total_tokens": 0},
+                })
+                return
+
+            config.count("streams")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+            tokens = re.findall(r"\S+\s*", text)
+            try:
+                for token in tokens:
+                    chunk = {
+                        "id": "chatcmpl-stub",
+                        "object": "chat.completion.chunk",
+                        "created": int(time.time()),
+                        "model": model,
+                        "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}],
+                    }
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                    time.sleep(config.token_ms / 1000)
+                self.wfile.write(b"data: [DONE]\n\n")
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def _classify(self, body):
+            config.count("classification")
+            inputs = body.get("inputs", "")
+            batch = inputs if isinstance(inputs, list) else [inputs]
+            config.delay(len(batch))
+            self._send_json(200, [_classification_scores(config, text) for text in batch])
+
+    return StubHandler
+
+
+def start_stub(host="127.0.0.1", port=8088, config=None):
+    """Starts the stub on a daemon thread and returns ``(server, config)``."""
+    config = config or StubConfig()
+    server = ThreadingHTTPServer((host, port), make_handler(config))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, config
+
+
+def add_stub_arguments(parser):
+    parser.add_argument("--stub-host", default="127.0.0.1")
+    parser.add_argument("--stub-port", type=int, default=8088)
+    parser.add_argument("--latency-ms", type=float, default=120, help="mean upstream latency per call")
+    parser.add_argument("--jitter-ms", type=float, default=40, help="uniform +/- jitter around the mean")
+    parser.add_argument("--per-item-ms", type=float, default=2, help="extra latency per additional batched input")
+    parser.add_argument("--token-ms", type=float, default=5, help="delay between streamed tokens")
+    parser.add_argument("--completion-words", type=int, default=120)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls answered with --error-status")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def config_from_args(args):
+    return StubConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        per_item_ms=args.per_item_ms,
+        token_ms=args.token_ms,
+        completion_words=args.completion_words,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+    server, _ = start_stub(args.stub_host, args.stub_port, config_from_args(args))
+    print(f"HF stub listening on http://{args.stub_host}:{args.stub_port}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
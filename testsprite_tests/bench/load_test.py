@@ -0,0 +1,331 @@
+"""Concurrent load and latency benchmark for the backend API.
+
+Replays the request shapes from TC001-TC009 against a running server at a
+fixed arrival rate per endpoint. For each endpoint it reports p50/p95/p99
+latency, achieved throughput, error rate and server RSS (sampled from
+``/health``). Results can be written to, and checked against, a JSON baseline;
+the process exits with status 1 when an endpoint regresses.
+
+Typical run against the local inference stub:
+
+    # terminal 1: point the backend at the stub
+    HF_INFERENCE_URL=http://127.0.0.1:8088 HUGGINGFACE_API_KEY=stub npm start
+    # terminal 2
+    python testsprite_tests/bench/load_test.py --start-stub --rps 10 --duration 20
+    python testsprite_tests/bench/load_test.py --start-stub --update-baseline
+
+Latency is measured from each request's scheduled send time, so client-side
+queueing behind slow responses shows up in the tail instead of being hidden.
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import requests
+
+from hf_stub import add_stub_arguments, config_from_args, start_stub
+
+BASE_URL = "http://localhost:5000"
+TIMEOUT = 30
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+DETECT_TEXT = (
+    "Artificial intelligence (AI) is intelligence demonstrated by machines, "
+    "unlike the natural intelligence displayed by humans and animals. Leading AI "
+    "text classification models are designed to discern human writing from AI-generated prose "
+    "with statistical probability scores."
+)
+RESUME_TEXT = (
+    "John Doe\n"
+    "Software Engineer\n"
+    "Experience:\n"
+    "- Developed scalable web applications\n"
+    "- Worked with Python, JavaScript, and Node.js\n"
+    "Education:\n"
+    "BSc Computer Science\n"
+).encode("utf-8")
+DOCUMENT_TEXT = (
+    b"Python is a high-level programming language. It is widely used for web development, "
+    b"data analysis, AI, and more."
+)
+
+
+def _json(path, payload):
+    return lambda: {"method": "POST", "path": path, "json": payload}
+
+
+def _upload(path, name, content, data):
+    return lambda: {
+        "method": "POST",
+        "path": path,
+        "files": {"file": (name, io.BytesIO(content), "text/plain")},
+        "data": data,
+    }
+
+
+# Same payloads as the TC00x tests, keyed by a short endpoint name.
+SCENARIOS = {
+    "detect": _json("/api/ai/detect", {"text": DETECT_TEXT}),
+    "article": _json("/api/generate/article", {
+        "topic": "The future of artificial intelligence",
+        "keywords": "AI, machine learning, technology",
+        "wordCount": 1000,
+    }),
+    "titles": _json("/api/generate/titles", {"topic": "sustainable gardening", "tone": "professional", "count": 5}),
+    "quotes": _json("/api/generate/quotes", {"theme": "motivation", "type": "quote", "count": 3}),
+    "rewrite": _json("/api/generate/rewrite", {"text": "The quick brown fox jumps over the lazy dog.", "mode": "formal"}),
+    "ticket": _json("/api/classify/ticket", {
+        "text": "My internet connection has been intermittently dropping over the past week. Please help!",
+        "email": "user@example.com",
+        "userId": "user_12345",
+    }),
+    "resume": _upload("/api/classify/resume", "sample_resume.txt", RESUME_TEXT, {"jobTitle": "Software Engineer"}),
+    "sentiment": _json("/api/classify/sentiment", {
+        "text": "I really love using this product! It has improved my workflow tremendously."
+    }),
+    "assistant": _upload("/api/assistant/respond", "test_document.txt", DOCUMENT_TEXT, {
+        "user_input": "What is Python used for?"
+    }),
+}
+
+_sessions = threading.local()
+
+
+def _session():
+    # One pooled connection set per worker thread; requests.Session is not thread-safe.
+    if not hasattr(_sessions, "session"):
+        _sessions.session = requests.Session()
+    return _sessions.session
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(pct / 100 * len(sorted_values) + 0.5 - 1e-9)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def read_rss_mb(base_url):
+    try:
+        response = requests.get(f"{base_url}/health", timeout=5)
+        rss = response.json().get("memory", {}).get("rss")
+    except (requests.RequestException, ValueError, AttributeError):
+        return None
+    return round(rss / (1024 * 1024), 1) if rss else None
+
+
+class RssSampler:
+    """Polls /health in the background while an endpoint is under load."""
+
+    def __init__(self, base_url, interval=0.5):
+        self.base_url = base_url
+        self.interval = interval
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            rss = read_rss_mb(self.base_url)
+            if rss is not None:
+                self.samples.append(rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def _fire(base_url, build_request, scheduled_at, headers, timeout):
+    request = build_request()
+    try:
+        response = _session().request(
+            request["method"],
+            base_url + request["path"],
+            json=request.get("json"),
+            files=request.get("files"),
+            data=request.get("data"),
+            headers=headers,
+            timeout=timeout,
+        )
+        status = response.status_code
+        response.content  # drain the body so latency covers the full response
+    except requests.RequestException as error:
+        status = type(error).__name__
+    return time.perf_counter() - scheduled_at, status
+
+
+def run_endpoint(name, base_url, rps, duration, concurrency, headers, timeout):
+    build_request = SCENARIOS[name]
+    total = max(1, int(rps * duration))
+    futures = []
+    with RssSampler(base_url) as sampler, ThreadPoolExecutor(max_workers=concurrency) as pool:
+        started = time.perf_counter()
+        for index in range(total):
+            scheduled_at = started + index / rps
+            delay = scheduled_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            futures.append(pool.submit(_fire, base_url, build_request, scheduled_at, headers, timeout))
+        results = [future.result() for future in futures]
+        elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency * 1000 for latency, status in results if status == 200)
+    statuses = {}
+    for _, status in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    errors = total - len(latencies)
+    return {
+        "requests": total,
+        "target_rps": rps,
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+        "error_rate": round(errors / total, 4),
+        "p50_ms": _round(percentile(latencies, 50)),
+        "p95_ms": _round(percentile(latencies, 95)),
+        "p99_ms": _round(percentile(latencies, 99)),
+        "max_ms": _round(latencies[-1] if latencies else None),
+        "rss_peak_mb": max(sampler.samples) if sampler.samples else None,
+        "rss_end_mb": sampler.samples[-1] if sampler.samples else None,
+        "statuses": statuses,
+    }
+
+
+def _round(value):
+    return None if value is None else round(value, 1)
+
+
+def compare_to_baseline(results, baseline, tolerance, rss_tolerance):
+    """Returns a list of human-readable regressions (empty when within tolerance)."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get("endpoints", {}).get(name)
+        if not previous:
+            continue
+
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            before, after = previous.get(metric), current.get(metric)
+            # A few ms of absolute slack keeps very fast endpoints from flapping.
+            if before is not None and after is not None and after > before * (1 + tolerance) + 5:
+                regressions.append(f"{name}: {metric} {before} -> {after}")
+
+        before, after = previous.get("throughput_rps"), current.get("throughput_rps")
+        if before and after is not None and after < before * (1 - tolerance):
+            regressions.append(f"{name}: throughput_rps {before} -> {after}")
+
+        before, after = previous.get("error_rate", 0), current.get("error_rate", 0)
+        if after > before + 0.01:
+            regressions.append(f"{name}: error_rate {before} -> {after}")
+
+        before, after = previous.get("rss_peak_mb"), current.get("rss_peak_mb")
+        if before and after and after > before * (1 + rss_tolerance):
+            regressions.append(f"{name}: rss_peak_mb {before} -> {after}")
+    return regressions
+
+
+def print_table(results):
+    columns = ("p50_ms", "p95_ms", "p99_ms", "throughput_rps", "error_rate", "rss_peak_mb")
+    print(f"{'endpoint':<10} " + " ".join(f"{column:>14}" for column in columns))
+    for name, row in results.items():
+        cells = ["-" if row.get(column) is None else str(row[column]) for column in columns]
+        print(f"{name:<10} " + " ".join(f"{cell:>14}" for cell in cells))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load and latency benchmark for the backend API")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--endpoints", default=",".join(SCENARIOS), help="comma-separated subset of: " + ", ".join(SCENARIOS))
+    parser.add_argument("--rps", type=float, default=5, help="arrival rate per endpoint")
+    parser.add_argument("--duration", type=float, default=20, help="seconds of load per endpoint")
+    parser.add_argument("--concurrency", type=int, default=64, help="max requests in flight")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT)
+    parser.add_argument("--allow-cache", action="store_true",
+                        help="let the server answer from its response cache (default sends Cache-Control: no-cache)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="write this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative latency/throughput drift")
+    parser.add_argument("--rss-tolerance", type=float, default=0.5)
+    parser.add_argument("--output", help="also write the results JSON here")
+    parser.add_argument("--start-stub", action="store_true", help="run the HF stub in this process")
+    add_stub_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    names = [name.strip() for name in args.endpoints.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        print(f"Unknown endpoints: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    stub = None
+    if args.start_stub:
+        stub, _ = start_stub(args.stub_host, args.stub_port, config_from_args(args))
+        print(f"HF stub on http://{args.stub_host}:{args.stub_port} "
+              "(start the backend with HF_INFERENCE_URL pointing here)")
+
+    headers = {} if args.allow_cache else {"Cache-Control": "no-cache"}
+    results = {}
+    try:
+        for name in names:
+            print(f"-> {name}: {args.rps} rps for {args.duration}s", flush=True)
+            results[name] = run_endpoint(name, args.base_url, args.rps, args.duration,
+                                         args.concurrency, headers, args.timeout)
+    finally:
+        if stub:
+            stub.shutdown()
+
+    print()
+    print_table(results)
+    report = {
+        "version": 1,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "rps": args.rps,
+            "duration": args.duration,
+            "concurrency": args.concurrency,
+            "allow_cache": args.allow_cache,
+            "stub": {"latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms, "error_rate": args.error_rate}
+            if args.start_stub else None,
+        },
+        "endpoints": results,
+    }
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(report, handle, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as handle:
+            json.dump(report, handle, indent=2)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to record one.")
+        return 0
+
+    with open(args.baseline) as handle:
+        baseline = json.load(handle)
+    regressions = compare_to_baseline(results, baseline, args.tolerance, args.rss_tolerance)
+    if regressions:
+        print("\nRegressions against baseline:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("\nWithin baseline tolerance.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())